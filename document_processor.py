@@ -13,15 +13,49 @@
 
 import os
 import re
-from typing import List, Tuple, Optional, Dict, Any
+import sys
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Tuple, Optional, Dict, Any, Iterator, Iterable
 from dataclasses import dataclass, field
+from enum import IntEnum
 from pathlib import Path
 import logging
 
-logger = logging.getLogger(__name__)
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# 可选的Cython加速实现（见 document_processor_fast.pyx），未编译时回退到纯Python实现
+try:
+    from document_processor_fast import (
+        clean_text as _fast_clean_text,
+        clean_char_count as _fast_clean_char_count,
+        tokenize as _fast_tokenize,
+        clean_and_tokenize as _fast_clean_and_tokenize,
+    )
+except ImportError:
+    _fast_clean_text = None
+    _fast_clean_char_count = None
+    _fast_tokenize = None
+    _fast_clean_and_tokenize = None
+
+# 可选的 Aho-Corasick 多模式匹配（pip install pyahocorasick），未安装时 SequenceMatcher 回退到 str.find
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Python 3.10+ 的 dataclass 支持 slots，段落等高频对象不再携带实例 __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Paragraph:
     """段落信息"""
     raw_text: str              # 原始段落文本（带符号）
@@ -32,9 +66,23 @@ class Paragraph:
     clean_char_count: int = field(default=0)  # 清理后字符数
     file_type: str = "pdf"     # 文件类型: pdf, docx
     tokens: List["Token"] = field(default_factory=list)  # 分词后的token列表
+    # 第k个有效字符（中英数字）在raw_text中的下标，用于O(1)定位上下文
+    clean_to_raw: array = field(default_factory=lambda: array('i'))
 
 
-@dataclass
+class TokenType(IntEnum):
+    """
+    token类型
+
+    整数枚举：类型判断是整数比较，英文和数字（需要以空格分隔显示的两类）
+    满足 token_type >= TokenType.ENGLISH
+    """
+    CHINESE = 0
+    ENGLISH = 1
+    NUMBER = 2
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Token:
     """
     语义单元（Token）
@@ -45,12 +93,12 @@ class Token:
     - 数字：完整数字是一个token（小数点已过滤）
     """
     text: str                  # token文本
-    token_type: str            # token类型: 'chinese', 'english', 'number'
+    token_type: TokenType      # token类型: CHINESE, ENGLISH, NUMBER
     start_pos: int             # 在clean_text中的起始位置
     end_pos: int               # 在clean_text中的结束位置（不包含）
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class DocumentContent:
     """文档内容"""
     file_path: str
@@ -59,6 +107,198 @@ class DocumentContent:
     total_raw_chars: int
     total_clean_chars: int
     stats: Dict[str, Any] = field(default_factory=dict)
+    # 全部段落token的列式存储，供 SequenceGenerator.generate_batch 直接使用
+    token_arrays: Optional["TokenArrays"] = None
+
+
+def _display_join(tokens: List[Token]) -> str:
+    """拼接用于显示的序列文本：相邻的英文/数字token之间保留一个空格"""
+    parts = []
+    previous_is_word = False
+    for token in tokens:
+        is_word = token.token_type >= TokenType.ENGLISH
+        if is_word and previous_is_word:
+            parts.append(' ')
+        parts.append(token.text)
+        previous_is_word = is_word
+    return ''.join(parts)
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class SequenceRecord:
+    """
+    单个基于token的序列（generate_from_paragraphs 的返回元素）
+
+    仍支持 seq['sequence'] 形式的下标访问，便于旧代码迁移；新代码请直接访问属性。
+    """
+    sequence: str                       # 用于比对的序列文本（去除空格）
+    tokens: List[Token]                 # 组成该序列的token列表
+    paragraph_index: int                # 所属段落索引
+    start_token_pos: int                # 起始token位置
+    start_pos: int                      # 在段落clean_text中的起始位置
+    end_pos: int                        # 在段落clean_text中的结束位置（不包含）
+    # display_sequence 的缓存，首次访问时才拼接
+    _display_sequence: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def display_sequence(self) -> str:
+        """用于显示的序列文本（保留空格），只比对不显示的调用方不必付出拼接开销"""
+        if self._display_sequence is None:
+            self._display_sequence = _display_join(self.tokens)
+        return self._display_sequence
+
+    @property
+    def raw_sequence(self) -> str:
+        """兼容旧字段，返回显示文本"""
+        return self.display_sequence
+
+    def __getitem__(self, key: str) -> Any:
+        """兼容旧的字典访问方式"""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+@dataclass
+class TokenArrays:
+    """
+    多个段落的全部token（列式存储）
+
+    所有段落的token首尾相接存放在几列平行数组中，
+    第p个段落的token位于 [para_offsets[p], para_offsets[p + 1]) 区间。
+    """
+    token_text: List[str]               # token文本
+    token_type: np.ndarray              # token类型（uint8，取值同 TokenType）
+    token_start: np.ndarray             # 在所属段落clean_text中的起始位置（int32）
+    token_end: np.ndarray               # 在所属段落clean_text中的结束位置（int32，不包含）
+    para_offsets: np.ndarray            # 各段落token区间的边界（int32，长度为段落数+1）
+
+    @classmethod
+    def from_paragraphs(cls, paragraphs: List[Paragraph]) -> "TokenArrays":
+        """由已分词的段落列表构建"""
+        tokens = [token for paragraph in paragraphs for token in paragraph.tokens]
+
+        para_offsets = np.zeros(len(paragraphs) + 1, dtype=np.int32)
+        np.cumsum([len(p.tokens) for p in paragraphs], out=para_offsets[1:])
+
+        return cls(
+            token_text=[token.text for token in tokens],
+            token_type=np.array([token.token_type for token in tokens], dtype=np.uint8),
+            token_start=np.array([token.start_pos for token in tokens], dtype=np.int32),
+            token_end=np.array([token.end_pos for token in tokens], dtype=np.int32),
+            para_offsets=para_offsets,
+        )
+
+
+@dataclass
+class SequenceBatch:
+    """
+    序列批（列式存储）
+
+    与 generate_from_paragraphs 返回的 SequenceRecord 列表内容相同，但按列保存：
+    第i个序列的各项信息分别位于各列的第i个位置，整数列使用int32数组，
+    不再为每个序列创建一个对象。
+    """
+    sequences: List[str]                # 用于比对的序列文本（去除空格）
+    paragraph_indices: np.ndarray       # 所属段落索引
+    start_positions: np.ndarray         # 在clean_text中的起始位置
+    end_positions: np.ndarray           # 在clean_text中的结束位置（不包含）
+
+    def __len__(self) -> int:
+        return len(self.sequences)
+
+    def __getitem__(self, index: slice) -> "SequenceBatch":
+        """按切片截取（如限制序列数量），返回新的序列批"""
+        if not isinstance(index, slice):
+            raise TypeError("SequenceBatch only supports slicing")
+        return SequenceBatch(
+            sequences=self.sequences[index],
+            paragraph_indices=self.paragraph_indices[index],
+            start_positions=self.start_positions[index],
+            end_positions=self.end_positions[index],
+        )
+
+
+# ========== 符号清理使用的预编译正则 ==========
+# 在模块加载时编译一次，清理时逐字符的循环交给C实现的正则引擎完成
+# 紧跟在数字后面的小数点（小数点被过滤，但前后数字连在一起）
+_NUMBER_DOT_RE = re.compile(r'(?<=[0-9])\.+')
+# 英文/数字之间需要保留为单个空格的位置：中间只有空白，或字母与数字直接相邻
+_ALNUM_GAP_RE = re.compile(
+    r'(?<=[A-Za-z0-9])\s+(?=[A-Za-z0-9])'
+    r'|(?<=[A-Za-z])(?=[0-9])'
+    r'|(?<=[0-9])(?=[A-Za-z])'
+)
+# 任意一个英文字母或数字，用于判断能否跳过只作用于英文/数字的清理步骤
+_ASCII_ALNUM_RE = re.compile(r'[A-Za-z0-9]')
+# 连续的有效字符（中文、英文、数字）
+_VALID_RUN_RE = re.compile(r'[\u4e00-\u9fffA-Za-z0-9]+')
+# 分词：连续英文字母、连续数字、单个中文字符各为一个token，分组序号即token类型
+_TOKEN_RE = re.compile(r'([A-Za-z]+)|([0-9]+)|([\u4e00-\u9fff])')
+_TOKEN_TYPES = (None, TokenType.ENGLISH, TokenType.NUMBER, TokenType.CHINESE)
+# 传给Cython分词函数的类型取值，顺序与 document_processor_fast 中的类型序号一致
+_FAST_TOKEN_TYPES = (TokenType.ENGLISH, TokenType.NUMBER, TokenType.CHINESE)
+# 纯ASCII文本计数用的字节删除表：ASCII范围内除字母、数字外全部删除
+_ASCII_INVALID_BYTES = bytes(cp for cp in range(128) if not chr(cp).isalnum())
+# 纯ASCII文本清理用的字节表：英文/数字之间的间隔先标记为\x00，
+# 再由一次 bytes.translate 完成删除符号与空白、标记转空格、大写转小写
+_GAP_MARK = '\x00'
+_ASCII_CLEAN_MAP = bytes.maketrans(
+    b'\x00ABCDEFGHIJKLMNOPQRSTUVWXYZ', b' abcdefghijklmnopqrstuvwxyz'
+)
+_ASCII_CLEAN_DELETE = bytes(cp for cp in range(1, 128) if not chr(cp).isalnum())
+
+
+class _CleanTranslateTable(dict):
+    """
+    非ASCII文本清理用的 str.translate 映射表（按需填充）
+
+    码位空间有110多万个，不预先建全表：第一次遇到某个码位时由 __missing__
+    计算并缓存结果，之后同一码位的查找都是C层的dict命中。
+    映射规则：中文、小写字母、数字保持不变；大写字母转小写；
+    间隔标记\x00转为空格；其余字符删除。
+    """
+
+    def __missing__(self, cp: int) -> Optional[str]:
+        if cp == 0:
+            value = ' '
+        elif 0x4E00 <= cp <= 0x9FFF or 0x61 <= cp <= 0x7A or 0x30 <= cp <= 0x39:
+            value = chr(cp)
+        elif 0x41 <= cp <= 0x5A:
+            value = chr(cp + 0x20)
+        else:
+            value = None
+        self[cp] = value
+        return value
+
+
+_CLEAN_TRANSLATE_TABLE = _CleanTranslateTable()
+
+
+# 字符类别编码（CHAR_CLASS 表中的取值），0 表示无效字符
+CHAR_CHINESE = 1
+CHAR_ENGLISH_LOWER = 2
+CHAR_ENGLISH_UPPER = 3
+CHAR_DIGIT = 4
+
+
+def _build_char_class_table() -> bytes:
+    """构建BMP范围（0x0000-0xFFFF）的字符类别表：下标为码位，值为类别编码"""
+    table = bytearray(0x10000)
+    for start, end, char_class in (
+        (0x4E00, 0x9FFF, CHAR_CHINESE),
+        (0x61, 0x7A, CHAR_ENGLISH_LOWER),
+        (0x41, 0x5A, CHAR_ENGLISH_UPPER),
+        (0x30, 0x39, CHAR_DIGIT),
+    ):
+        table[start:end + 1] = bytes((char_class,)) * (end - start + 1)
+    return bytes(table)
+
+
+# 字符类别查找表，分类只需一次下标访问；BMP以外的字符都是无效字符（查表前需先判断）
+# 热点循环中可绑定为局部变量使用
+CHAR_CLASS = _build_char_class_table()
 
 
 class SymbolCleaner:
@@ -70,30 +310,31 @@ class SymbolCleaner:
     ENGLISH_UPPER = ('A', 'Z')
     DIGITS = ('0', '9')
 
-    @classmethod
-    def is_chinese(cls, char: str) -> bool:
+    @staticmethod
+    def is_chinese(char: str) -> bool:
         """判断是否为中文字符"""
-        return cls.CHINESE_RANGE[0] <= char <= cls.CHINESE_RANGE[1]
+        return '\u4e00' <= char <= '\u9fff'
 
-    @classmethod
-    def is_english(cls, char: str) -> bool:
+    @staticmethod
+    def is_english(char: str) -> bool:
         """判断是否为英文字母"""
-        return (cls.ENGLISH_LOWER[0] <= char <= cls.ENGLISH_LOWER[1] or
-                cls.ENGLISH_UPPER[0] <= char <= cls.ENGLISH_UPPER[1])
+        return 'a' <= char <= 'z' or 'A' <= char <= 'Z'
 
-    @classmethod
-    def is_digit(cls, char: str) -> bool:
+    @staticmethod
+    def is_digit(char: str) -> bool:
         """判断是否为数字"""
-        return cls.DIGITS[0] <= char <= cls.DIGITS[1]
+        return '0' <= char <= '9'
 
-    @classmethod
-    def is_valid_char(cls, char: str) -> bool:
+    @staticmethod
+    def is_valid_char(char: str, _ord=ord, _table=CHAR_CLASS) -> bool:
         """
         判断字符是否有效
         只保留: 中文、英文、数字
         清理: 空格、换行、制表符、中英文标点、特殊符号、数学符号等
+
+        查预先构建的码位表，一次下标访问即可；BMP以外的字符直接判为无效
         """
-        return cls.is_chinese(char) or cls.is_english(char) or cls.is_digit(char)
+        return char <= '\uffff' and _table[_ord(char)] != 0
 
     @classmethod
     def clean_text(cls, text: str) -> str:
@@ -126,95 +367,91 @@ class SymbolCleaner:
             >>> SymbolCleaner.clean_text("Python 3.14")
             "python 314"
         """
-        result = []
-        i = 0
-        n = len(text)
-
-        while i < n:
-            char = text[i]
-
-            # ========== 处理英文字母 ==========
-            if cls.is_english(char):
-                # 提取完整的英文单词（连续的字母），转为小写
-                word_chars = []
-                while i < n and cls.is_english(text[i]):
-                    word_chars.append(text[i].lower())
-                    i += 1
-                word = ''.join(word_chars)
-
-                # 跳过后面的空格
-                while i < n and text[i].isspace():
-                    i += 1
-
-                # 检查后面是否是英文、数字，或者是结束/中文
-                # 如果是英文/数字，说明在英文序列中，需要加空格
-                if i < n and (cls.is_english(text[i]) or cls.is_digit(text[i])):
-                    # 后面是英文/数字，说明还在英文序列中
-                    result.append(word)
-                    result.append(' ')
-                else:
-                    # 后面是中文或结束，不加空格
-                    result.append(word)
-                continue
+        if _fast_clean_text is not None:
+            return _fast_clean_text(text)
+
+        if _GAP_MARK in text:
+            # 原文本身的\x00与间隔标记冲突，换成同样会被删除的\x01（非空白，清理规则不变）
+            text = text.replace(_GAP_MARK, '\x01')
+        if _ASCII_ALNUM_RE.search(text) is None:
+            # 没有英文和数字（纯中文正文）时不存在小数点和间隔，两步正则都可跳过
+            return text.translate(_CLEAN_TRANSLATE_TABLE)
+        # 1. 数字后的小数点直接删除（3.14 -> 314）
+        text = _NUMBER_DOT_RE.sub('', text)
+        # 2. 英文/数字之间的空白以及字母数字交界处标记为\x00
+        text = _ALNUM_GAP_RE.sub(_GAP_MARK, text)
+        # 3. 一次translate完成删除符号与空白、标记转空格、大写转小写
+        if text.isascii():
+            # 纯ASCII（英文文档的绝大多数页）走字节级translate，更快
+            return text.encode('ascii').translate(_ASCII_CLEAN_MAP, _ASCII_CLEAN_DELETE).decode('ascii')
+        return text.translate(_CLEAN_TRANSLATE_TABLE)
 
-            # ========== 处理数字 ==========
-            elif cls.is_digit(char):
-                # 提取完整的数字（连续的数字，包括小数点后的数字）
-                # 注意：小数点会被过滤掉，但小数点前后的数字应该连在一起
-                num_chars = []
-                while i < n and cls.is_digit(text[i]):
-                    num_chars.append(text[i])
-                    i += 1
-
-                # 跳过小数点（继续提取小数点后的数字）
-                while i < n and text[i] == '.':
-                    i += 1
-                    # 小数点后面可能有数字，继续提取
-                    while i < n and cls.is_digit(text[i]):
-                        num_chars.append(text[i])
-                        i += 1
-
-                number = ''.join(num_chars)
-
-                # 跳过后面的空格
-                while i < n and text[i].isspace():
-                    i += 1
-
-                # 检查后面是否是英文、数字
-                if i < n and (cls.is_english(text[i]) or cls.is_digit(text[i])):
-                    # 后面是英文/数字，说明还在英文/数字序列中
-                    result.append(number)
-                    result.append(' ')
-                else:
-                    # 后面是中文或结束，不加空格
-                    result.append(number)
-                continue
+    @classmethod
+    def clean_and_tokenize(cls, text: str) -> Tuple[str, List[Token]]:
+        """
+        清理文本并同时完成分词
 
-            # ========== 处理中文字符 ==========
-            elif cls.is_chinese(char):
-                # 中文字符之间不加空格
-                result.append(char)
-                i += 1
-                continue
+        结果与 clean_text + Tokenizer.tokenize 相同。编译了Cython模块时
+        在一次扫描中同时写出清理文本和token；否则清理后直接用正则分词。
+
+        Returns:
+            Tuple[str, List[Token]]: (清理后的文本, token列表)
+        """
+        if _fast_clean_and_tokenize is not None:
+            return _fast_clean_and_tokenize(text, Token, _FAST_TOKEN_TYPES)
+
+        clean_text = cls.clean_text(text)
+        return clean_text, _tokenize_clean(clean_text)
 
-            # ========== 其他字符（空格、标点、符号等）直接跳过 ==========
-            else:
-                i += 1
+    @classmethod
+    def clean_text_with_count(cls, text: str) -> Tuple[str, int]:
+        """
+        清理文本并同时返回清理后的长度
 
-        # 清理末尾可能的多余空格
-        while result and result[-1] == ' ':
-            result.pop()
+        与 Paragraph.clean_char_count 的口径一致（即 len(clean_text)，含英文间空格），
+        同时需要文本和长度的调用方不必再单独统计。
 
-        return ''.join(result)
+        Returns:
+            Tuple[str, int]: (清理后的文本, 清理后的字符数)
+        """
+        result = cls.clean_text(text)
+        return result, len(result)
 
     @classmethod
     def get_clean_char_count(cls, text: str) -> int:
-        """获取清理后的字符数"""
-        count = 0
-        for char in text:
-            if cls.is_valid_char(char):
-                count += 1
-        return count
+        """
+        获取原始文本中有效字符（中英数字）的个数，不计空格
+
+        已有清理结果时请直接使用其长度或 clean_text_with_count，避免再扫描一遍原文
+        """
+        if _fast_clean_char_count is not None:
+            return _fast_clean_char_count(text)
+        if text.isascii():
+            # 字节级translate只删除不映射，比 str.translate 快一倍
+            return len(text.encode('ascii').translate(None, _ASCII_INVALID_BYTES))
+        # 只统计有效字符连续段的长度，不拼接删除后的新字符串
+        return sum(map(len, _VALID_RUN_RE.findall(text)))
+
+
+# SymbolCleaner 只有静态方法和类方法，无需每次实例化，全模块共用一个实例
+_SYMBOL_CLEANER = SymbolCleaner()
+
+
+def _tokenize_clean(clean_text: str) -> List[Token]:
+    """用预编译正则对清理后的文本分词（Tokenizer 的纯Python实现）"""
+    token_types = _TOKEN_TYPES
+    return [
+        Token(m.group(), token_types[m.lastindex], m.start(), m.end())
+        for m in _TOKEN_RE.finditer(clean_text)
+    ]
+
+
+def _build_clean_to_raw(raw_text: str) -> array:
+    """建立有效字符序号到原始文本下标的映射（按连续片段批量写入）"""
+    clean_to_raw = array('i')
+    for m in _VALID_RUN_RE.finditer(raw_text):
+        clean_to_raw.extend(range(m.start(), m.end()))
+    return clean_to_raw
 
 
 class Tokenizer:
@@ -229,7 +466,7 @@ class Tokenizer:
     """
 
     def __init__(self):
-        self.cleaner = SymbolCleaner()
+        self.cleaner = _SYMBOL_CLEANER
 
     def tokenize(self, clean_text: str) -> List[Token]:
         """
@@ -244,91 +481,53 @@ class Tokenizer:
         Examples:
             >>> tokenizer = Tokenizer()
             >>> tokenizer.tokenize("hello world")
-            [Token('hello', 'english', 0, 5), Token('world', 'english', 6, 11)]
+            [Token('hello', TokenType.ENGLISH, 0, 5), Token('world', TokenType.ENGLISH, 6, 11)]
 
             >>> tokenizer.tokenize("今天天气很好")
-            [Token('今', 'chinese', 0, 1), Token('天', 'chinese', 1, 2), ...]
-        """
-        tokens = []
-        i = 0
-        n = len(clean_text)
-        current_pos = 0  # 当前在clean_text中的位置
-
-        while i < n:
-            char = clean_text[i]
-
-            # ========== 处理英文字母 ==========
-            if self.cleaner.is_english(char):
-                start_pos = current_pos
-                # 提取完整的英文单词
-                word_chars = []
-                while i < n and self.cleaner.is_english(clean_text[i]):
-                    word_chars.append(clean_text[i])
-                    i += 1
-                    current_pos += 1
-                word = ''.join(word_chars)
-
-                tokens.append(Token(
-                    text=word,
-                    token_type='english',
-                    start_pos=start_pos,
-                    end_pos=current_pos
-                ))
-
-                # 跳过空格
-                while i < n and clean_text[i].isspace():
-                    i += 1
-                    current_pos += 1
-                continue
+            [Token('今', TokenType.CHINESE, 0, 1), Token('天', TokenType.CHINESE, 1, 2), ...]
+        """
+        if _fast_tokenize is not None:
+            return _fast_tokenize(clean_text, Token, _FAST_TOKEN_TYPES)
 
-            # ========== 处理数字 ==========
-            elif self.cleaner.is_digit(char):
-                start_pos = current_pos
-                # 提取完整的数字
-                num_chars = []
-                while i < n and self.cleaner.is_digit(clean_text[i]):
-                    num_chars.append(clean_text[i])
-                    i += 1
-                    current_pos += 1
-                number = ''.join(num_chars)
-
-                tokens.append(Token(
-                    text=number,
-                    token_type='number',
-                    start_pos=start_pos,
-                    end_pos=current_pos
-                ))
-
-                # 跳过空格
-                while i < n and clean_text[i].isspace():
-                    i += 1
-                    current_pos += 1
-                continue
+        return _tokenize_clean(clean_text)
 
-            # ========== 处理中文字符 ==========
-            elif self.cleaner.is_chinese(char):
-                tokens.append(Token(
-                    text=char,
-                    token_type='chinese',
-                    start_pos=current_pos,
-                    end_pos=current_pos + 1
-                ))
-                i += 1
-                current_pos += 1
-                continue
 
-            # ========== 跳过空格 ==========
-            elif char.isspace():
-                i += 1
-                current_pos += 1
-                continue
+def _clean_page_worker(page_group: Tuple[int, List[Tuple[str, int, int]], str]) -> Optional[Paragraph]:
+    """
+    合并并清理一页的行，构造段落
+
+    放在模块顶层，以便作为进程池的工作函数被pickle。
+
+    Args:
+        page_group: (页码, 该页的行列表, 文件类型)
 
-            # ========== 其他字符（理论上不应该出现） ==========
-            else:
-                i += 1
-                current_pos += 1
+    Returns:
+        Optional[Paragraph]: 清理后有效字符不足3个时返回None
+    """
+    page, page_lines, file_type = page_group
+
+    # 合并同一页的所有行
+    raw_text = ''.join([line[0] for line in page_lines])
 
-        return tokens
+    # 清理符号并同时分词，后续生成序列时不必再扫描一遍
+    clean_text, tokens = SymbolCleaner.clean_and_tokenize(raw_text)
+    clean_char_count = len(clean_text)
+
+    # 只有清理后有内容才保留
+    if clean_char_count < 3:  # 至少3个有效字符
+        return None
+
+    return Paragraph(
+        raw_text=raw_text,
+        clean_text=clean_text,
+        start_page=page,
+        start_line=page_lines[0][1],  # 第一行的行号
+        char_count=len(raw_text),
+        clean_char_count=clean_char_count,
+        file_type=file_type,
+        tokens=tokens,
+        clean_to_raw=_build_clean_to_raw(raw_text)
+    )
 
 
 class DocumentProcessor:
@@ -340,15 +539,24 @@ class DocumentProcessor:
     步骤3: 返回段落列表（供后续切分）
     """
 
-    def __init__(self, config=None):
+    # 页数达到该值时才启用多进程清理，页数少时进程启动开销大于收益
+    PARALLEL_MIN_PAGES = 50
+
+    def __init__(self, config=None, parallel: bool = False, assert_ordered: bool = False):
         """
         初始化文档处理器
 
         Args:
             config: TextExtractionConfig 配置对象
+            parallel: 页数较多时是否用多进程并行清理各页（默认关闭）
+            assert_ordered: 提取结果未按页码排序时直接报错，而不是自动重排
         """
         self.config = config
-        self.cleaner = SymbolCleaner()
+        self.parallel = parallel
+        self.assert_ordered = assert_ordered
+        self.cleaner = _SYMBOL_CLEANER
+        # 提取器缓存：(文件类型, id(config), 文件路径) -> 提取器实例
+        self._extractor_cache: Dict[Tuple, Any] = {}
 
     def process(self, file_path: str) -> DocumentContent:
         """
@@ -367,19 +575,22 @@ class DocumentProcessor:
         logger.info(f"[DocumentProcessor] Processing {file_type.upper()}: {file_path}")
 
         # 步骤1: 提取并过滤非正文内容
-        lines = self._extract_and_filter(file_path)
+        lines = self._extract_and_filter(file_path, file_ext)
 
         logger.info(f"[DocumentProcessor] Step 1 complete: {len(lines)} lines extracted")
 
         # 步骤2: 合并成段落 + 清理符号
-        paragraphs = self._merge_and_clean_lines(lines, file_type)
+        # 段落逐页生成，统计信息在同一次遍历中累加
+        paragraphs = []
+        total_raw_chars = 0
+        total_clean_chars = 0
+        for paragraph in self._merge_and_clean_lines(lines, file_type):
+            paragraphs.append(paragraph)
+            total_raw_chars += paragraph.char_count
+            total_clean_chars += paragraph.clean_char_count
 
         logger.info(f"[DocumentProcessor] Step 2 complete: {len(paragraphs)} paragraphs created")
 
-        # 统计信息
-        total_raw_chars = sum(p.char_count for p in paragraphs)
-        total_clean_chars = sum(p.clean_char_count for p in paragraphs)
-
         # 创建文档内容对象
         content = DocumentContent(
             file_path=file_path,
@@ -387,6 +598,7 @@ class DocumentProcessor:
             paragraphs=paragraphs,
             total_raw_chars=total_raw_chars,
             total_clean_chars=total_clean_chars,
+            token_arrays=TokenArrays.from_paragraphs(paragraphs),
             stats={
                 'total_lines': len(lines),
                 'total_paragraphs': len(paragraphs),
@@ -402,14 +614,17 @@ class DocumentProcessor:
 
         return content
 
-    def _extract_and_filter(self, file_path: str) -> List[Tuple[str, int, int]]:
+    def _extract_and_filter(self, file_path: str, file_ext: str) -> List[Tuple[str, int, int]]:
         """
         步骤1: 提取文本并过滤非正文内容
 
+        Args:
+            file_path: 文件路径
+            file_ext: process() 中已算出的小写扩展名（如 '.pdf'）
+
         Returns:
             List[Tuple[str, int, int]]: (文本, 页码/段落号, 行号) 的列表
         """
-        file_ext = os.path.splitext(file_path)[1].lower()
 
         if file_ext == '.pdf':
             return self._extract_pdf_content(file_path)
@@ -422,69 +637,81 @@ class DocumentProcessor:
         """提取PDF内容，过滤非正文"""
         from enhanced_pdf_extractor import EnhancedPDFTextExtractor
 
-        extractor = EnhancedPDFTextExtractor(self.config, pdf_path)
+        key = ('pdf', id(self.config), pdf_path)
+        extractor = self._extractor_cache.get(key)
+        if extractor is None:
+            extractor = EnhancedPDFTextExtractor(self.config, pdf_path)
+            self._extractor_cache[key] = extractor
         return extractor.extract_main_text_lines(pdf_path)
 
     def _extract_word_content(self, docx_path: str) -> List[Tuple[str, int, int]]:
         """提取Word内容，过滤非正文"""
         from word_extractor import WordExtractor
 
-        extractor = WordExtractor(self.config)
+        key = ('docx', id(self.config), docx_path)
+        extractor = self._extractor_cache.get(key)
+        if extractor is None:
+            extractor = WordExtractor(self.config)
+            self._extractor_cache[key] = extractor
         return extractor.extract_text_with_positions(docx_path)
 
-    def _merge_and_clean_lines(self, lines: List[Tuple[str, int, int]], file_type: str) -> List[Paragraph]:
+    def _merge_and_clean_lines(
+        self,
+        lines: List[Tuple[str, int, int]],
+        file_type: str
+    ) -> Iterator[Paragraph]:
         """
         步骤2: 合并行成段落 + 清理符号
 
-        策略: 同一页的所有行合并成一个段落
+        策略: 同一页的所有行合并成一个段落，逐页生成，不在内存中按页建字典
 
         Args:
             lines: (文本, 页码, 行号) 的列表
             file_type: 文件类型
 
-        Returns:
-            List[Paragraph]: 段落列表
+        Yields:
+            Paragraph: 按页码顺序生成的段落
         """
         if not lines:
-            return []
-
-        paragraphs = []
-
-        # 按页码分组
-        lines_by_page: Dict[int, List[Tuple[str, int, int]]] = {}
-        for text, page, line in lines:
-            if page not in lines_by_page:
-                lines_by_page[page] = []
-            lines_by_page[page].append((text, page, line))
+            return
+
+        # 一次向量化遍历同时检查页码顺序并统计页数
+        pages = np.fromiter(map(itemgetter(1), lines), dtype=np.int64, count=len(lines))
+        page_steps = np.diff(pages)
+
+        # 提取器按页顺序输出行，有序时不再排序；
+        # 万一乱序，按页码数组稳定排序后与按页分组的结果一致
+        if (page_steps < 0).any():
+            if self.assert_ordered:
+                raise ValueError("Extracted lines are not in page order")
+            order = np.argsort(pages, kind='stable')
+            lines = [lines[i] for i in order.tolist()]
+            page_steps = np.diff(pages[order])
+        page_count = 1 + int(np.count_nonzero(page_steps))
 
         # 每页合并成一个段落
-        for page in sorted(lines_by_page.keys()):
-            page_lines = lines_by_page[page]
-            if not page_lines:
-                continue
-
-            # 合并同一页的所有行
-            raw_text = ''.join(line[0] for line in page_lines)
-
-            # 清理符号
-            clean_text = self.cleaner.clean_text(raw_text)
-
-            # 只有清理后有内容才保留
-            if len(clean_text) >= 3:  # 至少3个有效字符
-                paragraphs.append(Paragraph(
-                    raw_text=raw_text,
-                    clean_text=clean_text,
-                    start_page=page,
-                    start_line=page_lines[0][1],  # 第一行的行号
-                    char_count=len(raw_text),
-                    clean_char_count=len(clean_text),
-                    file_type=file_type
-                ))
+        page_groups = (
+            (page, list(group), file_type)
+            for page, group in groupby(lines, key=itemgetter(1))
+        )
 
-        return paragraphs
+        # 清理是CPU密集且各页互不相关，页数多时交给进程池绕过GIL
+        if self.parallel and page_count >= self.PARALLEL_MIN_PAGES:
+            # 每个进程约分到4批，既摊薄进程间通信，又能在各进程间均衡负载
+            chunksize = max(1, page_count // ((os.cpu_count() or 1) * 4))
+            with ProcessPoolExecutor() as executor:
+                results = executor.map(_clean_page_worker, page_groups, chunksize=chunksize)
+                for paragraph in results:
+                    if paragraph is not None:
+                        yield paragraph
+        else:
+            for page_group in page_groups:
+                paragraph = _clean_page_worker(page_group)
+                if paragraph is not None:
+                    yield paragraph
 
+    @staticmethod
     def get_context_from_paragraph(
-        self,
         paragraph: Paragraph,
         matched_text: str,
         context_length: int = 50
@@ -512,48 +739,35 @@ class DocumentProcessor:
             # 未找到，返回空上下文
             return "", ""
 
-        # 计算在原始文本中的对应位置
-        # 需要统计到匹配位置为止的有效字符数
-        valid_char_count = 0
-        raw_pos = 0
-
-        for raw_pos, char in enumerate(raw):
-            if self.cleaner.is_valid_char(char):
-                if valid_char_count == match_pos:
-                    # 找到了匹配开始位置
-                    break
-                valid_char_count += 1
-
-        # 计算上下文范围（基于有效字符）
-        before_chars = []
-        after_chars = []
-
-        # 提取前文
-        valid_before_count = 0
-        for char in reversed(raw[:raw_pos]):
-            before_chars.append(char)
-            if self.cleaner.is_valid_char(char):
-                valid_before_count += 1
-                if valid_before_count >= context_length:
-                    break
-        before_text = ''.join(reversed(before_chars))
-
-        # 提取后文
-        match_end_pos = raw_pos
-        valid_match_count = 0
-        while match_end_pos < len(raw) and valid_match_count < len(matched_text):
-            if self.cleaner.is_valid_char(raw[match_end_pos]):
-                valid_match_count += 1
-            match_end_pos += 1
-
-        valid_after_count = 0
-        for char in raw[match_end_pos:]:
-            after_chars.append(char)
-            if self.cleaner.is_valid_char(char):
-                valid_after_count += 1
-                if valid_after_count >= context_length:
-                    break
-        after_text = ''.join(after_chars)
+        # 通过预先建立的映射直接得到匹配开始位置在原始文本中的下标
+        clean_to_raw = paragraph.clean_to_raw or _build_clean_to_raw(raw)
+        valid_total = len(clean_to_raw)
+        raw_pos = clean_to_raw[match_pos] if match_pos < valid_total else len(raw) - 1
+
+        # 上下文按有效字符计数，至少包含1个有效字符
+        needed = max(context_length, 1)
+
+        # 提取前文：从往前数第needed个有效字符处切到匹配开始位置
+        valid_before = match_pos if match_pos < valid_total else bisect_left(clean_to_raw, raw_pos)
+        before_start = clean_to_raw[valid_before - needed] if valid_before >= needed else 0
+        before_text = raw[before_start:raw_pos]
+
+        # 提取后文：从匹配文本最后一个有效字符之后切到往后数第needed个有效字符
+        # after_first 为匹配结束后第一个有效字符的序号，常见情况下直接由下标算出，不必二分查找
+        match_last = match_pos + len(matched_text) - 1
+        if not matched_text:
+            match_end_pos = raw_pos
+            after_first = valid_before
+        elif match_last < valid_total:
+            match_end_pos = clean_to_raw[match_last] + 1
+            after_first = match_last + 1
+        else:
+            match_end_pos = len(raw)
+            after_first = valid_total
+
+        after_last = after_first + needed - 1
+        after_end = clean_to_raw[after_last] + 1 if after_last < valid_total else len(raw)
+        after_text = raw[match_end_pos:after_end]
 
         return before_text, after_text
 
@@ -583,7 +797,41 @@ class SequenceGenerator:
         self.sequence_length = sequence_length
         self.tokenizer = Tokenizer()
 
-    def generate_from_paragraphs(self, paragraphs: List[Paragraph]) -> List[Dict]:
+    def _window_slices(self, tokens: List[Token]) -> Tuple[str, List[int], List[int]]:
+        """
+        计算一个段落内所有N token窗口的切片边界
+
+        整段只拼接一次，每个窗口都是拼接串上的一段切片。
+
+        Args:
+            tokens: 段落的token列表
+
+        Returns:
+            (joined, seq_starts, seq_ends)
+        """
+        n = self.sequence_length
+        token_count = len(tokens)
+
+        texts = [token.text for token in tokens]
+        joined = ''.join(texts)
+        offsets = np.zeros(token_count + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=token_count),
+                  out=offsets[1:])
+
+        # 每行是一个窗口覆盖的 n+1 个边界，只取首尾（零拷贝视图）
+        windows = sliding_window_view(offsets, n + 1)
+        seq_starts = windows[:, 0].tolist()
+        seq_ends = windows[:, -1].tolist()
+
+        return joined, seq_starts, seq_ends
+
+    def _tokenize_paragraphs(self, paragraphs: List[Paragraph]) -> None:
+        """对尚未分词的段落进行分词"""
+        for paragraph in paragraphs:
+            if not paragraph.tokens:
+                paragraph.tokens = self.tokenizer.tokenize(paragraph.clean_text)
+
+    def generate_from_paragraphs(self, paragraphs: List[Paragraph]) -> List[SequenceRecord]:
         """
         从段落列表生成基于token的序列
 
@@ -591,63 +839,167 @@ class SequenceGenerator:
             paragraphs: 段落列表
 
         Returns:
-            List[Dict]: 序列列表，每个序列包含:
+            List[SequenceRecord]: 序列列表，每个序列包含:
                 - sequence: 用于比对的序列文本（去除空格）
                 - display_sequence: 用于显示的序列文本（保留空格）
                 - tokens: 组成该序列的token列表
                 - paragraph_index: 所属段落索引
                 - start_token_pos: 起始token位置
-                - paragraph: 段落引用
+                - start_pos / end_pos: 在段落clean_text中的字符起止位置
+
+        Note:
+            序列不再包含 'paragraph' 字段（不兼容旧版本）：每个序列都持有段落引用
+            会让段落全文随序列一起常驻内存。需要段落时请用
+            paragraphs[seq.paragraph_index] 查找。
+            只需逐个处理序列时请用 iter_from_paragraphs，避免一次性保存全部序列。
+        """
+        return list(self.iter_from_paragraphs(paragraphs))
+
+    def iter_from_paragraphs(self, paragraphs: Iterable[Paragraph]) -> Iterator[SequenceRecord]:
+        """
+        逐个生成基于token的序列（generate_from_paragraphs 的生成器版本）
+
+        段落在轮到时才分词，序列边生成边交给调用方，
+        内存中只保留当前段落的窗口边界，不保存全部序列。
+
+        Args:
+            paragraphs: 段落列表（或按顺序产出段落的可迭代对象）
+
+        Yields:
+            SequenceRecord: 序列，内容同 generate_from_paragraphs
         """
-        sequences = []
+        n = self.sequence_length
+        tokenize = self.tokenizer.tokenize
 
         for para_idx, paragraph in enumerate(paragraphs):
-            # 对段落进行分词
             if not paragraph.tokens:
-                paragraph.tokens = self.tokenizer.tokenize(paragraph.clean_text)
-
+                paragraph.tokens = tokenize(paragraph.clean_text)
             tokens = paragraph.tokens
 
             # 跳过token数不足的段落
-            if len(tokens) < self.sequence_length:
+            if len(tokens) < n:
                 continue
 
-            # 生成所有连续N token序列
-            for i in range(len(tokens) - self.sequence_length + 1):
-                window_tokens = tokens[i:i + self.sequence_length]
-
-                # 用于比对的序列（去除空格）
-                sequence_text = ''.join(token.text for token in window_tokens)
-
-                # 用于显示的序列（英文单词之间保留空格）
-                display_tokens = []
-                for j, token in enumerate(window_tokens):
-                    display_tokens.append(token.text)
-                    # 如果当前token是英文或数字，且下一个token也是英文或数字，则加空格
-                    if j < len(window_tokens) - 1:
-                        next_token = window_tokens[j + 1]
-                        if (token.token_type in ['english', 'number'] and
-                            next_token.token_type in ['english', 'number']):
-                            display_tokens.append(' ')
-                display_sequence = ''.join(display_tokens)
-
-                # 计算字符位置（用于向后兼容）
-                char_start_pos = window_tokens[0].start_pos if window_tokens else 0
-                char_end_pos = window_tokens[-1].end_pos if window_tokens else 0
-
-                sequences.append({
-                    'sequence': sequence_text,
-                    'display_sequence': display_sequence,
-                    'raw_sequence': display_sequence,  # 向后兼容：raw_sequence 等同于 display_sequence
-                    'tokens': window_tokens,
-                    'paragraph_index': para_idx,
-                    'start_token_pos': i,
-                    'start_pos': char_start_pos,  # 字符起始位置（向后兼容）
-                    'end_pos': char_end_pos,      # 字符结束位置
-                    'paragraph': paragraph
-                })
-
-        return sequences
+            joined, seq_starts, seq_ends = self._window_slices(tokens)
+
+            # 各窗口的起止字符位置先整段取出，循环体内只剩切片和构造记录；
+            # 按字段顺序传位置参数，比关键字参数调用快
+            window_count = len(tokens) - n + 1
+            start_positions = [token.start_pos for token in tokens[:window_count]]
+            end_positions = [token.end_pos for token in tokens[n - 1:]]
+
+            for i, seq_start, seq_end, start_pos, end_pos in zip(
+                range(window_count), seq_starts, seq_ends, start_positions, end_positions
+            ):
+                yield SequenceRecord(
+                    joined[seq_start:seq_end],
+                    tokens[i:i + n],
+                    para_idx,
+                    i,
+                    start_pos,
+                    end_pos,
+                )
+
+    def generate_batch(
+        self,
+        paragraphs: List[Paragraph],
+        token_arrays: Optional[TokenArrays] = None
+    ) -> SequenceBatch:
+        """
+        从段落列表生成序列批（列式存储）
+
+        序列内容与 generate_from_paragraphs 相同，但不创建逐序列的对象；
+        所有段落的token先平铺为 TokenArrays，各列由数组下标运算一次性得到。
+        不生成显示文本，需要展示的序列用 extract_display 按需取出显示文本（extract_raw 取原文）。
+
+        Args:
+            paragraphs: 段落列表
+            token_arrays: 这些段落已构建好的 TokenArrays（如 DocumentContent.token_arrays），
+                未提供时现场构建
+
+        Returns:
+            SequenceBatch: 序列批
+        """
+        n = self.sequence_length
+        self._tokenize_paragraphs(paragraphs)
+
+        # 全部token按列平铺，窗口边界在整份文档上一次性向量化计算
+        arrays = token_arrays if token_arrays is not None else TokenArrays.from_paragraphs(paragraphs)
+        token_count = len(arrays.token_text)
+
+        # 每个段落的窗口数（token数不足的段落为0）
+        counts = np.maximum(np.diff(arrays.para_offsets) - n + 1, 0)
+        total = int(counts.sum())
+
+        # 每个窗口起始token的全局下标：所属段落的起点 + 段内序号
+        first_window = np.cumsum(counts) - counts
+        window_starts = (np.repeat(arrays.para_offsets[:-1], counts)
+                         + np.arange(total, dtype=np.int64) - np.repeat(first_window, counts))
+
+        # 所有token文本只拼接一次，每个序列是拼接串上的一段切片
+        joined = ''.join(arrays.token_text)
+        char_offsets = np.zeros(token_count + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, arrays.token_text), dtype=np.int64, count=token_count),
+                  out=char_offsets[1:])
+        seq_starts = char_offsets[window_starts].tolist()
+        seq_ends = char_offsets[window_starts + n].tolist()
+        sequences = [joined[a:b] for a, b in zip(seq_starts, seq_ends)]
+
+        paragraph_indices = np.repeat(np.arange(len(paragraphs), dtype=np.int32), counts)
+        start_positions = arrays.token_start[window_starts]
+        end_positions = arrays.token_end[window_starts + n - 1]
+
+        return SequenceBatch(
+            sequences=sequences,
+            paragraph_indices=paragraph_indices,
+            start_positions=start_positions,
+            end_positions=end_positions,
+        )
+
+    @staticmethod
+    def extract_raw(paragraph: Paragraph, start_pos: int, end_pos: int) -> str:
+        """
+        按需取出序列对应的原始文本（带符号和原始大小写）
+
+        只对需要展示的序列调用，借助段落的 clean_to_raw 映射直接切片，不扫描raw_text。
+
+        Args:
+            paragraph: 序列所属段落
+            start_pos: 序列在clean_text中的起始位置
+            end_pos: 序列在clean_text中的结束位置（不包含）
+
+        Returns:
+            str: raw_text 中从序列首个有效字符到末个有效字符的片段
+        """
+        clean = paragraph.clean_text
+        # clean_text 比有效字符序列只多了空格，减去之前的空格数即得有效字符序号
+        first = start_pos - clean.count(' ', 0, start_pos)
+        last = end_pos - clean.count(' ', 0, end_pos) - 1
+        if last < first:
+            return ''
+
+        clean_to_raw = paragraph.clean_to_raw or _build_clean_to_raw(paragraph.raw_text)
+        return paragraph.raw_text[clean_to_raw[first]:clean_to_raw[last] + 1]
+
+    @staticmethod
+    def extract_display(paragraph: Paragraph, start_pos: int, end_pos: int) -> str:
+        """
+        按需取出序列的显示文本，与 SequenceRecord.display_sequence 相同
+
+        取出段落中位于 [start_pos, end_pos) 内的token，按 display_sequence 的规则拼接；
+        只对需要展示的序列调用。
+
+        Args:
+            paragraph: 序列所属段落
+            start_pos: 序列在clean_text中的起始位置
+            end_pos: 序列在clean_text中的结束位置（不包含）
+
+        Returns:
+            str: 用于显示的序列文本（保留空格）
+        """
+        tokens = [token for token in paragraph.tokens
+                  if start_pos <= token.start_pos and token.end_pos <= end_pos]
+        return _display_join(tokens)
 
     def generate_from_text(self, text: str) -> List[str]:
         """
@@ -659,20 +1011,77 @@ class SequenceGenerator:
         Returns:
             List[str]: 序列字符串列表（用于比对）
         """
-        cleaner = SymbolCleaner()
-        clean_text = cleaner.clean_text(text)
-        tokens = self.tokenizer.tokenize(clean_text)
+        _, tokens = SymbolCleaner.clean_and_tokenize(text)
 
         if len(tokens) < self.sequence_length:
             return []
 
-        sequences = []
-        for i in range(len(tokens) - self.sequence_length + 1):
-            window_tokens = tokens[i:i + self.sequence_length]
-            sequence_text = ''.join(token.text for token in window_tokens)
-            sequences.append(sequence_text)
+        # 与段落生成相同，各窗口直接从整段拼接串中切片，不逐窗口拼接token
+        joined, seq_starts, seq_ends = self._window_slices(tokens)
+        return [joined[start:end] for start, end in zip(seq_starts, seq_ends)]
 
-        return sequences
+
+class SequenceMatcher:
+    """
+    目标短语匹配器 - 已知要查找的短语集合时使用（与 difflib.SequenceMatcher 无关）
+
+    不再枚举段落的全部N token序列去查表，而是对每个段落的 clean_text 扫描一遍，
+    一次找出所有目标短语的出现位置（含重叠出现）。
+    安装了 pyahocorasick 时使用 Aho-Corasick 自动机，否则逐个短语用 str.find 查找。
+
+    匹配位置基于 clean_text；需要原文时用 SequenceGenerator.extract_raw
+    借助段落的 clean_to_raw 映射取回。
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        """
+        初始化匹配器
+
+        Args:
+            phrases: 目标短语（清理后的文本形式），重复和空串会被忽略
+        """
+        self.phrases = list(dict.fromkeys(phrase for phrase in phrases if phrase))
+
+        self._automaton = None
+        if ahocorasick is not None and self.phrases:
+            automaton = ahocorasick.Automaton()
+            for phrase in self.phrases:
+                automaton.add_word(phrase, phrase)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def _match_text(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """在单个文本中查找所有短语，按结束位置升序、同一结束位置长者优先"""
+        if self._automaton is not None:
+            for last, phrase in self._automaton.iter(text):
+                yield last - len(phrase) + 1, last + 1, phrase
+            return
+
+        matches = []
+        for phrase in self.phrases:
+            start = text.find(phrase)
+            while start != -1:
+                matches.append((start, start + len(phrase), phrase))
+                start = text.find(phrase, start + 1)
+        matches.sort(key=lambda m: (m[1], m[0]))
+        yield from matches
+
+    def match_paragraphs(self, paragraphs: List[Paragraph]) -> Iterator[Tuple[int, int, int, str]]:
+        """
+        在段落列表中查找所有目标短语
+
+        Args:
+            paragraphs: 段落列表
+
+        Yields:
+            Tuple[int, int, int, str]: (段落索引, clean_text中的起始位置, 结束位置（不包含）, 短语)
+        """
+        if not self.phrases:
+            return
+
+        for para_idx, paragraph in enumerate(paragraphs):
+            for start, end, phrase in self._match_text(paragraph.clean_text):
+                yield para_idx, start, end, phrase
 
 
 # 便捷函数
@@ -691,10 +1100,41 @@ def process_document(file_path: str, config=None) -> DocumentContent:
     return processor.process(file_path)
 
 
+def process_documents(
+    file_paths: List[str],
+    config=None,
+    workers: Optional[int] = None
+) -> Iterator[DocumentContent]:
+    """
+    批量处理多个文档的便捷函数
+
+    各文件交给进程池并行处理，结果按输入顺序逐个返回，
+    适合一次检测整个班级提交的文档等批量场景。
+
+    Args:
+        file_paths: 文件路径列表
+        config: 提取配置（需可pickle，TextExtractionConfig 满足要求）
+        workers: 进程数，默认 os.cpu_count()
+
+    Yields:
+        DocumentContent: 与 file_paths 顺序一致的处理结果
+    """
+    if not file_paths:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(file_paths) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            partial(process_document, config=config), file_paths, chunksize=chunksize
+        )
+
+
 def generate_sequences(
     paragraphs: List[Paragraph],
     sequence_length: int = 8
-) -> List[Dict]:
+) -> List[SequenceRecord]:
     """
     从段落生成序列的便捷函数
 
@@ -703,7 +1143,7 @@ def generate_sequences(
         sequence_length: 序列长度
 
     Returns:
-        序列列表
+        序列列表，格式同 SequenceGenerator.generate_from_paragraphs（不含段落对象）
     """
     generator = SequenceGenerator(sequence_length)
     return generator.generate_from_paragraphs(paragraphs)
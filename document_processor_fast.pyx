@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+文档处理器的Cython加速模块（可选）
+
+与 document_processor 中 SymbolCleaner / Tokenizer 的纯Python实现规则完全一致，
+在C层逐字符扫描 PyUnicode 缓冲区（str 下标按 Py_UCS4 读取，编译为 PyUnicode_READ），
+不为每个字符创建Python对象。清理结果只含ASCII和CJK基本区字符（都不超过U+FFFF），
+输出缓冲区按 Py_UCS2 分配，比 Py_UCS4 少一半内存，构造结果字符串时的拷贝也减半。
+
+编译方式:
+    cythonize -i document_processor_fast.pyx
+
+未编译时 document_processor 会自动回退到纯Python实现。
+"""
+
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+from cpython.unicode cimport PyUnicode_FromKindAndData, PyUnicode_2BYTE_KIND
+
+cdef extern from "Python.h":
+    ctypedef unsigned short Py_UCS2
+
+
+cdef inline bint _is_chinese(Py_UCS4 ch) nogil:
+    return 0x4E00 <= ch <= 0x9FFF
+
+
+cdef inline bint _is_english(Py_UCS4 ch) nogil:
+    return (0x61 <= ch <= 0x7A) or (0x41 <= ch <= 0x5A)
+
+
+cdef inline bint _is_digit(Py_UCS4 ch) nogil:
+    return 0x30 <= ch <= 0x39
+
+
+cpdef str clean_text(str text):
+    """
+    清理文本，保留中文、英文单词、数字，并智能处理空格
+
+    规则与 SymbolCleaner.clean_text 相同：英文转小写，
+    英文/数字序列之间保留一个空格，小数点过滤但前后数字相连。
+    """
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t j = 0
+    cdef Py_UCS4 ch
+    cdef Py_UCS2* out
+    cdef str result
+
+    if n == 0:
+        return ''
+
+    # 字母与数字直接相邻时会插入空格，输出最长为输入的两倍
+    out = <Py_UCS2*> PyMem_Malloc(2 * n * sizeof(Py_UCS2))
+    if out == NULL:
+        raise MemoryError()
+
+    try:
+        while i < n:
+            ch = text[i]
+
+            # ========== 处理英文字母 ==========
+            if _is_english(ch):
+                while i < n and _is_english(text[i]):
+                    # ASCII字母置0x20位即为小写
+                    out[j] = <Py_UCS2> (<unsigned int> text[i] | 0x20)
+                    j += 1
+                    i += 1
+                while i < n and text[i].isspace():
+                    i += 1
+                if i < n and (_is_english(text[i]) or _is_digit(text[i])):
+                    out[j] = 0x20
+                    j += 1
+
+            # ========== 处理数字 ==========
+            elif _is_digit(ch):
+                while i < n and _is_digit(text[i]):
+                    out[j] = <Py_UCS2> text[i]
+                    j += 1
+                    i += 1
+                # 跳过小数点（继续提取小数点后的数字）
+                while i < n and text[i] == u'.':
+                    i += 1
+                    while i < n and _is_digit(text[i]):
+                        out[j] = <Py_UCS2> text[i]
+                        j += 1
+                        i += 1
+                while i < n and text[i].isspace():
+                    i += 1
+                if i < n and (_is_english(text[i]) or _is_digit(text[i])):
+                    out[j] = 0x20
+                    j += 1
+
+            # ========== 处理中文字符 ==========
+            elif _is_chinese(ch):
+                out[j] = <Py_UCS2> ch
+                j += 1
+                i += 1
+
+            # ========== 其他字符直接跳过 ==========
+            else:
+                i += 1
+
+        result = PyUnicode_FromKindAndData(PyUnicode_2BYTE_KIND, out, j)
+    finally:
+        PyMem_Free(out)
+
+    return result
+
+
+cpdef Py_ssize_t clean_char_count(str text):
+    """获取清理后的字符数（只统计中文、英文、数字）"""
+    cdef Py_ssize_t count = 0
+    cdef Py_UCS4 ch
+    for ch in text:
+        if _is_chinese(ch) or _is_english(ch) or _is_digit(ch):
+            count += 1
+    return count
+
+
+# token类型序号，也是调用方传入的 token_types 元组中的下标
+cdef enum:
+    _TOKEN_ENGLISH = 0
+    _TOKEN_NUMBER = 1
+    _TOKEN_CHINESE = 2
+
+
+cpdef list tokenize(str text, object token_cls, tuple token_types):
+    """
+    将清理后的文本分割成token列表
+
+    规则与 Tokenizer.tokenize 相同：连续英文字母为一个english token，
+    连续数字为一个number token，每个中文字符为一个chinese token，其余字符跳过。
+
+    Args:
+        text: 清理后的文本
+        token_cls: Token 类（由调用方传入，避免与 document_processor 循环导入）
+        token_types: 英文、数字、中文三类token的类型取值（TokenType 成员，按此顺序）
+    """
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t start
+    cdef Py_UCS4 ch
+    cdef list tokens = []
+    cdef object english_type = token_types[_TOKEN_ENGLISH]
+    cdef object number_type = token_types[_TOKEN_NUMBER]
+    cdef object chinese_type = token_types[_TOKEN_CHINESE]
+
+    while i < n:
+        ch = text[i]
+
+        # ========== 处理英文字母 ==========
+        if _is_english(ch):
+            start = i
+            i += 1
+            while i < n and _is_english(text[i]):
+                i += 1
+            tokens.append(token_cls(text[start:i], english_type, start, i))
+
+        # ========== 处理数字 ==========
+        elif _is_digit(ch):
+            start = i
+            i += 1
+            while i < n and _is_digit(text[i]):
+                i += 1
+            tokens.append(token_cls(text[start:i], number_type, start, i))
+
+        # ========== 处理中文字符 ==========
+        elif _is_chinese(ch):
+            tokens.append(token_cls(text[i], chinese_type, i, i + 1))
+            i += 1
+
+        # ========== 空格及其他字符直接跳过 ==========
+        else:
+            i += 1
+
+    return tokens
+
+
+cdef inline Py_ssize_t _record_token(Py_ssize_t* tok_start, Py_ssize_t* tok_end,
+                                     unsigned char* tok_type, Py_ssize_t count,
+                                     unsigned char kind, Py_ssize_t start, Py_ssize_t end) nogil:
+    # 中间只隔了被删除的符号时（如 "a,b" -> "ab"），同类型的英文/数字片段在清理结果中相连，
+    # 与对清理结果单独分词一致，合并为同一个token
+    if (count > 0 and kind != _TOKEN_CHINESE and tok_type[count - 1] == kind
+            and tok_end[count - 1] == start):
+        tok_end[count - 1] = end
+        return count
+    tok_start[count] = start
+    tok_end[count] = end
+    tok_type[count] = kind
+    return count + 1
+
+
+cpdef tuple clean_and_tokenize(str text, object token_cls, tuple token_types):
+    """
+    一次扫描同时完成清理和分词
+
+    结果与 clean_text(text) 后再 tokenize 相同：扫描时记录每个token在输出中的
+    起止位置，扫描结束后由清理结果切片得到token文本。
+
+    Args:
+        text: 原始文本
+        token_cls: Token 类
+        token_types: 英文、数字、中文三类token的类型取值（同 tokenize）
+
+    Returns:
+        tuple: (清理后的文本, token列表)
+    """
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t j = 0
+    cdef Py_ssize_t k
+    cdef Py_ssize_t start
+    cdef Py_ssize_t count = 0
+    cdef Py_UCS4 ch
+    cdef Py_UCS2* out
+    cdef Py_ssize_t* tok_start
+    cdef Py_ssize_t* tok_end
+    cdef unsigned char* tok_type
+    cdef str result
+    cdef list tokens = []
+
+    if n == 0:
+        return '', tokens
+
+    out = <Py_UCS2*> PyMem_Malloc(2 * n * sizeof(Py_UCS2))
+    tok_start = <Py_ssize_t*> PyMem_Malloc(n * sizeof(Py_ssize_t))
+    tok_end = <Py_ssize_t*> PyMem_Malloc(n * sizeof(Py_ssize_t))
+    tok_type = <unsigned char*> PyMem_Malloc(n * sizeof(unsigned char))
+
+    try:
+        if out == NULL or tok_start == NULL or tok_end == NULL or tok_type == NULL:
+            raise MemoryError()
+
+        while i < n:
+            ch = text[i]
+
+            # ========== 处理英文字母 ==========
+            if _is_english(ch):
+                start = j
+                while i < n and _is_english(text[i]):
+                    out[j] = <Py_UCS2> (<unsigned int> text[i] | 0x20)
+                    j += 1
+                    i += 1
+                count = _record_token(tok_start, tok_end, tok_type, count, _TOKEN_ENGLISH, start, j)
+                while i < n and text[i].isspace():
+                    i += 1
+                if i < n and (_is_english(text[i]) or _is_digit(text[i])):
+                    out[j] = 0x20
+                    j += 1
+
+            # ========== 处理数字 ==========
+            elif _is_digit(ch):
+                start = j
+                while i < n and _is_digit(text[i]):
+                    out[j] = <Py_UCS2> text[i]
+                    j += 1
+                    i += 1
+                # 跳过小数点（继续提取小数点后的数字）
+                while i < n and text[i] == u'.':
+                    i += 1
+                    while i < n and _is_digit(text[i]):
+                        out[j] = <Py_UCS2> text[i]
+                        j += 1
+                        i += 1
+                count = _record_token(tok_start, tok_end, tok_type, count, _TOKEN_NUMBER, start, j)
+                while i < n and text[i].isspace():
+                    i += 1
+                if i < n and (_is_english(text[i]) or _is_digit(text[i])):
+                    out[j] = 0x20
+                    j += 1
+
+            # ========== 处理中文字符 ==========
+            elif _is_chinese(ch):
+                out[j] = <Py_UCS2> ch
+                count = _record_token(tok_start, tok_end, tok_type, count, _TOKEN_CHINESE, j, j + 1)
+                j += 1
+                i += 1
+
+            # ========== 其他字符直接跳过 ==========
+            else:
+                i += 1
+
+        result = PyUnicode_FromKindAndData(PyUnicode_2BYTE_KIND, out, j)
+        for k in range(count):
+            tokens.append(token_cls(
+                result[tok_start[k]:tok_end[k]], token_types[tok_type[k]],
+                tok_start[k], tok_end[k]
+            ))
+    finally:
+        PyMem_Free(out)
+        PyMem_Free(tok_start)
+        PyMem_Free(tok_end)
+        PyMem_Free(tok_type)
+
+    return result, tokens
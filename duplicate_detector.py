@@ -25,7 +25,16 @@
 # 标准库导入
 # ============================================================================
 
+import heapq  # 堆算法，用于只取相似度最高的前N个结果
+import io  # 内存文本缓冲区，用于逐行生成报告
+import json  # JSON序列化，用于以JSON格式保存结果
+import os  # 操作系统接口，用于查询CPU核数和文件状态
+import pickle  # 序列化，用于以pickle格式保存结果
 import time  # 时间模块，用于性能计时和生成时间戳
+from operator import attrgetter  # 属性取值函数，用作排序键
+from concurrent.futures import ProcessPoolExecutor  # 进程池，用于并行处理两个PDF
+from contextlib import contextmanager  # 上下文管理器装饰器，用于分阶段计时
+from dataclasses import asdict  # 数据类转字典，用于JSON格式输出
 
 # ============================================================================
 # 类型提示导入
@@ -55,6 +64,77 @@ from sequence_generator import (SequenceGenerator, SequenceInfo,
 # SimilarSequenceInfo: 相似序列信息类，包含两个序列及其相似度、差异分析
 # SimilarityCalculator: 相似度计算器，负责计算序列间的相似度
 
+from result_cache import CACHE_VERSION, cache_file_path, atomic_open, load_cached, save_cached
+# 处理结果的磁盘缓存：格式版本、缓存文件路径、原子写文件和缓存读写函数
+
+# 可选的 orjson（pip install orjson），以JSON格式保存结果时更快；未安装时使用标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# ============================================================================
+# 处理结果的磁盘缓存
+# ============================================================================
+
+def _cache_path(pdf_path: str, extractor) -> str:
+    """
+    计算PDF处理结果的缓存文件路径
+
+    键由提取器类型和配置、绝对路径、修改时间和文件大小组成，文件被修改后键随之改变，旧缓存自然失效；
+    换用其他提取器（如增强版）或改变提取配置时不会读到之前的结果。
+    处理结果与相似度阈值无关，阈值不参与计算键。
+    """
+    stat = os.stat(pdf_path)
+    config = getattr(extractor, 'config', None)
+    key_source = (f"{CACHE_VERSION}|{type(extractor).__name__}|{config!r}|{os.path.abspath(pdf_path)}|"
+                  f"{stat.st_mtime_ns}|{stat.st_size}")
+    return cache_file_path(key_source)
+
+
+def _reuse_result(result: Optional[Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]],
+                  return_chars: bool) -> Optional[Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]]:
+    """
+    判断缓存的处理结果能否满足本次调用
+
+    不需要字符列表时丢弃缓存中的字符列表；需要字符列表而缓存中没有时视为未命中，返回None。
+    """
+    if result is None:
+        return None
+    chars, lookup_table = result
+    if not return_chars:
+        return None, lookup_table
+    return result if chars is not None else None
+
+
+def _process_pdf_worker(extractor: PDFTextExtractor, pdf_path: str, pdf_name: str, min_similarity: float,
+                        use_cache: bool = True, verbose: bool = True,
+                        return_chars: bool = True, profile: bool = False) -> Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]:
+    """
+    在子进程中处理单个PDF
+
+    放在模块顶层以便被进程池pickle。提取器随任务传入（调用方可能已替换为其他提取器），
+    处理器和生成器在子进程内重新创建，返回值（字符列表和查找表）与 SimilarSequenceDetector.process_pdf 相同。
+
+    Args:
+        extractor (PDFTextExtractor): 文本提取器实例
+        pdf_path (str): PDF文件路径
+        pdf_name (str): PDF文件的显示名称，用于日志输出
+        min_similarity (float): 最小相似度阈值
+        use_cache (bool): 是否使用磁盘缓存
+        verbose (bool): 是否输出处理进度
+        return_chars (bool): 是否返回字符列表（False时不必把字符列表传回主进程）
+        profile (bool): 是否输出各处理阶段的耗时
+
+    Returns:
+        Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]: (字符列表, 序列查找表)
+    """
+    detector = SimilarSequenceDetector(pdf_path, pdf_path, min_similarity,
+                                       parallel=False, use_cache=use_cache, verbose=verbose,
+                                       profile=profile)
+    return detector._cached_process_pdf(extractor, pdf_name, return_chars)
+
 
 class SimilarSequenceDetector:
     """
@@ -84,6 +164,10 @@ class SimilarSequenceDetector:
         processor (TextProcessor): 文本处理器，用于分字和清洗
         generator (SequenceGenerator): 序列生成器，用于生成8字序列
         calculator (SimilarityCalculator): 相似度计算器
+        parallel (bool): 是否用两个子进程同时处理两个PDF
+        use_cache (bool): 是否把PDF处理结果缓存到磁盘（result_cache.CACHE_DIR）
+        verbose (bool): 是否输出各处理步骤的进度信息
+        profile (bool): 是否输出各处理阶段的耗时
 
     使用示例：
         >>> detector = SimilarSequenceDetector(
@@ -95,7 +179,9 @@ class SimilarSequenceDetector:
         >>> print(f"找到 {len(similar_sequences)} 个相似序列")
     """
 
-    def __init__(self, pdf1_path: str, pdf2_path: str, min_similarity: float = 0.75):
+    def __init__(self, pdf1_path: str, pdf2_path: str, min_similarity: float = 0.75,
+                 parallel: bool = True, use_cache: bool = True, verbose: bool = True,
+                 profile: bool = False):
         """
         初始化相似序列检测器
 
@@ -109,6 +195,14 @@ class SimilarSequenceDetector:
                                  - 1.0 表示完全相同
                                  - 0.75 表示至少75%的字符相同（默认值）
                                  - 可根据检测严格程度调整
+            parallel (bool): 是否并行处理两个PDF（默认True）
+                           两个PDF的提取、分字、序列生成互不相关，各用一个子进程；
+                           调试单个PDF的处理流程时可设为False，按顺序在当前进程中处理
+            use_cache (bool): 是否使用PDF处理结果的磁盘缓存（默认True）
+                            同一PDF未被修改时，再次检测直接读取缓存，跳过提取、分字和序列生成
+            verbose (bool): 是否输出处理进度（默认True）
+                          作为库批量调用时可设为False，只保留报告和错误信息
+            profile (bool): 是否输出各处理阶段的耗时（默认False）
 
         Raises:
             FileNotFoundError: 当PDF文件不存在时（在PDFTextExtractor中抛出）
@@ -141,7 +235,44 @@ class SimilarSequenceDetector:
         # 创建相似度计算器：专门用于计算两个序列的相似度
         self.calculator = SimilarityCalculator(min_similarity)
 
-    def process_pdf(self, extractor: PDFTextExtractor, pdf_name: str) -> Tuple[List[CharInfo], Dict[str, List[SequenceInfo]]]:
+        # 是否并行处理两个PDF
+        self.parallel = parallel
+
+        # 是否使用磁盘缓存
+        self.use_cache = use_cache
+
+        # 是否输出处理进度
+        self.verbose = verbose
+
+        # 是否输出各处理阶段的耗时
+        self.profile = profile
+
+        # 已处理过的PDF结果，键为提取器的id（提取器随检测器存活，id不会被复用）
+        # DuplicateDetector 先做完全匹配检测再做相似度检测时，第二次不再重复处理
+        self._pdf_cache: Dict[int, Tuple[List[CharInfo], Dict[str, List[SequenceInfo]]]] = {}
+
+    def _log(self, message: str):
+        """输出处理进度信息（verbose为False时不输出）"""
+        if self.verbose:
+            print(message)
+
+    @contextmanager
+    def _stage(self, name: str):
+        """
+        统计一个处理阶段的耗时（profile为False时不计时、不输出）
+
+        Args:
+            name (str): 阶段名称，显示在耗时信息中
+        """
+        if not self.profile:
+            yield
+            return
+        start_time = time.perf_counter()
+        yield
+        print(f"   [{name}] 耗时 {time.perf_counter() - start_time:.2f} 秒")
+
+    def process_pdf(self, extractor: PDFTextExtractor, pdf_name: str,
+                    return_chars: bool = True) -> Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]:
         """
         处理单个PDF文件
 
@@ -158,11 +289,13 @@ class SimilarSequenceDetector:
                                          该提取器已经关联了特定的PDF文件
             pdf_name (str): PDF文件的显示名称，用于日志输出
                            例如："文件1"、"文件2"或实际文件名
+            return_chars (bool): 是否返回字符列表（默认True）
+                               只需要查找表时设为False，字符列表在查找表建好后即可释放
 
         Returns:
-            Tuple[List[CharInfo], Dict[str, List[SequenceInfo]]]:
+            Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]:
                 返回一个元组，包含：
-                - List[CharInfo]: 字符信息列表
+                - List[CharInfo]: 字符信息列表（return_chars为False时为None）
                   包含PDF中的所有字符，每个字符记录了其内容和位置
                 - Dict[str, List[SequenceInfo]]: 序列查找表
                   键：8字序列的字符串内容
@@ -178,55 +311,161 @@ class SimilarSequenceDetector:
             - 查找表的结构允许快速查找某个序列是否存在于PDF中
             - 每个序列可能出现多次，因此值是列表类型
             - 性能提示：对于大型PDF，此步骤可能耗时较长
+            - 同一提取器只处理一次，再次调用直接返回上次的结果
+            - 提取出错时输出错误信息并返回空结果，不记为已处理
+        """
+        cached = _reuse_result(self._pdf_cache.get(id(extractor)), return_chars)
+        if cached is not None:
+            return cached
+
+        try:
+            return self._run_pipeline(extractor, pdf_name, return_chars)
+        except Exception as e:
+            return self._extraction_failed(pdf_name, e, return_chars)
+
+    def _extraction_failed(self, pdf_name: str, error: Exception,
+                           return_chars: bool) -> Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]:
+        """提取出错时输出错误信息并返回空结果（不写入任何缓存，下次重新提取）"""
+        print(f"   {pdf_name} 提取PDF文本时出错: {error}")
+        return ([] if return_chars else None), {}
+
+    def _run_pipeline(self, extractor: PDFTextExtractor, pdf_name: str,
+                      return_chars: bool) -> Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]:
+        """
+        提取、分字、生成序列并构建查找表（process_pdf 的处理部分）
+
+        提取出错时直接抛出异常，不返回只处理了一部分的结果；处理完成后记入 _pdf_cache。
         """
         # 输出处理开始标记
-        print(f"\n=== 处理 {pdf_name} ===")
+        self._log(f"\n=== 处理 {pdf_name} ===")
 
         # ====================================================================
-        # 步骤1: 提取PDF文本
+        # 提取、分字、生成序列（流水线处理）
         # ====================================================================
-        print("1. 提取PDF文本...")
-        start_time = time.time()  # 记录开始时间，用于性能统计
+        # 提取器逐行产出文本，处理器逐个产出字符，生成器用8字符滑动窗口逐个产出序列，
+        # 直接汇入查找表；整份文档的文本行列表和序列列表不再同时驻留内存
+        self._log("1. 提取PDF文本、分字并生成8字序列...")
+
+        counts = {'lines': 0, 'chars': 0}  # 流水线中经过的文本行数和字符数
+        # 需要返回字符列表时才保留全部字符（CharInfo对象，包含char、page、line）
+        chars = [] if return_chars else None
+
+        # PDFTextExtractor 逐行产出；其他提取器（增强版、Word）只提供一次返回全部行的接口
+        iter_text = (getattr(extractor, 'iter_text_with_positions', None)
+                     or extractor.extract_text_with_positions)
+
+        def iter_lines():
+            for line_info in iter_text():
+                counts['lines'] += 1
+                yield line_info
+
+        def iter_chars():
+            for char in self.processor.iter_chars(iter_lines()):
+                counts['chars'] += 1
+                if chars is not None:
+                    chars.append(char)
+                yield char
 
-        # 调用提取器提取文本，返回包含文本和位置信息的列表
-        extracted_text = extractor.extract_text_with_positions()
+        # 构建序列查找表：将序列内容作为键，其所有出现位置作为值
+        # 例如："这是一个测试文档" 会生成 "这是一个测试"、"是一个测试文" 等序列
+        with self._stage(f"处理{pdf_name}"):
+            lookup_table = self.generator.create_sequence_lookup_table(
+                self.generator.iter_sequences(iter_chars())
+            )
+        sequence_count = max(counts['chars'] - 7, 0)
 
-        # 输出提取结果统计和耗时
-        print(f"   提取了 {len(extracted_text)} 行文本，耗时 {time.time() - start_time:.2f} 秒")
+        # 输出处理结果统计
+        self._log(f"   提取了 {counts['lines']} 行文本，生成了 {counts['chars']} 个字符，"
+                  f"{sequence_count} 个序列，{len(lookup_table)} 个唯一序列")
 
-        # ====================================================================
-        # 步骤2: 文本预处理（分字）
-        # ====================================================================
-        print("2. 文本预处理（分字）...")
-        start_time = time.time()  # 重置计时器
+        # 返回字符列表和查找表，供后续相似度检测使用
+        self._pdf_cache[id(extractor)] = (chars, lookup_table)
+        return chars, lookup_table
 
-        # 将提取的文本行分割成单个字符，每个字符记录其位置（页码、行号）
-        # 返回的是CharInfo对象列表，每个对象包含：char(字符)、page(页码)、line(行号)
-        chars = self.processor.process_extracted_text(extracted_text)
+    def process_both_pdfs(self, return_chars: bool = True, skip_empty: bool = False) -> Tuple[Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]],
+                                                                    Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]]:
+        """
+        处理两个PDF文件
 
-        # 输出分字结果统计和耗时
-        print(f"   生成了 {len(chars)} 个字符，耗时 {time.time() - start_time:.2f} 秒")
+        两个PDF的处理互不相关，parallel为True时各交给一个子进程同时处理
+        （PDF解析和分字都是CPU密集的纯Python代码，多线程受GIL限制），
+        墙钟时间约为两者中较慢的一个加上结果回传的序列化开销；
+        否则（或只有一个CPU核时）在当前进程中依次处理。
 
-        # ====================================================================
-        # 步骤3: 生成8字序列
-        # ====================================================================
-        print("3. 生成8字序列...")
-        start_time = time.time()  # 重置计时器
+        Args:
+            return_chars (bool): 是否返回字符列表（同 process_pdf）
+            skip_empty (bool): 依次处理时，文件1没有生成任何序列（如只有图片的扫描件）
+                               则不再处理文件2，文件2返回 (None, {})；
+                               并行处理时两个文件同时开始，不受此参数影响
 
-        # 从字符列表中生成所有连续的8字序列
-        # 例如："这是一个测试文档" 会生成 "这是一个测试"、"是一个测试文" 等序列
-        sequences = self.generator.generate_sequences(chars)
+        Returns:
+            ((文件1字符列表, 文件1查找表), (文件2字符列表, 文件2查找表))
+        """
+        key1, key2 = id(self.extractor1), id(self.extractor2)
+        result1 = _reuse_result(self._pdf_cache.get(key1), return_chars)
+        result2 = _reuse_result(self._pdf_cache.get(key2), return_chars)
+        if result1 is not None and result2 is not None:
+            return result1, result2
+
+        if not self.parallel or (os.cpu_count() or 1) < 2:
+            if result1 is None:
+                result1 = self._cached_process_pdf(self.extractor1, "文件1", return_chars)
+                self._pdf_cache[key1] = result1
+            if skip_empty and not result1[1]:
+                return result1, (None, {})
+            if result2 is None:
+                result2 = self._cached_process_pdf(self.extractor2, "文件2", return_chars)
+        else:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                future1 = executor.submit(_process_pdf_worker, self.extractor1, self.pdf1_path, "文件1", self.min_similarity,
+                                          self.use_cache, self.verbose, return_chars, self.profile)
+                future2 = executor.submit(_process_pdf_worker, self.extractor2, self.pdf2_path, "文件2", self.min_similarity,
+                                          self.use_cache, self.verbose, return_chars, self.profile)
+                result1, result2 = future1.result(), future2.result()
+
+        self._pdf_cache[key1] = result1
+        self._pdf_cache[key2] = result2
+        return result1, result2
+
+    def _cached_process_pdf(self, extractor: PDFTextExtractor, pdf_name: str,
+                            return_chars: bool = True) -> Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]:
+        """
+        处理单个PDF文件（带磁盘缓存）
 
-        # 构建序列查找表：将序列内容作为键，其所有出现位置作为值
-        # 这样可以快速查询某个序列是否存在以及出现的位置
-        lookup_table = self.generator.create_sequence_lookup_table(sequences)
+        按 (路径, 修改时间, 文件大小) 查找上次的处理结果，命中时直接读取，
+        跳过提取、分字和序列生成三个步骤；未命中时重新处理，
+        只有提取完整且生成了序列时才写入缓存，提取出错的结果不会被缓存下来。
 
-        # 输出序列生成结果统计和耗时
-        print(f"   生成了 {len(sequences)} 个序列，{len(lookup_table)} 个唯一序列，"
-              f"耗时 {time.time() - start_time:.2f} 秒")
+        Args:
+            extractor (PDFTextExtractor): PDF文本提取器实例
+            pdf_name (str): PDF文件的显示名称，用于日志输出
+            return_chars (bool): 是否返回字符列表（同 process_pdf）
 
-        # 返回字符列表和查找表，供后续相似度检测使用
-        return chars, lookup_table
+        Returns:
+            Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]: 同 process_pdf
+        """
+        pdf_path = getattr(extractor, 'pdf_path', None)
+        if not self.use_cache or not pdf_path:
+            return self.process_pdf(extractor, pdf_name, return_chars)
+
+        cache_file = _cache_path(pdf_path, extractor)
+        with self._stage(f"读取{pdf_name}缓存"):
+            result = _reuse_result(load_cached(cache_file), return_chars)
+        if result is not None:
+            self._log(f"\n=== 处理 {pdf_name} ===")
+            self._log(f"使用缓存结果: {cache_file}")
+            return result
+
+        try:
+            result = self._run_pipeline(extractor, pdf_name, return_chars)
+        except Exception as e:
+            return self._extraction_failed(pdf_name, e, return_chars)
+
+        # 没有生成任何序列时不写缓存：可能确实没有文本（如扫描件），
+        # 也可能是提取器内部吞掉了错误（增强版、Word提取器出错时返回空列表）
+        if result[1]:
+            save_cached(cache_file, result)
+        return result
 
     def detect_similar_sequences(self) -> List[SimilarSequenceInfo]:
         """
@@ -261,39 +500,45 @@ class SimilarSequenceDetector:
             - 性能取决于PDF大小和序列数量，可能需要几秒到几分钟
         """
         # 输出检测开始标记
-        print("开始检测相似序列...")
+        self._log("开始检测相似序列...")
 
         # ====================================================================
         # 处理两个PDF文件
         # ====================================================================
-        # 处理第一个PDF：提取文本、生成序列、构建查找表
-        # chars1 保存字符信息列表，lookup_table1 保存序列查找表
-        chars1, lookup_table1 = self.process_pdf(self.extractor1, "文件1")
-
-        # 处理第二个PDF：同样的流程
-        chars2, lookup_table2 = self.process_pdf(self.extractor2, "文件2")
+        # 提取文本、生成序列、构建查找表
+        # chars 保存字符信息列表，lookup_table 保存序列查找表
+        # 相似度检测只用到查找表，不需要保留字符列表
+        (_, lookup_table1), (_, lookup_table2) = self.process_both_pdfs(return_chars=False, skip_empty=True)
+
+        # 任一文件没有生成序列（如没有文本层的扫描件）时不可能有相似序列，直接返回
+        if not lookup_table1:
+            self._log("文件1无可提取文本，跳过相似序列检测")
+            return []
+        if not lookup_table2:
+            self._log("文件2无可提取文本，跳过相似序列检测")
+            return []
 
         # ====================================================================
         # 检测相似序列
         # ====================================================================
-        print("\n=== 检测相似序列 ===")
-        print(f"相似度阈值: {self.min_similarity:.2f}")  # 显示当前使用的相似度阈值
-        start_time = time.time()  # 记录开始时间
+        self._log("\n=== 检测相似序列 ===")
+        self._log(f"相似度阈值: {self.min_similarity:.2f}")  # 显示当前使用的相似度阈值
 
         # 调用序列生成器的相似序列检测方法
         # 该方法会比较两个查找表，找出所有相似的序列对
         # 并计算每对序列的相似度和差异
-        similar_sequences = self.generator.find_similar_sequences(lookup_table1, lookup_table2)
+        with self._stage("检测相似序列"):
+            similar_sequences = self.generator.find_similar_sequences(lookup_table1, lookup_table2)
 
-        # 输出检测结果统计和耗时
-        print(f"检测完成，找到 {len(similar_sequences)} 个相似序列，"
-              f"耗时 {time.time() - start_time:.2f} 秒")
+        # 输出检测结果统计
+        self._log(f"检测完成，找到 {len(similar_sequences)} 个相似序列")
 
         # 返回相似序列列表
         return similar_sequences
 
     def format_output(self, similar_sequences: List[SimilarSequenceInfo],
-                      show_all_positions: bool = True, max_results: Optional[int] = None) -> str:
+                      show_all_positions: bool = True, max_results: Optional[int] = None,
+                      summary: Optional[Dict] = None) -> str:
         """
         格式化输出结果
 
@@ -313,6 +558,9 @@ class SimilarSequenceDetector:
             max_results (Optional[int]): 最大显示结果数量
                                         - None: 显示所有结果
                                         - 整数: 只显示前N个结果，避免输出过长
+            summary (Optional[Dict]): 预先算好的统计信息（get_sequence_summary 的返回值）
+                                     - None: 在格式化时统计
+                                     - 同一结果既打印又保存时传入，避免重复统计
 
         Returns:
             str: 格式化的报告文本，可直接打印或保存到文件
@@ -329,115 +577,160 @@ class SimilarSequenceDetector:
             - 相似度保留3位小数，便于精确比较
             - 位置信息包含页码和行号，便于定位
         """
-        # 初始化输出列表
-        output = []
+        buffer = io.StringIO()
+        self._emit(buffer.write, similar_sequences, show_all_positions, max_results, summary)
+        # 每行都以换行结尾，去掉最后一个换行，与逐行拼接的结果保持一致
+        buffer.truncate(max(buffer.tell() - 1, 0))
+        return buffer.getvalue()
+
+    def _emit(self, write, similar_sequences: List[SimilarSequenceInfo],
+              show_all_positions: bool = True, max_results: Optional[int] = None,
+              summary: Optional[Dict] = None) -> None:
+        """
+        逐行写出报告内容（format_output 和 save_results 共用）
 
+        每行以换行结尾，直接交给 write 输出，不在内存中累积整份报告。
+
+        Args:
+            write: 写入函数，如 io.StringIO.write 或文件对象的 write
+            similar_sequences, show_all_positions, max_results, summary: 同 format_output
+        """
         # ====================================================================
         # 报告头部
         # ====================================================================
-        output.append("=" * 80)  # 分隔线
-        output.append("PDF文件相似序列检测报告")  # 报告标题
-        output.append("=" * 80)
-        output.append(f"检测完成时间: {time.strftime('%Y-%m-%d %H:%M:%S')}")  # 当前时间
-        output.append(f"文件1: {self.pdf1_path}")  # 第一个PDF路径
-        output.append(f"文件2: {self.pdf2_path}")  # 第二个PDF路径
-        output.append(f"相似度阈值: {self.min_similarity:.2f}")  # 使用的相似度阈值
-        output.append(f"相似序列总数: {len(similar_sequences)}")  # 找到的相似序列数量
-        output.append("")  # 空行
+        write("=" * 80 + "\n")  # 分隔线
+        write("PDF文件相似序列检测报告\n")  # 报告标题
+        write("=" * 80 + "\n")
+        write(f"检测完成时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")  # 当前时间
+        write(f"文件1: {self.pdf1_path}\n")  # 第一个PDF路径
+        write(f"文件2: {self.pdf2_path}\n")  # 第二个PDF路径
+        write(f"相似度阈值: {self.min_similarity:.2f}\n")  # 使用的相似度阈值
+        write(f"相似序列总数: {len(similar_sequences)}\n")  # 找到的相似序列数量
+        write("\n")  # 空行
 
         # ====================================================================
         # 无相似序列的情况
         # ====================================================================
         if not similar_sequences:
             # 如果没有找到相似序列，输出提示信息
-            output.append(f"未发现相似度≥{self.min_similarity:.2f}的8字序列。")
-            return "\n".join(output)  # 直接返回，不继续处理
+            write(f"未发现相似度≥{self.min_similarity:.2f}的8字序列。\n")
+            return  # 直接返回，不继续处理
 
         # ====================================================================
         # 限制显示结果数量
         # ====================================================================
-        # 如果指定了最大显示数量，只取前N个结果
+        # 如果指定了最大显示数量，只取相似度最高的N个结果
         # 这对于结果数量很大时很有用，可以避免输出过长
-        display_sequences = similar_sequences[:max_results] if max_results else similar_sequences
+        # heapq.nlargest 为 O(N log k)，不要求输入已排序，也不生成完整的排序副本；
+        # 相似度相同时保持原有顺序，与排序后切片的结果一致
+        if max_results:
+            display_sequences = heapq.nlargest(max_results, similar_sequences,
+                                               key=attrgetter('similarity'))
+        else:
+            display_sequences = similar_sequences
 
         # ====================================================================
         # 统计信息
         # ====================================================================
-        # 调用序列生成器的统计方法，计算各项统计指标
-        summary = self.generator.get_sequence_summary(similar_sequences)
-
-        output.append("统计信息:")
-        output.append(f"- 相似序列总数: {summary['total_similar']}")
-        output.append(f"- 高相似度(>0.9): {summary['high_similarity_count']} 个")
-        output.append(f"- 中相似度(0.8-0.9): {summary['medium_similarity_count']} 个")
-        output.append(f"- 低相似度(0.75-0.8): {summary['low_similarity_count']} 个")
-        output.append(f"- 平均相似度: {summary['average_similarity']:.3f}")
-        output.append(f"- 最高相似度: {summary['max_similarity']:.3f}")
-        output.append(f"- 最低相似度: {summary['min_similarity']:.3f}")
-        output.append("")  # 空行
+        # 调用序列生成器的统计方法，计算各项统计指标（调用方已算好时直接使用）
+        if summary is None:
+            summary = self.generator.get_sequence_summary(similar_sequences)
+
+        write("统计信息:\n")
+        write(f"- 相似序列总数: {summary['total_similar']}\n")
+        write(f"- 高相似度(>0.9): {summary['high_similarity_count']} 个\n")
+        write(f"- 中相似度(0.8-0.9): {summary['medium_similarity_count']} 个\n")
+        write(f"- 低相似度(0.75-0.8): {summary['low_similarity_count']} 个\n")
+        write(f"- 平均相似度: {summary['average_similarity']:.3f}\n")
+        write(f"- 最高相似度: {summary['max_similarity']:.3f}\n")
+        write(f"- 最低相似度: {summary['min_similarity']:.3f}\n")
+        write("\n")  # 空行
 
         # ====================================================================
         # 详细结果列表
         # ====================================================================
-        output.append("相似序列详情 (按相似度排序):")
-        output.append("-" * 80)  # 分隔线
+        write("相似序列详情 (按相似度排序):\n")
+        write("-" * 80 + "\n")  # 分隔线
 
         # 遍历每个相似序列，输出详细信息
         for i, sim_seq in enumerate(display_sequences, 1):  # enumerate从1开始编号
-            # 输出序列编号和相似度（保留3位小数）
-            output.append(f"{i}. 相似度: {sim_seq.similarity:.3f}")
-
-            # 输出文件1中的序列内容
-            output.append(f"   文件1: '{sim_seq.sequence1.sequence}'")
-
-            # 输出文件1中序列的位置信息（起止页码和行号）
-            output.append(f"          位置: 页{sim_seq.sequence1.start_char.page}行{sim_seq.sequence1.start_char.line} - "
-                        f"页{sim_seq.sequence1.end_char.page}行{sim_seq.sequence1.end_char.line}")
-
-            # 输出文件2中的序列内容
-            output.append(f"   文件2: '{sim_seq.sequence2.sequence}'")
-
-            # 输出文件2中序列的位置信息
-            output.append(f"          位置: 页{sim_seq.sequence2.start_char.page}行{sim_seq.sequence2.start_char.line} - "
-                        f"页{sim_seq.sequence2.end_char.page}行{sim_seq.sequence2.end_char.line}")
-
-            # ====================================================================
-            # 差异分析
-            # ====================================================================
-            # 如果有差异且不是"完全相同"，则输出差异信息
-            if sim_seq.differences and sim_seq.differences != ["完全相同"]:
-                # differences是一个列表，包含所有差异的描述
-                output.append(f"   差异: {', '.join(sim_seq.differences)}")
-            else:
-                output.append(f"   差异: 无")
-
-            output.append("")  # 空行，分隔不同的序列
+            # 输出序列编号，以及该序列对的详细信息（整块一次写出）
+            write(f"{i}. ")
+            write(self._format_entry(sim_seq))
 
         # ====================================================================
         # 结果截断提示
         # ====================================================================
         # 如果限制了显示数量且实际结果更多，提示还有更多结果
         if max_results and len(similar_sequences) > max_results:
-            output.append(f"... 还有 {len(similar_sequences) - max_results} 个相似序列未显示")
-            output.append("完整结果请查看保存的文件。")
+            write(f"... 还有 {len(similar_sequences) - max_results} 个相似序列未显示\n")
+            write("完整结果请查看保存的文件。\n")
+
+    @staticmethod
+    def _format_entry(sim_seq: SimilarSequenceInfo) -> str:
+        """
+        格式化单个相似序列对的详细信息（不含编号），以空行结尾
 
-        # 将列表合并为字符串并返回
-        return "\n".join(output)
+        Args:
+            sim_seq (SimilarSequenceInfo): 相似序列信息
+
+        Returns:
+            str: 相似度、两个文件中的序列内容和位置、差异分析，每行以换行结尾
+        """
+        seq1, seq2 = sim_seq.sequence1, sim_seq.sequence2
+
+        # 如果有差异且不是"完全相同"，则输出差异信息
+        # differences是一个列表，包含所有差异的描述
+        if sim_seq.differences and sim_seq.differences != ["完全相同"]:
+            differences = ', '.join(sim_seq.differences)
+        else:
+            differences = "无"
+
+        return (
+            # 相似度（保留3位小数）
+            f"相似度: {sim_seq.similarity:.3f}\n"
+            # 文件1中的序列内容及其位置信息（起止页码和行号）
+            f"   文件1: '{seq1.sequence}'\n"
+            f"          位置: 页{seq1.start_char.page}行{seq1.start_char.line} - "
+            f"页{seq1.end_char.page}行{seq1.end_char.line}\n"
+            # 文件2中的序列内容及其位置信息
+            f"   文件2: '{seq2.sequence}'\n"
+            f"          位置: 页{seq2.start_char.page}行{seq2.start_char.line} - "
+            f"页{seq2.end_char.page}行{seq2.end_char.line}\n"
+            # 差异分析
+            f"   差异: {differences}\n"
+            # 空行，分隔不同的序列
+            "\n"
+        )
 
     def save_results(self, similar_sequences: List[SimilarSequenceInfo],
-                     output_file: str = "similar_sequences_results.txt"):
+                     output_file: str = "similar_sequences_results.txt",
+                     output_format: str = "text", summary: Optional[Dict] = None,
+                     output_text: Optional[str] = None):
         """
         保存结果到文件
 
-        将检测报告保存到文本文件中，便于后续查阅和分享。
+        将检测报告保存到文本文件中，便于后续查阅和分享；
+        也可以保存为JSON或pickle，供其他程序直接读取数据，省去逐行格式化报告的开销。
 
         Args:
             similar_sequences (List[SimilarSequenceInfo]): 相似序列信息列表
             output_file (str): 输出文件的名称
                               默认为 "similar_sequences_results.txt"
                               可以包含相对路径或绝对路径
+            output_format (str): 输出格式
+                                - "text": 可读的文本报告（默认）
+                                - "json": 相似序列列表的JSON数组（安装了orjson时用orjson序列化）
+                                - "jsonl": 每行一个相似序列的JSON对象（字段同"json"），逐条写入，
+                                           不在内存中生成整个数组，适合结果很多时流式读取
+                                - "pickle": 相似序列列表的pickle，可用 pickle.load 直接还原
+            summary (Optional[Dict]): 预先算好的统计信息，仅文本格式使用（同 format_output）
+            output_text (Optional[str]): 已经格式化好的完整报告（format_output 的返回值，
+                                         且未限制 max_results），仅文本格式使用；
+                                         给出时直接写入，不再重新格式化
 
         Raises:
+            ValueError: 当输出格式不受支持时
             IOError: 当文件写入失败时（如权限不足、磁盘空间不足等）
             Exception: 其他可能的异常
 
@@ -445,21 +738,52 @@ class SimilarSequenceDetector:
             >>> detector.save_results(similar_sequences, "my_report.txt")
             >>> # 保存到指定目录
             >>> detector.save_results(similar_sequences, "/path/to/report.txt")
+            >>> # 保存为pickle，供后续分析
+            >>> detector.save_results(similar_sequences, "results.pkl", output_format="pickle")
+            >>> # 每行一条JSON记录
+            >>> detector.save_results(similar_sequences, "results.jsonl", output_format="jsonl")
 
         Note:
             - 文件使用UTF-8编码，支持中文字符
-            - 如果文件已存在，将被覆盖
+            - 如果文件已存在，将被覆盖；写入完成后才替换，中途出错时原文件保持不变
             - 成功保存后会输出确认消息到控制台
         """
-        # 调用format_output方法生成报告内容
-        # show_all_positions=True 表示显示所有位置信息
-        output = self.format_output(similar_sequences, show_all_positions=True)
+        if output_format not in ("text", "json", "jsonl", "pickle"):
+            raise ValueError(f"不支持的输出格式: {output_format}")
 
         try:
-            # 以写入模式打开文件（如果文件存在则覆盖）
-            # encoding='utf-8' 确保中文字符正确保存
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(output)  # 将报告内容写入文件
+            if output_format == "json":
+                records = [asdict(sim_seq) for sim_seq in similar_sequences]
+                if orjson is not None:
+                    data = orjson.dumps(records)
+                else:
+                    data = json.dumps(records, ensure_ascii=False).encode('utf-8')
+                with atomic_open(output_file, 'wb') as f:
+                    f.write(data)
+            elif output_format == "jsonl":
+                with atomic_open(output_file, 'wb') as f:
+                    for sim_seq in similar_sequences:
+                        record = asdict(sim_seq)
+                        if orjson is not None:
+                            f.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+                        else:
+                            f.write(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+                            f.write(b"\n")
+            elif output_format == "pickle":
+                with atomic_open(output_file, 'wb') as f:
+                    pickle.dump(similar_sequences, f, protocol=pickle.HIGHEST_PROTOCOL)
+            else:
+                # 先写临时文件，写完后再替换目标文件（如果文件存在则覆盖）
+                # encoding='utf-8' 确保中文字符正确保存
+                with atomic_open(output_file, 'w', encoding='utf-8', newline='\n') as f:
+                    if output_text is not None:
+                        # format_output 去掉了报告末尾的换行，写入文件时补上
+                        f.write(output_text)
+                        f.write("\n")
+                    else:
+                        # 报告内容逐行直接写入文件
+                        # show_all_positions=True 表示显示所有位置信息
+                        self._emit(f.write, similar_sequences, show_all_positions=True, summary=summary)
 
             # 输出成功消息
             print(f"\n结果已保存到: {output_file}")
@@ -532,6 +856,9 @@ class SimilarSequenceDetector:
         # 调用detect_similar_sequences方法进行实际检测
         similar_sequences = self.detect_similar_sequences()
 
+        # 统计信息只计算一次，打印和保存的报告共用
+        summary = self.generator.get_sequence_summary(similar_sequences)
+
         # ====================================================================
         # 显示结果
         # ====================================================================
@@ -542,8 +869,9 @@ class SimilarSequenceDetector:
         # 调用format_output格式化结果，并打印到控制台
         # show_all_positions=False: 只显示首次出现位置，避免输出过长
         # max_results=show_max_results: 限制显示数量
-        print(self.format_output(similar_sequences, show_all_positions=False,
-                               max_results=show_max_results))
+        report = self.format_output(similar_sequences, show_all_positions=False,
+                                    max_results=show_max_results, summary=summary)
+        print(report)
 
         # ====================================================================
         # 保存结果
@@ -551,7 +879,11 @@ class SimilarSequenceDetector:
         if save_to_file:
             # 如果save_to_file为True，调用save_results保存到文件
             # 使用默认文件名："similar_sequences_results.txt"
-            self.save_results(similar_sequences)
+            # 结果不超过显示数量时，控制台上的报告就是完整报告，直接写入文件不再重新格式化；
+            # 否则由 save_results 逐行生成完整报告写入文件
+            is_complete = not show_max_results or len(similar_sequences) <= show_max_results
+            self.save_results(similar_sequences, summary=summary,
+                              output_text=report if is_complete else None)
 
         # ====================================================================
         # 显示总耗时
@@ -599,7 +931,9 @@ class DuplicateDetector:
         similarity_detector (SimilarSequenceDetector): 内部的相似序列检测器实例
     """
 
-    def __init__(self, pdf1_path: str, pdf2_path: str, min_similarity: float = 0.75):
+    def __init__(self, pdf1_path: str, pdf2_path: str, min_similarity: float = 0.75,
+                 parallel: bool = True, use_cache: bool = True, verbose: bool = True,
+                 profile: bool = False):
         """
         初始化检测器（兼容旧接口）
 
@@ -610,6 +944,10 @@ class DuplicateDetector:
             pdf2_path (str): 第二个PDF文件的完整路径
             min_similarity (float): 最小相似度阈值（默认0.75）
                                  虽然是兼容接口，但仍支持设置相似度
+            parallel (bool): 是否并行处理两个PDF（默认True）
+            use_cache (bool): 是否使用PDF处理结果的磁盘缓存（默认True）
+            verbose (bool): 是否输出处理进度（默认True）
+            profile (bool): 是否输出各处理阶段的耗时（默认False）
 
         Note:
             这个构造函数主要为了向后兼容。
@@ -617,9 +955,11 @@ class DuplicateDetector:
         """
         # 创建内部的SimilarSequenceDetector实例
         # 所有实际的检测工作都由这个实例完成
-        self.similarity_detector = SimilarSequenceDetector(pdf1_path, pdf2_path, min_similarity)
+        self.similarity_detector = SimilarSequenceDetector(pdf1_path, pdf2_path, min_similarity,
+                                                           parallel, use_cache, verbose, profile)
 
-    def process_pdf(self, extractor: PDFTextExtractor, pdf_name: str) -> Tuple[List[CharInfo], Dict[str, List[SequenceInfo]]]:
+    def process_pdf(self, extractor: PDFTextExtractor, pdf_name: str,
+                    return_chars: bool = True) -> Tuple[Optional[List[CharInfo]], Dict[str, List[SequenceInfo]]]:
         """
         处理PDF文件（兼容旧接口）
 
@@ -628,6 +968,7 @@ class DuplicateDetector:
         Args:
             extractor: PDF提取器
             pdf_name: PDF名称
+            return_chars: 是否返回字符列表
 
         Returns:
             Tuple[字符列表, 序列查找表]
@@ -636,7 +977,7 @@ class DuplicateDetector:
             此方法仅为兼容旧接口保留，新代码无需调用。
         """
         # 直接委托给内部的SimilarSequenceDetector处理
-        return self.similarity_detector.process_pdf(extractor, pdf_name)
+        return self.similarity_detector.process_pdf(extractor, pdf_name, return_chars)
 
     def detect_duplicates(self) -> Dict[str, Tuple[List[SequenceInfo], List[SequenceInfo]]]:
         """
@@ -657,9 +998,10 @@ class DuplicateDetector:
         Note:
             新功能建议使用detect_similar_sequences()方法。
         """
-        # 处理两个PDF文件
-        chars1, lookup_table1 = self.process_pdf(self.similarity_detector.extractor1, "文件1")
-        chars2, lookup_table2 = self.process_pdf(self.similarity_detector.extractor2, "文件2")
+        # 处理两个PDF文件（可并行，见 SimilarSequenceDetector.process_both_pdfs）
+        # 完全匹配检测只用到查找表，不需要保留字符列表
+        (_, lookup_table1), (_, lookup_table2) = self.similarity_detector.process_both_pdfs(return_chars=False,
+                                                                                              skip_empty=True)
 
         # 调用SequenceGenerator的find_repeated_sequences方法
         # 该方法只找出完全相同的序列（相似度=1.0）
@@ -682,75 +1024,85 @@ class DuplicateDetector:
         Note:
             此方法会提示用户有新的相似度检测功能可用。
         """
-        # 初始化输出列表
-        output = []
+        buffer = io.StringIO()
+        self._emit(buffer.write, repeated_sequences, show_all_positions)
+        # 去掉最后一行的换行，与逐行拼接的结果保持一致
+        buffer.truncate(max(buffer.tell() - 1, 0))
+        return buffer.getvalue()
+
+    def _emit(self, write, repeated_sequences: Dict[str, Tuple[List[SequenceInfo], List[SequenceInfo]]],
+              show_all_positions: bool = True) -> None:
+        """
+        逐行写出完全匹配报告（format_output 和 save_results 共用）
 
+        Args:
+            write: 写入函数，如 io.StringIO.write 或文件对象的 write
+            repeated_sequences, show_all_positions: 同 format_output
+        """
         # 报告头部
-        output.append("=" * 80)
-        output.append("PDF文件序列检测报告")
-        output.append("=" * 80)
-        output.append(f"检测完成时间: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append(f"文件1: {self.similarity_detector.pdf1_path}")
-        output.append(f"文件2: {self.similarity_detector.pdf2_path}")
-        output.append(f"完全匹配序列数: {len(repeated_sequences)}")
-        output.append("")
+        write("=" * 80 + "\n")
+        write("PDF文件序列检测报告\n")
+        write("=" * 80 + "\n")
+        write(f"检测完成时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        write(f"文件1: {self.similarity_detector.pdf1_path}\n")
+        write(f"文件2: {self.similarity_detector.pdf2_path}\n")
+        write(f"完全匹配序列数: {len(repeated_sequences)}\n")
+        write("\n")
 
         # 如果没有找到完全匹配的序列
         if not repeated_sequences:
-            output.append("未发现完全相同的8字序列。")
-            output.append("\n提示: 现在系统支持相似度检测，使用 detect_similar_sequences() 方法")
-            output.append(f"可以找到相似度≥{self.similarity_detector.min_similarity:.2f}的序列。")
-            return "\n".join(output)
+            write("未发现完全相同的8字序列。\n")
+            write("\n提示: 现在系统支持相似度检测，使用 detect_similar_sequences() 方法\n")
+            write(f"可以找到相似度≥{self.similarity_detector.min_similarity:.2f}的序列。\n")
+            return
 
         # 获取统计信息
         summary = self.similarity_detector.generator.get_exact_matches_summary(repeated_sequences)
 
         # 输出统计摘要
-        output.append("完全匹配统计:")
-        output.append(f"- 完全匹配序列数: {summary['total_repeated']}")
-        output.append(f"- 文件1中出现总次数: {summary['file1_total_occurrences']}")
-        output.append(f"- 文件2中出现总次数: {summary['file2_total_occurrences']}")
-        output.append("")
+        write("完全匹配统计:\n")
+        write(f"- 完全匹配序列数: {summary['total_repeated']}\n")
+        write(f"- 文件1中出现总次数: {summary['file1_total_occurrences']}\n")
+        write(f"- 文件2中出现总次数: {summary['file2_total_occurrences']}\n")
+        write("\n")
 
         # 输出详细序列列表
-        output.append("完全匹配的序列:")
-        output.append("-" * 80)
+        write("完全匹配的序列:\n")
+        write("-" * 80 + "\n")
 
         # 遍历每个重复序列
         for i, (sequence, (file1_infos, file2_infos)) in enumerate(repeated_sequences.items(), 1):
-            output.append(f"{i}. 序列: '{sequence}'")
+            write(f"{i}. 序列: '{sequence}'\n")
 
             # 输出在文件1中的出现位置
-            output.append(f"   在文件1中出现 {len(file1_infos)} 次:")
+            write(f"   在文件1中出现 {len(file1_infos)} 次:\n")
 
             if show_all_positions:
                 # 显示所有位置
                 for j, seq_info in enumerate(file1_infos, 1):
-                    output.append(f"     {j}. 页{seq_info.start_char.page}行{seq_info.start_char.line} - "
-                                f"页{seq_info.end_char.page}行{seq_info.end_char.line}")
+                    write(f"     {j}. 页{seq_info.start_char.page}行{seq_info.start_char.line} - "
+                          f"页{seq_info.end_char.page}行{seq_info.end_char.line}\n")
             else:
                 # 只显示首次出现位置
-                output.append(f"     首次出现: 页{file1_infos[0].start_char.page}行{file1_infos[0].start_char.line}")
+                write(f"     首次出现: 页{file1_infos[0].start_char.page}行{file1_infos[0].start_char.line}\n")
 
             # 输出在文件2中的出现位置
-            output.append(f"   在文件2中出现 {len(file2_infos)} 次:")
+            write(f"   在文件2中出现 {len(file2_infos)} 次:\n")
 
             if show_all_positions:
                 # 显示所有位置
                 for j, seq_info in enumerate(file2_infos, 1):
-                    output.append(f"     {j}. 页{seq_info.start_char.page}行{seq_info.start_char.line} - "
-                                f"页{seq_info.end_char.page}行{seq_info.end_char.line}")
+                    write(f"     {j}. 页{seq_info.start_char.page}行{seq_info.start_char.line} - "
+                          f"页{seq_info.end_char.page}行{seq_info.end_char.line}\n")
             else:
                 # 只显示首次出现位置
-                output.append(f"     首次出现: 页{file2_infos[0].start_char.page}行{file2_infos[0].start_char.line}")
+                write(f"     首次出现: 页{file2_infos[0].start_char.page}行{file2_infos[0].start_char.line}\n")
 
-            output.append("")  # 空行
+            write("\n")  # 空行
 
         # 提示有新的相似度检测功能
-        output.append("\n提示: 现在系统支持相似度检测！")
-        output.append(f"可以找到相似度≥{self.similarity_detector.min_similarity:.2f}的序列。")
-
-        return "\n".join(output)
+        write("\n提示: 现在系统支持相似度检测！\n")
+        write(f"可以找到相似度≥{self.similarity_detector.min_similarity:.2f}的序列。\n")
 
     def save_results(self, repeated_sequences: Dict[str, Tuple[List[SequenceInfo], List[SequenceInfo]]],
                      output_file: str = "duplicate_results.txt"):
@@ -763,13 +1115,10 @@ class DuplicateDetector:
             repeated_sequences: 重复序列字典
             output_file: 输出文件名（默认为"duplicate_results.txt"）
         """
-        # 生成报告内容
-        output = self.format_output(repeated_sequences)
-
         try:
-            # 写入文件
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(output)
+            # 报告内容逐行直接写入文件
+            with atomic_open(output_file, 'w', encoding='utf-8', newline='\n') as f:
+                self._emit(f.write, repeated_sequences)
             print(f"\n结果已保存到: {output_file}")
         except Exception as e:
             print(f"保存结果时出错: {e}")
@@ -6,12 +6,40 @@
 """
 
 import pdfplumber
+import io
 import re
 import os
-from typing import List, Tuple, Set, Dict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Tuple, Set, Dict, Iterator
 from dataclasses import dataclass
 import logging
 
+from text_patterns import compile_any
+
+# 可选的 rbloom（pip install rbloom），dedup_strategy="bloom" 时用布隆过滤器去重；未安装时回退为精确去重
+try:
+    from rbloom import Bloom
+except ImportError:
+    Bloom = None
+
+# 可选的 PyMuPDF（pip install pymupdf），pdf_backend="pymupdf" 时用它解析PDF；未安装时回退为pdfplumber
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+
+# 页眉页脚检测用的正则，在模块加载时编译一次：页码模式，以及会议信息、期刊名称等关键词。
+# 合并为一个正则匹配小写后的文本，每行只扫描一遍（比 IGNORECASE 匹配快）
+_HEADER_FOOTER_RE = re.compile('|'.join([
+    r'页\s*\d+', r'page\s*\d+', r'\d+\s*/\s*\d+',
+    *map(re.escape, [
+        'conference', 'proceedings', 'journal', 'volume', 'issue',
+        'doi:', 'isbn:', 'issn:', 'copyright', '©'
+    ])
+]))
+
 
 @dataclass
 class TextExtractionConfig:
@@ -21,15 +49,74 @@ class TextExtractionConfig:
     include_citations: bool = False           # 是否包含引文
     include_page_numbers: bool = False       # 是否包含页码
     include_headers_footers: bool = False    # 是否包含页眉页脚
+    header_margin_pts: float = 0              # 不含页眉页脚时，提取前裁掉的页面顶部高度（pt，0表示不裁剪）
+    footer_margin_pts: float = 0              # 不含页眉页脚时，提取前裁掉的页面底部高度（pt，0表示不裁剪）
     include_annotations: bool = False        # 是否包含批注
     min_line_length: int = 10                 # 最小行长度（过滤短行）
     remove_duplicate_lines: bool = True       # 是否去除重复行
+    dedup_strategy: str = "exact"             # 去重方式："exact" 精确去重；"bloom" 布隆过滤器（需rbloom，内存占用固定，约万分之一的行可能被误删）
     page_range: Tuple[int, int] = None       # 页码范围 (start, end)，例如 (1, 146) 表示只提取1-146页
+    parallel: bool = False                    # 页数较多时是否用多进程并行提取各页（pdfplumber；在线程或进程池中调用时不要开启）
+    pdf_backend: str = "pdfplumber"           # PDF解析库："pdfplumber"；"pymupdf"（需PyMuPDF，解析快数倍，分行方式略有不同）
+
+    def __post_init__(self):
+        """
+        检查取值：提取时出错会被当作空结果，取值错误需要在创建配置时就报出
+
+        Raises:
+            ValueError: dedup_strategy 或 pdf_backend 不是支持的取值
+        """
+        if self.dedup_strategy not in ("exact", "bloom"):
+            raise ValueError(f"不支持的去重方式: {self.dedup_strategy}，可选 \"exact\" 或 \"bloom\"")
+        if self.pdf_backend not in ("pdfplumber", "pymupdf"):
+            raise ValueError(f"不支持的PDF解析库: {self.pdf_backend}，可选 \"pdfplumber\" 或 \"pymupdf\"")
+
+
+def _open_pdf(pdf_path: str):
+    """
+    打开PDF：先把整个文件读入内存，再交给pdfplumber解析
+
+    pdfminer 解析时按对象偏移反复 seek 并小块读取文件，从内存缓冲区读取省去了这些系统调用。
+
+    Args:
+        pdf_path: PDF文件路径
+
+    Returns:
+        pdfplumber.PDF: 已打开的PDF对象（可用作上下文管理器）
+    """
+    with open(pdf_path, 'rb') as f:
+        return pdfplumber.open(io.BytesIO(f.read()))
+
+
+def _extract_pages_worker(task: Tuple[str, "TextExtractionConfig", List[int]]) -> List[Tuple[str, int, int]]:
+    """
+    进程池任务：提取一批页面的正文行
+
+    pdfplumber 的对象无法pickle，只传PDF路径和页码，由子进程自行打开PDF。
+
+    Args:
+        task: (PDF路径, 提取配置, 页码列表)
+
+    Returns:
+        List[Tuple[str, int, int]]: 这批页面的 (文本, 页码, 行号) 列表，按页码顺序
+    """
+    pdf_path, config, page_numbers = task
+    extractor = EnhancedPDFTextExtractor(config, pdf_path)
+    pdf_name = os.path.basename(pdf_path)
+    lines = []
+    with _open_pdf(pdf_path) as pdf:
+        total_pages = len(pdf.pages)
+        for page_num in page_numbers:
+            lines.extend(extractor._extract_page_lines(pdf.pages[page_num - 1], page_num, total_pages, pdf_name))
+    return lines
 
 
 class EnhancedPDFTextExtractor:
     """增强版PDF文本提取器"""
 
+    # 并行提取时每个进程任务处理的页数：既摊薄进程间通信和打开PDF的开销，又能在各进程间均衡负载
+    PAGE_BLOCK_SIZE = 16
+
     def __init__(self, config: TextExtractionConfig = None, pdf_path: str = None):
         """
         初始化增强版PDF提取器
@@ -73,7 +160,9 @@ class EnhancedPDFTextExtractor:
 
         self.citation_patterns = [
             r'\[.*?\]',                     # [...]
-            r'\(.*?\d{4}.*?\)',            # (年份)
+            # (年份)。等价于 \(.*?\d{4}.*?\)：括号后的前缀只能走到第一个四位数字处，
+            # 后面找不到右括号时不会再逐个尝试更长的前缀，避免长行上的立方级回溯
+            r'\((?:[^\d\n]|\d(?!\d{3}))*\d{4}.*?\)',
             r'et al\.',                    # et al.
             r'Fig\.\d+',                    # Fig.1
             r'Table \d+',                   # Table 1
@@ -88,40 +177,57 @@ class EnhancedPDFTextExtractor:
             r'^-{5,}$',                     # 多个横线
         ]
 
+        # 逐行判断时使用的预编译正则：只需判断是否命中的模式组合并为一个正则，
+        # 引文需要分别计数（各模式的匹配可以重叠，合并后计数会变），逐个编译，
+        # 另用合并的正则先扫一遍，不含任何引文的行（绝大多数正文行）不必逐个计数
+        self._reference_re = compile_any(self.reference_patterns)
+        self._footnote_re = compile_any(self.footnote_patterns)
+        self._citation_any_re = compile_any(self.citation_patterns)
+        self._citation_res = [re.compile(pattern) for pattern in self.citation_patterns]
+        self._page_header_footer_re = compile_any(self.page_header_footer_patterns)
+
+        # 只取决于文本内容的过滤结果按文本缓存：页码、页眉、期刊名等行在每页重复出现，
+        # 同一文本只跑一遍正则。结果还取决于配置，创建后修改配置需要新建提取器
+        self._skip_by_text = lru_cache(maxsize=65536)(self._skip_by_text_uncached)
+
+    def __getstate__(self):
+        # 带缓存的过滤函数绑定在实例上，无法pickle；传给子进程时去掉，由 __setstate__ 重建（缓存清空）
+        state = self.__dict__.copy()
+        del state['_skip_by_text']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._skip_by_text = lru_cache(maxsize=65536)(self._skip_by_text_uncached)
+
+    # 以下 is_*_line / is_page_header_footer / is_likely_header_footer 判断的是已去除首尾空白的文本，
+    # 由 should_skip_line 统一 strip 一次后传入
+
     def is_reference_line(self, text: str) -> bool:
         """判断是否为引用行"""
-        text_lower = text.lower().strip()
-        for pattern in self.reference_patterns:
-            if re.match(pattern, text_lower):
-                return True
-        return False
+        return self._reference_re.match(text.lower()) is not None
 
     def is_citation_line(self, text: str) -> bool:
         """判断是否包含大量引文"""
+        if self._citation_any_re.search(text) is None:
+            return False
+
         citation_count = 0
         words = text.split()
 
-        for pattern in self.citation_patterns:
-            matches = re.findall(pattern, text)
-            citation_count += len(matches)
+        for pattern in self._citation_res:
+            citation_count += len(pattern.findall(text))
 
         # 如果引文数量超过单词数的30%，认为是引文行
         return len(words) > 0 and (citation_count / len(words)) > 0.3
 
     def is_page_header_footer(self, text: str) -> bool:
         """判断是否为页眉页脚"""
-        text_stripped = text.strip()
-        for pattern in self.page_header_footer_patterns:
-            if re.match(pattern, text_stripped):
-                return True
-        return False
+        return self._page_header_footer_re.match(text) is not None
 
     def is_footnote_line(self, text: str) -> bool:
         """判断是否为脚注/参考文献行"""
-        for pattern in self.footnote_patterns:
-            if re.search(pattern, text):
-                return True
-        return False
+        return self._footnote_re.search(text) is not None
 
     def is_short_or_empty(self, text: str) -> bool:
         """判断是否为短行或空行"""
@@ -132,11 +238,9 @@ class EnhancedPDFTextExtractor:
 
     def normalize_text(self, text: str) -> str:
         """标准化文本"""
-        # 去除多余空格
-        text = re.sub(r'\s+', ' ', text)
-        # 去除首尾空格
-        text = text.strip()
-        return text
+        # 连续空白合并为一个空格并去除首尾空白：无参数的 split 按空白切分并丢弃空串，
+        # 与 \s+ 替换后 strip 的结果相同，但不经过正则引擎
+        return " ".join(text.split())
 
     def extract_main_text_lines(self, pdf_path: str) -> List[Tuple[str, int, int]]:
         """
@@ -157,70 +261,246 @@ class EnhancedPDFTextExtractor:
             print(f"[PDF] ===== STARTING EXTRACTION: {pdf_name} =====")
             print(f"{'='*60}")
 
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
+            if self._resolve_pdf_backend() == "pymupdf":
+                main_text_lines, total_pages = self._extract_lines_pymupdf(pdf_path, pdf_name)
+            else:
+                main_text_lines, total_pages = self._extract_lines_pdfplumber(pdf_path, pdf_name)
 
-                # 应用页码范围限制
-                page_start, page_end = 1, total_pages
-                if self.config.page_range:
-                    page_start, page_end = self.config.page_range
-                    page_end = min(page_end, total_pages)
-                    print(f"[PDF] {pdf_name} - Page range: {page_start}-{page_end} (total: {total_pages} pages)")
-                else:
-                    print(f"[PDF] {pdf_name} - Total pages: {total_pages}")
+            print(f"[PDF] {pdf_name} - COMPLETED: {total_pages} pages processed, {len(main_text_lines)} lines extracted (before dedup)")
+            print(f"{'='*60}\n")
+
+            # 去除重复行；保留重复行时让相同文本共用同一个字符串
+            if self.config.remove_duplicate_lines:
+                main_text_lines = self.remove_duplicate_lines(main_text_lines)
+            else:
+                self._share_repeated_texts(main_text_lines)
+
+            return main_text_lines
 
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # 跳过范围外的页面
-                    if page_num < page_start or page_num > page_end:
-                        continue
-                    try:
-                        # 提取当前页的文本
-                        page_text = page.extract_text()
-                        if not page_text:
-                            print(f"[PDF] {pdf_name} - Page {page_num}/{total_pages}: EMPTY (skipped)")
-                            continue
+        except Exception as e:
+            self.logger.error(f"提取PDF文本时出错: {e}")
+            return []
 
-                        # 按行分割
-                        lines = page_text.split('\n')
+    def _resolve_pdf_backend(self) -> str:
+        """
+        确定实际使用的PDF解析库
 
-                        for line_num, line in enumerate(lines, 1):
-                            line_stripped = line.strip()
+        Returns:
+            str: "pdfplumber" 或 "pymupdf"；配置为 "pymupdf" 但未安装PyMuPDF时回退为 "pdfplumber"
 
-                            # 跳过空行
-                            if not line_stripped:
-                                continue
+        Raises:
+            ValueError: pdf_backend 不是支持的取值
+        """
+        backend = self.config.pdf_backend
+        if backend not in ("pdfplumber", "pymupdf"):
+            raise ValueError(f"不支持的PDF解析库: {backend}，可选 \"pdfplumber\" 或 \"pymupdf\"")
+        if backend == "pymupdf" and fitz is None:
+            self.logger.warning("未安装PyMuPDF（pip install pymupdf），改用pdfplumber解析PDF")
+            return "pdfplumber"
+        return backend
+
+    def _page_numbers(self, total_pages: int, pdf_name: str) -> range:
+        """
+        按配置的页码范围计算要提取的页码
 
-                            # 应用各种过滤规则
-                            if self.should_skip_line(line_stripped, page_num, line_num):
-                                continue
+        Args:
+            total_pages: PDF总页数
+            pdf_name: PDF文件名（用于日志输出）
 
-                            # 标准化文本
-                            normalized_line = self.normalize_text(line_stripped)
+        Returns:
+            range: 要提取的页码（从1开始）
+        """
+        # 应用页码范围限制
+        page_start, page_end = 1, total_pages
+        if self.config.page_range:
+            page_start, page_end = self.config.page_range
+            page_end = min(page_end, total_pages)
+            print(f"[PDF] {pdf_name} - Page range: {page_start}-{page_end} (total: {total_pages} pages)")
+        else:
+            print(f"[PDF] {pdf_name} - Total pages: {total_pages}")
+
+        return range(max(page_start, 1), page_end + 1)
+
+    def _extract_lines_pdfplumber(self, pdf_path: str, pdf_name: str) -> Tuple[List[Tuple[str, int, int]], int]:
+        """
+        用pdfplumber逐页提取正文行
 
-                            if normalized_line:
-                                main_text_lines.append((normalized_line, page_num, line_num))
+        Args:
+            pdf_path: PDF文件路径
+            pdf_name: PDF文件名（用于日志输出）
 
-                    except Exception as e:
-                        print(f"[PDF] {pdf_name} - ERROR on page {page_num}/{total_pages}: {e}")
-                        continue
+        Returns:
+            Tuple[List[Tuple[str, int, int]], int]: ((文本, 页码, 行号) 列表, 总页数)
+        """
+        main_text_lines = []
+        with _open_pdf(pdf_path) as pdf:
+            total_pages = len(pdf.pages)
+
+            page_numbers = self._page_numbers(total_pages, pdf_name)
+
+            # 各页互不相关，页数多时按块交给进程池绕过GIL；块内页码连续，按提交顺序取回结果即保持页序。
+            # 检测器可能同时在两个子进程中各提取一个文档，每个进程池只用一半CPU核心，总进程数不超过核心数
+            workers = (os.cpu_count() or 1) // 2
+            if self.config.parallel and len(page_numbers) > self.PAGE_BLOCK_SIZE and workers > 1:
+                blocks = [list(page_numbers[i:i + self.PAGE_BLOCK_SIZE])
+                          for i in range(0, len(page_numbers), self.PAGE_BLOCK_SIZE)]
+                with ProcessPoolExecutor(max_workers=min(workers, len(blocks))) as executor:
+                    results = executor.map(_extract_pages_worker,
+                                           [(pdf_path, self.config, block) for block in blocks])
+                    for block, block_lines in zip(blocks, results):
+                        main_text_lines.extend(block_lines)
+                        # 每50页报告一次进度
+                        if block[-1] // 50 > (block[0] - 1) // 50 or block[-1] == total_pages:
+                            print(f"[PDF] {pdf_name} - Processed {block[-1]}/{total_pages} pages, {len(main_text_lines)} lines extracted so far")
+            else:
+                for page_num in page_numbers:
+                    main_text_lines.extend(
+                        self._extract_page_lines(pdf.pages[page_num - 1], page_num, total_pages, pdf_name)
+                    )
 
                     # 每50页报告一次进度
                     if page_num % 50 == 0 or page_num == total_pages:
                         print(f"[PDF] {pdf_name} - Processed {page_num}/{total_pages} pages, {len(main_text_lines)} lines extracted so far")
 
-            print(f"[PDF] {pdf_name} - COMPLETED: {total_pages} pages processed, {len(main_text_lines)} lines extracted (before dedup)")
-            print(f"{'='*60}\n")
+        return main_text_lines, total_pages
 
-            # 去除重复行
-            if self.config.remove_duplicate_lines:
-                main_text_lines = self.remove_duplicate_lines(main_text_lines)
+    def _extract_lines_pymupdf(self, pdf_path: str, pdf_name: str) -> Tuple[List[Tuple[str, int, int]], int]:
+        """
+        用PyMuPDF逐页提取正文行
 
-            return main_text_lines
+        PyMuPDF 在C层解析页面，比pdfplumber的纯Python版面分析快得多，不再需要进程池；
+        每页文本经过与pdfplumber相同的逐行过滤。两者拆分行的方式略有不同，提取结果不完全一致。
+
+        Args:
+            pdf_path: PDF文件路径
+            pdf_name: PDF文件名（用于日志输出）
+
+        Returns:
+            Tuple[List[Tuple[str, int, int]], int]: ((文本, 页码, 行号) 列表, 总页数)
+        """
+        main_text_lines = []
+        with fitz.open(pdf_path) as doc:
+            total_pages = doc.page_count
+            for page_num in self._page_numbers(total_pages, pdf_name):
+                page_text = self._pymupdf_page_text(doc[page_num - 1])
+                if not page_text.strip():
+                    print(f"[PDF] {pdf_name} - Page {page_num}/{total_pages}: EMPTY (skipped)")
+                else:
+                    main_text_lines.extend(self._filter_page_text(page_text, page_num))
+
+                # 每50页报告一次进度
+                if page_num % 50 == 0 or page_num == total_pages:
+                    print(f"[PDF] {pdf_name} - Processed {page_num}/{total_pages} pages, {len(main_text_lines)} lines extracted so far")
+
+        return main_text_lines, total_pages
+
+    def _pymupdf_page_text(self, page) -> str:
+        """
+        用PyMuPDF提取单页文本，按配置的页眉/页脚高度裁掉上下边距（同 _body_area）
+
+        Args:
+            page: PyMuPDF 的页面对象
+
+        Returns:
+            str: 页面文本，空页为空字符串
+        """
+        header = self.config.header_margin_pts
+        footer = self.config.footer_margin_pts
+        rect = page.rect
+        if (not self.config.include_headers_footers and (header > 0 or footer > 0)
+                and rect.y0 + header < rect.y1 - footer):
+            clip = fitz.Rect(rect.x0, rect.y0 + header, rect.x1, rect.y1 - footer)
+            return page.get_text("text", clip=clip)
+        return page.get_text("text")
+
+    def _body_area(self, page):
+        """
+        按配置的页眉/页脚高度裁掉页面上下边距区域
+
+        落在边距内的字符在提取文本前就被排除，不再参与行的拼接，
+        也不依赖提取后按行号、关键词判断页眉页脚。
+
+        Args:
+            page: pdfplumber 的页面对象
+
+        Returns:
+            裁剪后的页面；包含页眉页脚或边距都为0时返回原页面
+        """
+        header = self.config.header_margin_pts
+        footer = self.config.footer_margin_pts
+        if self.config.include_headers_footers or (header <= 0 and footer <= 0):
+            return page
+        x0, top, x1, bottom = page.bbox
+        if top + header >= bottom - footer:
+            return page
+        return page.within_bbox((x0, top + header, x1, bottom - footer))
+
+    def _extract_page_lines(self, page, page_num: int, total_pages: int, pdf_name: str) -> List[Tuple[str, int, int]]:
+        """
+        提取单页的正文行
+
+        Args:
+            page: pdfplumber 的页面对象
+            page_num: 页码
+            total_pages: 总页数（用于日志输出）
+            pdf_name: PDF文件名（用于日志输出）
+
+        Returns:
+            List[Tuple[str, int, int]]: 该页的 (文本, 页码, 行号) 列表，空页返回空列表
+        """
+        try:
+            # 提取当前页的文本
+            page_text = self._body_area(page).extract_text()
+            if not page_text:
+                print(f"[PDF] {pdf_name} - Page {page_num}/{total_pages}: EMPTY (skipped)")
+                return []
+
+            return self._filter_page_text(page_text, page_num)
 
         except Exception as e:
-            self.logger.error(f"提取PDF文本时出错: {e}")
+            print(f"[PDF] {pdf_name} - ERROR on page {page_num}/{total_pages}: {e}")
             return []
 
+        finally:
+            # 释放该页解析出的字符、线条等对象；pdfplumber 默认一直缓存到PDF关闭，
+            # 逐页释放后峰值内存不再随页数增长
+            page.close()
+
+    def _filter_page_text(self, page_text: str, page_num: int) -> List[Tuple[str, int, int]]:
+        """
+        按行过滤一页文本中的非正文内容并标准化
+
+        Args:
+            page_text: 页面文本
+            page_num: 页码
+
+        Returns:
+            List[Tuple[str, int, int]]: 该页的 (文本, 页码, 行号) 列表
+        """
+        page_lines = []
+
+        # 按行分割
+        lines = page_text.split('\n')
+
+        for line_num, line in enumerate(lines, 1):
+            line_stripped = line.strip()
+
+            # 跳过空行
+            if not line_stripped:
+                continue
+
+            # 应用各种过滤规则
+            if self.should_skip_line(line_stripped, page_num, line_num):
+                continue
+
+            # 标准化文本
+            normalized_line = self.normalize_text(line_stripped)
+
+            if normalized_line:
+                page_lines.append((normalized_line, page_num, line_num))
+
+        return page_lines
+
     def should_skip_line(self, text: str, page_num: int, line_num: int) -> bool:
         """
         判断是否应该跳过该行
@@ -233,8 +513,35 @@ class EnhancedPDFTextExtractor:
         Returns:
             bool: 是否跳过
         """
-        # 检查各种过滤条件
-        if self.is_short_or_empty(text):
+        # 只去除一次首尾空白，各项判断共用（提取时传入的行已去除过，此时 strip 直接返回原字符串）
+        text = text.strip()
+
+        # 与位置无关的过滤条件（结果按文本缓存）
+        if self._skip_by_text(text):
+            return True
+
+        # 检查是否在页面顶部或底部（可能是页眉页脚）
+        if not self.config.include_headers_footers:
+            if line_num <= 3 or line_num >= 45:  # 假设每页最多50行
+                if self.is_likely_header_footer(text):
+                    return True
+
+        return False
+
+    def _skip_by_text_uncached(self, text: str) -> bool:
+        """
+        只根据文本内容判断是否跳过（不含页眉页脚的位置判断）
+
+        __init__ 中包装为带LRU缓存的 self._skip_by_text 使用。
+
+        Args:
+            text: 已去除首尾空白的文本
+
+        Returns:
+            bool: 是否跳过
+        """
+        # 检查各种过滤条件：先做不需要正则的短行/空行判断
+        if len(text) < self.config.min_line_length or not text:
             return True
 
         if not self.config.include_references and self.is_reference_line(text):
@@ -250,59 +557,66 @@ class EnhancedPDFTextExtractor:
         if not self.config.include_page_numbers and self.is_page_header_footer(text):
             return True
 
-        # 检查是否在页面顶部或底部（可能是页眉页脚）
-        if not self.config.include_headers_footers:
-            if line_num <= 3 or line_num >= 45:  # 假设每页最多50行
-                if self.is_likely_header_footer(text):
-                    return True
-
         return False
 
     def is_likely_header_footer(self, text: str) -> bool:
         """判断是否可能是页眉页脚"""
-        text_stripped = text.strip()
-
         # Must be very short to be header/footer
-        if len(text_stripped) > 15:  # Increased from 20 to allow more content
+        if len(text) > 15:  # Increased from 20 to allow more content
             return False
 
         # Single number or very short line is likely header/footer
-        if len(text_stripped) <= 5:
-            return True
-
-        # 包含页码模式
-        if re.search(r'页\s*\d+|page\s*\d+|\d+\s*/\s*\d+', text, re.IGNORECASE):
+        if len(text) <= 5:
             return True
 
-        # 包含会议信息、期刊名称等
-        header_footer_keywords = [
-            'conference', 'proceedings', 'journal', 'volume', 'issue',
-            'doi:', 'isbn:', 'issn:', 'copyright', '©'
-        ]
-
-        text_lower = text.lower()
-        for keyword in header_footer_keywords:
-            if keyword in text_lower:
-                return True
-
-        return False
+        # 包含页码模式，或会议信息、期刊名称等
+        return _HEADER_FOOTER_RE.search(text.lower()) is not None
 
     def remove_duplicate_lines(self, lines: List[Tuple[str, int, int]]) -> List[Tuple[str, int, int]]:
-        """去除重复行"""
-        seen_texts = set()
-        unique_lines = []
+        """去除重复行（相同文本只保留第一次出现的行）"""
+        strategy = self.config.dedup_strategy
+        if strategy not in ("exact", "bloom"):
+            raise ValueError(f"不支持的去重方式: {strategy}")
+
+        if strategy == "bloom" and Bloom is None:
+            self.logger.warning("未安装rbloom，改用精确去重")
+            strategy = "exact"
+
+        if strategy == "bloom":
+            # 布隆过滤器每行约占20位，与文本长度无关；误判率1e-4，
+            # 即约万分之一未出现过的行会被当作重复行删去
+            seen_texts = Bloom(max(len(lines), 100_000), 1e-4)
+        else:
+            # 集合只引用行中已有的文本字符串（哈希值也缓存在字符串对象上），不另存副本
+            seen_texts = set()
+
+        # 保留下来的行直接复用原来的元组。seen_add 返回None，未见过的文本在判断时顺带加入
+        seen_add = seen_texts.add
+        return [line for line in lines
+                if not (line[0] in seen_texts or seen_add(line[0]))]
+
+    def _share_repeated_texts(self, lines: List[Tuple[str, int, int]]) -> None:
+        """
+        让文本相同的行共用同一个字符串对象（原地修改）
 
-        for text, page_num, line_num in lines:
-            if text not in seen_texts:
-                seen_texts.add(text)
-                unique_lines.append((text, page_num, line_num))
+        不去除重复行时，页眉、章节标题、转载段落等重复出现的行各自保存一份相同的字符串；
+        共用第一次出现的那份后，其余副本即被释放。只有重复的行需要重建元组。
 
-        return unique_lines
+        Args:
+            lines: (文本, 页码, 行号) 的列表
+        """
+        canonical_texts = {}
+        setdefault = canonical_texts.setdefault
+        for i, (text, page_num, line_num) in enumerate(lines):
+            shared_text = setdefault(text, text)
+            if shared_text is not text:
+                lines[i] = (shared_text, page_num, line_num)
 
     def extract_raw_text(self, pdf_path: str) -> str:
         """提取原始文本（兼容性方法）"""
-        lines = self.extract_main_text_lines(pdf_path)
-        return "\n".join([line[0] for line in lines])
+        # 提取结果不绑定变量：取出文本列表后行元组即被释放，拼接时内存中只有文本本身
+        texts = [text for text, _, _ in self.extract_main_text_lines(pdf_path)]
+        return "\n".join(texts)
 
     def extract_text_with_positions(self) -> List[Tuple[str, int, int]]:
         """
@@ -328,32 +642,58 @@ class EnhancedPDFTextExtractor:
         Returns:
             str: 提取的文本内容
         """
-        lines = self.extract_main_text_lines(pdf_path)
-        return "\n".join([line[0] for line in lines])
+        return self.extract_raw_text(pdf_path)
+
+    def _iter_page_texts(self, pdf_path: str) -> Iterator[Tuple[int, str]]:
+        """
+        逐页提取PDF文本
+
+        Args:
+            pdf_path: PDF文件路径
+
+        Yields:
+            Tuple[int, str]: (页码, 页面文本)，空页的文本为空字符串
+        """
+        if self._resolve_pdf_backend() == "pymupdf":
+            with fitz.open(pdf_path) as doc:
+                for page_num, page in enumerate(doc, 1):
+                    yield page_num, self._pymupdf_page_text(page)
+            return
+
+        with _open_pdf(pdf_path) as pdf:
+            for page_num, page in enumerate(pdf.pages, 1):
+                page_text = self._body_area(page).extract_text() or ''
+                # 只需要文本，取出后即释放该页的解析结果
+                page.close()
+                yield page_num, page_text
 
     def get_extraction_stats(self, pdf_path: str) -> Dict:
         """获取提取统计信息"""
-        # 先尝试提取所有文本
-        all_lines = []
+        # 只打开、解析PDF一次：每页文本同时用于统计原始行数和过滤出正文行
+        total_lines = 0
+        main_lines = []
+        page_start, page_end = self.config.page_range or (1, None)
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text()
-                    if page_text:
-                        lines = page_text.split('\n')
-                        all_lines.extend(lines)
+            for page_num, page_text in self._iter_page_texts(pdf_path):
+                if not page_text:
+                    continue
+                total_lines += page_text.count('\n') + 1
+
+                # 正文只统计页码范围内的页面（同 extract_main_text_lines）
+                if page_num >= page_start and (page_end is None or page_num <= page_end):
+                    main_lines.extend(self._filter_page_text(page_text, page_num))
         except Exception as e:
             return {"error": str(e)}
 
-        # 提取正文
-        main_lines = self.extract_main_text_lines(pdf_path)
+        if self.config.remove_duplicate_lines:
+            main_lines = self.remove_duplicate_lines(main_lines)
 
         stats = {
             "total_pages": 0,
-            "total_lines": len(all_lines),
+            "total_lines": total_lines,
             "main_content_lines": len(main_lines),
-            "filtered_lines": len(all_lines) - len(main_lines),
-            "filtering_ratio": (len(all_lines) - len(main_lines)) / len(all_lines) if all_lines else 0,
+            "filtered_lines": total_lines - len(main_lines),
+            "filtering_ratio": (total_lines - len(main_lines)) / total_lines if total_lines else 0,
             "total_chars": sum(len(line[0]) for line in main_lines),
             "config": {
                 "include_references": self.config.include_references,
@@ -361,6 +701,9 @@ class EnhancedPDFTextExtractor:
                 "include_citations": self.config.include_citations,
                 "include_page_numbers": self.config.include_page_numbers,
                 "include_headers_footers": self.config.include_headers_footers,
+                "header_margin_pts": self.config.header_margin_pts,
+                "footer_margin_pts": self.config.footer_margin_pts,
+                "pdf_backend": self.config.pdf_backend,
                 "include_annotations": self.config.include_annotations,
                 "min_line_length": self.config.min_line_length,
             }
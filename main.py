@@ -8,6 +8,8 @@
 
 import sys
 import os
+import re
+import stat
 import time
 import argparse
 from pathlib import Path
@@ -33,35 +35,27 @@ def check_document_files(doc1_path: str, doc2_path: str) -> bool:
     # 支持的文件类型
     supported_extensions = ['.pdf', '.docx']
 
-    # 检查文件1
-    if not os.path.exists(doc1_path):
-        print(f"错误: 文件1不存在: {doc1_path}")
-        return False
-
-    if not os.path.isfile(doc1_path):
-        print(f"错误: 文件1不是有效的文件: {doc1_path}")
-        return False
-
-    ext1 = os.path.splitext(doc1_path)[1].lower()
-    if ext1 not in supported_extensions:
-        print(f"警告: 文件1类型可能不支持: {ext1}")
+    sizes = []
+    for label, doc_path in (("文件1", doc1_path), ("文件2", doc2_path)):
+        # 一次 os.stat 同时判断文件是否存在、是否为普通文件，并取得文件大小
+        try:
+            st = os.stat(doc_path)
+        except (OSError, ValueError):
+            print(f"错误: {label}不存在: {doc_path}")
+            return False
 
-    # 检查文件2
-    if not os.path.exists(doc2_path):
-        print(f"错误: 文件2不存在: {doc2_path}")
-        return False
+        if not stat.S_ISREG(st.st_mode):
+            print(f"错误: {label}不是有效的文件: {doc_path}")
+            return False
 
-    if not os.path.isfile(doc2_path):
-        print(f"错误: 文件2不是有效的文件: {doc2_path}")
-        return False
+        ext = os.path.splitext(doc_path)[1].lower()
+        if ext not in supported_extensions:
+            print(f"警告: {label}类型可能不支持: {ext}")
 
-    ext2 = os.path.splitext(doc2_path)[1].lower()
-    if ext2 not in supported_extensions:
-        print(f"警告: 文件2类型可能不支持: {ext2}")
+        sizes.append(st.st_size)
 
     # 检查文件大小
-    size1 = os.path.getsize(doc1_path)
-    size2 = os.path.getsize(doc2_path)
+    size1, size2 = sizes
 
     print(f"文件1: {doc1_path} ({size1 / 1024 / 1024:.1f} MB)")
     print(f"文件2: {doc2_path} ({size2 / 1024 / 1024:.1f} MB)")
@@ -73,6 +67,26 @@ def check_document_files(doc1_path: str, doc2_path: str) -> bool:
     return True
 
 
+# 页码范围格式 "起始页-结束页"，如 "1-146"，允许数字与连字符两侧有空白
+_PAGE_RANGE_RE = re.compile(r'^\s*(\d+)\s*-\s*(\d+)\s*$')
+
+
+def parse_page_range(range_str: str):
+    """
+    解析页码范围字符串，如 '1-146' -> (1, 146)
+
+    Args:
+        range_str: 页码范围字符串
+
+    Returns:
+        Optional[Tuple[int, int]]: (起始页, 结束页)；为空或格式不正确时返回None
+    """
+    match = _PAGE_RANGE_RE.match(range_str) if range_str else None
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
 def get_output_filename(pdf1_path: str, pdf2_path: str) -> str:
     """
     生成输出文件名
@@ -98,6 +112,24 @@ def get_output_filename(pdf1_path: str, pdf2_path: str) -> str:
     return output_filename
 
 
+def save_to_output_file(save_method, output_file: str):
+    """
+    包装检测器的保存方法，使结果保存到指定文件
+
+    检测流程调用保存方法时传入的其他关键字参数（如 summary、output_text）原样转发给原方法。
+
+    Args:
+        save_method: 检测器原来的保存方法
+        output_file: 输出文件路径
+
+    Returns:
+        替换检测器保存方法的函数
+    """
+    def save_with_custom_filename(similar_sequences, filename=output_file, **kwargs):
+        save_method(similar_sequences, filename, **kwargs)
+    return save_with_custom_filename
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(
@@ -157,6 +189,8 @@ def main():
                        help='最小行长度（默认10字符，过滤短行）')
     parser.add_argument('--sequence-length', type=int, default=8,
                        help='序列长度（默认8字符，可设为4-20）')
+    parser.add_argument('--extractor', choices=['pdfplumber', 'pymupdf'], default='pdfplumber',
+                       help='PDF解析库（默认pdfplumber；pymupdf需安装PyMuPDF，解析更快）')
 
     # 页码范围选项
     parser.add_argument('--page-range1', type=str, default=None,
@@ -194,18 +228,6 @@ def main():
         print(f"配置: 相似度≥{similarity_threshold}, 最大序列数={max_sequences}")
 
     # 解析页码范围
-    def parse_page_range(range_str: str):
-        """解析页码范围字符串，如 '1-146' -> (1, 146)"""
-        if not range_str:
-            return None
-        try:
-            parts = range_str.split('-')
-            if len(parts) == 2:
-                return (int(parts[0]), int(parts[1]))
-        except:
-            pass
-        return None
-
     page_range1 = parse_page_range(args.page_range1)
     page_range2 = parse_page_range(args.page_range2)
 
@@ -219,7 +241,9 @@ def main():
         include_annotations=False,
         min_line_length=args.min_line_length,
         remove_duplicate_lines=True,
-        page_range=page_range1
+        page_range=page_range1,
+        pdf_backend=args.extractor,
+        parallel=True  # 命令行单独运行，页数多时用多进程并行提取各页
     )
 
     content_config2 = TextExtractionConfig(
@@ -231,7 +255,9 @@ def main():
         include_annotations=False,
         min_line_length=args.min_line_length,
         remove_duplicate_lines=True,
-        page_range=page_range2
+        page_range=page_range2,
+        pdf_backend=args.extractor,
+        parallel=True  # 命令行单独运行，页数多时用多进程并行提取各页
     )
 
     # 使用一个通用的配置用于显示
@@ -272,6 +298,8 @@ def main():
         print("✅ 包含页眉页脚")
 
     print(f"📏 最小行长度: {args.min_line_length} 字符")
+    if args.extractor != 'pdfplumber':
+        print(f"📖 PDF解析库: {args.extractor}")
 
     if args.fast or args.ultra_fast:
         print(f"\n🚀 性能优化:")
@@ -328,10 +356,8 @@ def main():
                         output_file = get_output_filename(args.pdf1, args.pdf2).replace("duplicate_", "fast_")
 
                 # 修改检测器的保存方法
-                original_save_method = optimized_detector.save_results_optimized
-                def save_with_custom_filename(similar_sequences, filename=output_file):
-                    original_save_method(similar_sequences, filename)
-                optimized_detector.save_results_optimized = save_with_custom_filename
+                optimized_detector.save_results_optimized = save_to_output_file(
+                    optimized_detector.save_results_optimized, output_file)
 
             # 运行优化版检测
             similar_sequences = optimized_detector.run_detection_optimized(
@@ -359,10 +385,8 @@ def main():
                         output_file = get_output_filename(args.pdf1, args.pdf2).replace("duplicate_", f"similarity_{args.similarity:.2f}_")
 
                 # 修改检测器的保存方法
-                original_save_method = detector.similarity_detector.save_results
-                def save_with_custom_filename(similar_sequences, filename=output_file):
-                    original_save_method(similar_sequences, filename)
-                detector.similarity_detector.save_results = save_with_custom_filename
+                detector.similarity_detector.save_results = save_to_output_file(
+                    detector.similarity_detector.save_results, output_file)
 
             # 运行检测
             if args.exact:
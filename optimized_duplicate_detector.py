@@ -22,12 +22,16 @@
 """
 
 # ==================== 标准库导入 ====================
+import hashlib  # 哈希函数，用于计算文档内容摘要
+import os  # 用于获取CPU核心数
 import time  # 用于时间测量和性能监控
+from concurrent.futures import ProcessPoolExecutor  # 进程池，用于并行处理两个文档
 
 # ==================== 类型注解导入 ====================
-from typing import List, Dict, Tuple, Optional  # 类型提示，增强代码可读性和IDE支持
+from typing import List, Dict, Tuple, Optional, Iterator  # 类型提示，增强代码可读性和IDE支持
 
 # ==================== 自定义模块导入 ====================
+from result_cache import CACHE_VERSION, cache_file_path, load_cached, save_cached  # 磁盘缓存的格式版本、文件路径和读写函数，与标准版检测器共用
 from pdf_extractor import PDFTextExtractor  # PDF文本提取器，用于从PDF文件中提取文本内容和位置信息
 from text_processor import TextProcessor, CharInfo  # 文本处理器和字符信息类，用于文本预处理和字符管理
 from optimized_sequence_generator import (  # 优化版序列生成器，提供高效的序列生成和相似度计算
@@ -38,6 +42,57 @@ from optimized_sequence_generator import (  # 优化版序列生成器，提供
 )
 
 
+def _extraction_cache_path(extractor, file_path: str) -> str:
+    """
+    计算文档提取结果的缓存文件路径
+
+    键由文档内容的SHA-256、提取器类型和提取配置组成：文档被复制、改名后仍能命中，
+    内容或过滤配置（页码范围、最小行长度、各 include_* 选项等）变化时自动失效。
+    提取结果与相似度阈值、序列长度无关，这些参数不参与计算键。
+
+    Args:
+        extractor: 文档提取器实例
+        file_path (str): 文档路径
+
+    Returns:
+        str: 缓存文件路径
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    config = getattr(extractor, 'config', None)
+    key_source = f"{CACHE_VERSION}|{type(extractor).__name__}|{config!r}|{digest.hexdigest()}"
+    return cache_file_path(key_source, prefix='extract-')
+
+
+def _process_pdf_with_limit_worker(extractor, pdf_path: str, pdf_name: str, min_similarity: float,
+                                   max_sequences: int, sequence_length: int,
+                                   use_cache: bool = True) -> Tuple[List[CharInfo], List[SequenceInfo]]:
+    """
+    在子进程中处理单个文档
+
+    放在模块顶层以便被进程池pickle。提取器随任务传入（调用方可能已替换为增强版或Word提取器），
+    处理器和生成器在子进程内重新创建，返回值与 process_pdf_with_limit 相同。
+
+    Args:
+        extractor: 文档提取器实例
+        pdf_path (str): 文档路径
+        pdf_name (str): 文档名称（"文件1" 或 "文件2"）
+        min_similarity (float): 相似度阈值
+        max_sequences (int): 序列数量限制
+        sequence_length (int): 序列长度
+        use_cache (bool): 是否使用提取结果的磁盘缓存
+
+    Returns:
+        Tuple[List[CharInfo], List[SequenceInfo]]: (字符列表, 序列列表)
+    """
+    detector = OptimizedSimilarSequenceDetector(pdf_path, pdf_path, min_similarity, 1,
+                                                max_sequences, sequence_length, parallel=False,
+                                                use_cache=use_cache)
+    return detector.process_pdf_with_limit(extractor, pdf_name)
+
+
 class OptimizedSimilarSequenceDetector:
     """
     优化版相似序列检测器主类
@@ -70,7 +125,8 @@ class OptimizedSimilarSequenceDetector:
     """
 
     def __init__(self, pdf1_path: str, pdf2_path: str, min_similarity: float = 0.75,
-                 num_processes: int = None, max_sequences: int = 10000, sequence_length: int = 8):
+                 num_processes: int = None, max_sequences: int = 10000, sequence_length: int = 8,
+                 parallel: bool = True, use_cache: bool = True):
         """
         初始化优化版相似序列检测器
 
@@ -95,6 +151,10 @@ class OptimizedSimilarSequenceDetector:
             sequence_length (int): 序列长度（字数），默认8
                 - 较短（6-8）: 检测更灵活，但可能产生更多误匹配
                 - 较长（10-15）: 检测更精确，但可能遗漏部分相似片段
+            parallel (bool): 是否用两个子进程同时处理两个文档，默认True
+                - 只有一个CPU核心时自动改为依次处理
+            use_cache (bool): 是否把文档提取结果缓存到磁盘（result_cache.CACHE_DIR），默认True
+                - 同一文档（按内容判断）以相同配置再次检测时跳过文本提取
 
         Raises:
             FileNotFoundError: 当指定的文件不存在时
@@ -118,6 +178,8 @@ class OptimizedSimilarSequenceDetector:
         self.min_similarity = min_similarity  # 相似度阈值
         self.max_sequences = max_sequences  # 序列数量限制
         self.sequence_length = sequence_length  # 序列长度
+        self.parallel = parallel  # 是否并行处理两个文档
+        self.use_cache = use_cache  # 是否使用提取结果的磁盘缓存
 
         # 初始化文档提取器（支持PDF和Word文档）
         # 注意：这里创建标准提取器实例，后续可根据需要替换为增强版
@@ -185,38 +247,28 @@ class OptimizedSimilarSequenceDetector:
         print("1. 提取文档文本...")
         start_time = time.time()
 
-        # 根据提取器类型调用不同的提取方法
-        # 这种设计模式称为"鸭子类型"（Duck Typing）- 根据对象的行为而非类型来判断
-
-        if hasattr(extractor, 'extract_main_text_lines'):
-            # 检查是否有 extract_main_text_lines 方法
-            # 这表明是 EnhancedPDFTextExtractor（增强版PDF提取器）
-            if pdf_name == "文件1":
-                # 提取文件1的主体文本
-                extracted_text = extractor.extract_main_text_lines(self.pdf1_path)
-            elif pdf_name == "文件2":
-                # 提取文件2的主体文本
-                extracted_text = extractor.extract_main_text_lines(self.pdf2_path)
-            else:
-                # 未知的文件名，返回错误
-                print(f"   错误: 未知的文件名 {pdf_name}")
-                return [], []
+        # 文件1、文件2各自对应的文档路径（PDFTextExtractor 提取的是自身绑定的路径，与之相同）
+        file_path = {"文件1": self.pdf1_path, "文件2": self.pdf2_path}.get(pdf_name)
+        if file_path is None and hasattr(extractor, 'pdf_path'):
+            file_path = extractor.pdf_path
 
-        elif hasattr(extractor, '__class__') and extractor.__class__.__name__ == 'WordExtractor':
-            # 检查是否是 WordExtractor（Word文档提取器）
-            # Word文档需要传入文件路径参数
-            if pdf_name == "文件1":
-                extracted_text = extractor.extract_text_with_positions(self.pdf1_path)
-            elif pdf_name == "文件2":
-                extracted_text = extractor.extract_text_with_positions(self.pdf2_path)
-            else:
-                print(f"   错误: 未知的文件名 {pdf_name}")
-                return [], []
+        # 先查磁盘缓存：同一文档内容、同一提取配置的提取结果直接读取
+        cache_file = None
+        extracted_text = None
+        if self.use_cache and file_path:
+            cache_file = _extraction_cache_path(extractor, file_path)
+            extracted_text = load_cached(cache_file)
 
+        if extracted_text is not None:
+            print(f"   使用缓存的提取结果: {cache_file}")
         else:
-            # 默认情况：PDFTextExtractor（标准PDF提取器）
-            # 该提取器在初始化时已经绑定了文件路径，调用时不需要参数
-            extracted_text = extractor.extract_text_with_positions()
+            extracted_text = self._extract_text(extractor, pdf_name)
+            if extracted_text is None:
+                return [], []
+            # 提取器出错时通常返回空列表（增强版提取器捕获所有异常），空结果不写入缓存，
+            # 以免一次失败的提取在文档修复前一直被当作有效结果读取
+            if cache_file is not None and extracted_text:
+                save_cached(cache_file, extracted_text)
 
         # 显示提取结果统计
         print(f"   提取了 {len(extracted_text):,} 行文本，耗时 {time.time() - start_time:.2f} 秒")
@@ -263,6 +315,50 @@ class OptimizedSimilarSequenceDetector:
         # 返回字符列表和序列列表
         return chars, sequences
 
+    def _extract_text(self, extractor, pdf_name: str) -> Optional[List[Tuple[str, int, int]]]:
+        """
+        按提取器类型调用对应的提取方法
+
+        Args:
+            extractor: 文档提取器实例（同 process_pdf_with_limit）
+            pdf_name (str): "文件1" 或 "文件2"
+
+        Returns:
+            Optional[List[Tuple[str, int, int]]]: (文本, 页码, 行号) 列表；文件名未知时返回None
+        """
+        # 根据提取器类型调用不同的提取方法
+        # 这种设计模式称为"鸭子类型"（Duck Typing）- 根据对象的行为而非类型来判断
+
+        if hasattr(extractor, 'extract_main_text_lines'):
+            # 检查是否有 extract_main_text_lines 方法
+            # 这表明是 EnhancedPDFTextExtractor（增强版PDF提取器）
+            if pdf_name == "文件1":
+                # 提取文件1的主体文本
+                return extractor.extract_main_text_lines(self.pdf1_path)
+            elif pdf_name == "文件2":
+                # 提取文件2的主体文本
+                return extractor.extract_main_text_lines(self.pdf2_path)
+            else:
+                # 未知的文件名，返回错误
+                print(f"   错误: 未知的文件名 {pdf_name}")
+                return None
+
+        elif hasattr(extractor, '__class__') and extractor.__class__.__name__ == 'WordExtractor':
+            # 检查是否是 WordExtractor（Word文档提取器）
+            # Word文档需要传入文件路径参数
+            if pdf_name == "文件1":
+                return extractor.extract_text_with_positions(self.pdf1_path)
+            elif pdf_name == "文件2":
+                return extractor.extract_text_with_positions(self.pdf2_path)
+            else:
+                print(f"   错误: 未知的文件名 {pdf_name}")
+                return None
+
+        else:
+            # 默认情况：PDFTextExtractor（标准PDF提取器）
+            # 该提取器在初始化时已经绑定了文件路径，调用时不需要参数
+            return extractor.extract_text_with_positions()
+
     def detect_similar_sequences_optimized(self, show_progress: bool = True) -> List[SimilarSequenceInfo]:
         """
         检测相似序列（优化版）
@@ -305,8 +401,18 @@ class OptimizedSimilarSequenceDetector:
 
         # ==================== 阶段1: 处理两个文档 ====================
         # 分别处理两个文档，提取字符和生成序列
-        chars1, sequences1 = self.process_pdf_with_limit(self.extractor1, "文件1")
-        chars2, sequences2 = self.process_pdf_with_limit(self.extractor2, "文件2")
+        # 两个文档的处理互不相关且都是CPU密集的纯Python代码，多核时各交给一个子进程同时处理，
+        # 耗时约为两者中较慢的一个
+        if self.parallel and (os.cpu_count() or 1) >= 2:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                future1 = executor.submit(_process_pdf_with_limit_worker, self.extractor1, self.pdf1_path, "文件1",
+                                          self.min_similarity, self.max_sequences, self.sequence_length, self.use_cache)
+                future2 = executor.submit(_process_pdf_with_limit_worker, self.extractor2, self.pdf2_path, "文件2",
+                                          self.min_similarity, self.max_sequences, self.sequence_length, self.use_cache)
+                (chars1, sequences1), (chars2, sequences2) = future1.result(), future2.result()
+        else:
+            chars1, sequences1 = self.process_pdf_with_limit(self.extractor1, "文件1")
+            chars2, sequences2 = self.process_pdf_with_limit(self.extractor2, "文件2")
 
         # 保存字符列表到实例变量
         # 这些数据将用于后续显示匹配序列的上下文信息
@@ -504,29 +610,41 @@ class OptimizedSimilarSequenceDetector:
             >>> with open("report.txt", "w", encoding="utf-8") as f:
             ...     f.write(report)
         """
-        # ==================== 初始化输出列表 ====================
-        output = []
+        # 逐行生成报告内容，用换行符连接成完整报告
+        return "\n".join(self._iter_output_lines(similar_sequences, show_all_positions, max_results))
 
+    def _iter_output_lines(self, similar_sequences: List[SimilarSequenceInfo],
+                           show_all_positions: bool = True,
+                           max_results: Optional[int] = None) -> Iterator[str]:
+        """
+        逐行生成格式化报告（参数同 format_output_optimized）
+
+        format_output_optimized 把各行连接成字符串返回；save_results_optimized
+        直接把各行写入文件，不在内存中保留整份报告。
+
+        Yields:
+            str: 报告中的一行（不含换行符）
+        """
         # ==================== 报告头部 ====================
         # 使用等宽分隔线创建清晰的视觉分隔
-        output.append("=" * 80)
-        output.append("PDF文件相似序列检测报告（优化版）")
-        output.append("=" * 80)
+        yield "=" * 80
+        yield "PDF文件相似序列检测报告（优化版）"
+        yield "=" * 80
 
         # 添加报告元数据
-        output.append(f"检测完成时间: {time.strftime('%Y-%m-%d %H:%M:%S')}")  # 当前时间
-        output.append(f"文件1: {self.pdf1_path}")  # 第一个文件路径
-        output.append(f"文件2: {self.pdf2_path}")  # 第二个文件路径
-        output.append(f"相似度阈值: {self.min_similarity:.2f}")  # 相似度配置
-        output.append(f"序列数量限制: {self.max_sequences:,}")  # 序列数量限制
-        output.append(f"相似序列总数: {len(similar_sequences):,}")  # 检测到的相似序列数
-        output.append("")  # 空行分隔
+        yield f"检测完成时间: {time.strftime('%Y-%m-%d %H:%M:%S')}"  # 当前时间
+        yield f"文件1: {self.pdf1_path}"  # 第一个文件路径
+        yield f"文件2: {self.pdf2_path}"  # 第二个文件路径
+        yield f"相似度阈值: {self.min_similarity:.2f}"  # 相似度配置
+        yield f"序列数量限制: {self.max_sequences:,}"  # 序列数量限制
+        yield f"相似序列总数: {len(similar_sequences):,}"  # 检测到的相似序列数
+        yield ""  # 空行分隔
 
         # ==================== 处理空结果情况 ====================
         if not similar_sequences:
             # 如果没有找到相似序列，显示提示信息
-            output.append(f"未发现相似度≥{self.min_similarity:.2f}的{self.sequence_length}字序列。")
-            return "\n".join(output)
+            yield f"未发现相似度≥{self.min_similarity:.2f}的{self.sequence_length}字序列。"
+            return
 
         # ==================== 限制显示数量 ====================
         # 如果指定了最大显示数量，只取前N个结果
@@ -536,68 +654,64 @@ class OptimizedSimilarSequenceDetector:
         # 生成统计摘要，提供整体概况
         summary = self.generator.get_sequence_summary(similar_sequences)
 
-        output.append("统计信息:")
-        output.append(f"- 相似序列总数: {summary['total_similar']:,}")  # 总数
-        output.append(f"- 高相似度(>0.9): {summary['high_similarity_count']:,} 个")  # 高相似度数量
-        output.append(f"- 中相似度(0.8-0.9): {summary['medium_similarity_count']:,} 个")  # 中相似度数量
-        output.append(f"- 低相似度(0.75-0.8): {summary['low_similarity_count']:,} 个")  # 低相似度数量
-        output.append(f"- 平均相似度: {summary['average_similarity']:.3f}")  # 平均相似度
-        output.append(f"- 最高相似度: {summary['max_similarity']:.3f}")  # 最高相似度
-        output.append(f"- 最低相似度: {summary['min_similarity']:.3f}")  # 最低相似度
-        output.append("")  # 空行分隔
+        yield "统计信息:"
+        yield f"- 相似序列总数: {summary['total_similar']:,}"  # 总数
+        yield f"- 高相似度(>0.9): {summary['high_similarity_count']:,} 个"  # 高相似度数量
+        yield f"- 中相似度(0.8-0.9): {summary['medium_similarity_count']:,} 个"  # 中相似度数量
+        yield f"- 低相似度(0.75-0.8): {summary['low_similarity_count']:,} 个"  # 低相似度数量
+        yield f"- 平均相似度: {summary['average_similarity']:.3f}"  # 平均相似度
+        yield f"- 最高相似度: {summary['max_similarity']:.3f}"  # 最高相似度
+        yield f"- 最低相似度: {summary['min_similarity']:.3f}"  # 最低相似度
+        yield ""  # 空行分隔
 
         # ==================== 详细结果部分 ====================
-        output.append("相似序列详情 (按相似度排序):")
-        output.append("-" * 80)
+        yield "相似序列详情 (按相似度排序):"
+        yield "-" * 80
 
         # 遍历每个相似序列，生成详细信息
         for i, sim_seq in enumerate(display_sequences, 1):  # 从1开始编号
             # 显示序号和相似度
-            output.append(f"{i}. 相似度: {sim_seq.similarity:.3f}")
+            yield f"{i}. 相似度: {sim_seq.similarity:.3f}"
 
             # ==================== 文件1的信息 ====================
             if self.chars1:
                 # 如果有完整字符列表，显示带上下文的信息
                 context1 = self.get_context(sim_seq.sequence1, self.chars1, 50)  # 获取上下文
-                output.append(f"   文件1 (页{sim_seq.sequence1.start_char.page}行{sim_seq.sequence1.start_char.line}):")
-                output.append(f"      {context1}")  # 显示上下文
+                yield f"   文件1 (页{sim_seq.sequence1.start_char.page}行{sim_seq.sequence1.start_char.line}):"
+                yield f"      {context1}"  # 显示上下文
             else:
                 # 如果没有完整字符列表，仅显示基本信息
-                output.append(f"   文件1: '{sim_seq.sequence1.sequence}'")
-                output.append(f"          位置: 页{sim_seq.sequence1.start_char.page}行{sim_seq.sequence1.start_char.line}")
+                yield f"   文件1: '{sim_seq.sequence1.sequence}'"
+                yield f"          位置: 页{sim_seq.sequence1.start_char.page}行{sim_seq.sequence1.start_char.line}"
 
             # ==================== 文件2的信息 ====================
             if self.chars2:
                 # 如果有完整字符列表，显示带上下文的信息
                 context2 = self.get_context(sim_seq.sequence2, self.chars2, 50)  # 获取上下文
-                output.append(f"   文件2 (页{sim_seq.sequence2.start_char.page}行{sim_seq.sequence2.start_char.line}):")
-                output.append(f"      {context2}")  # 显示上下文
+                yield f"   文件2 (页{sim_seq.sequence2.start_char.page}行{sim_seq.sequence2.start_char.line}):"
+                yield f"      {context2}"  # 显示上下文
             else:
                 # 如果没有完整字符列表，仅显示基本信息
-                output.append(f"   文件2: '{sim_seq.sequence2.sequence}'")
-                output.append(f"          位置: 页{sim_seq.sequence2.start_char.page}行{sim_seq.sequence2.start_char.line}")
+                yield f"   文件2: '{sim_seq.sequence2.sequence}'"
+                yield f"          位置: 页{sim_seq.sequence2.start_char.page}行{sim_seq.sequence2.start_char.line}"
 
             # ==================== 差异信息 ====================
             # 显示两个序列之间的差异
             if sim_seq.differences and sim_seq.differences != ["完全相同"]:
                 # 如果有差异，显示差异列表
-                output.append(f"   差异: {', '.join(sim_seq.differences)}")
+                yield f"   差异: {', '.join(sim_seq.differences)}"
             else:
                 # 如果完全相同，显示"无"
-                output.append(f"   差异: 无")
+                yield f"   差异: 无"
 
-            output.append("")  # 空行分隔每个结果
+            yield ""  # 空行分隔每个结果
 
         # ==================== 分页提示 ====================
         # 如果限制了显示数量且还有更多结果，显示提示信息
         if max_results and len(similar_sequences) > max_results:
             remaining = len(similar_sequences) - max_results
-            output.append(f"... 还有 {remaining:,} 个相似序列未显示")
-            output.append("完整结果请查看保存的文件。")
-
-        # ==================== 返回完整报告 ====================
-        # 将列表拼接成字符串，使用换行符连接
-        return "\n".join(output)
+            yield f"... 还有 {remaining:,} 个相似序列未显示"
+            yield "完整结果请查看保存的文件。"
 
     def save_results_optimized(self, similar_sequences: List[SimilarSequenceInfo],
                                output_file: str = "optimized_similar_sequences_results.txt"):
@@ -640,16 +754,19 @@ class OptimizedSimilarSequenceDetector:
             - 建议使用有意义的文件名，如包含日期或文档名称
         """
         # ==================== 生成格式化输出 ====================
-        # 使用 format_output_optimized 方法生成完整的报告文本
+        # 逐行生成报告（内容与 format_output_optimized 相同），边生成边写入，
+        # 不先拼接出整份报告字符串
         # show_all_positions=True 表示包含所有位置信息和上下文
-        output = self.format_output_optimized(similar_sequences, show_all_positions=True)
+        lines = self._iter_output_lines(similar_sequences, show_all_positions=True)
 
         # ==================== 写入文件 ====================
         try:
             # 使用 with 语句自动管理文件资源
-            # encoding='utf-8' 确保中文字符正确保存
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(output)  # 写入完整的报告内容
+            # encoding='utf-8' 确保中文字符正确保存，1MB缓冲区减少逐行写入的系统调用
+            with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                # 报告至少有标题行；之后每行前加换行符，与 format_output_optimized 的结果逐字节相同
+                f.write(next(lines))
+                f.writelines("\n" + line for line in lines)
 
             # 显示成功消息
             print(f"\n结果已保存到: {output_file}")
@@ -18,7 +18,7 @@
 """
 
 # 类型注解支持，提供静态类型检查
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Tuple, Set, Optional
 
 # defaultdict: 带默认值的字典，用于构建哈希查找表
 from collections import defaultdict
@@ -163,6 +163,7 @@ class FastSimilarityCalculator:
     优化策略:
     - 长度快速检查：如果两个序列词数差异过大，直接返回0相似度
     - 使用difflib.SequenceMatcher的高效算法
+    - 批量比较时复用第二个序列的匹配器，并先用 real_quick_ratio/quick_ratio 上界排除不可能相似的序列对
     """
 
     def __init__(self, min_similarity: float = 0.75):
@@ -276,6 +277,43 @@ class FastSimilarityCalculator:
         # 如果没有差异，返回完全相同的标记
         return differences if differences else ["完全相同"]
 
+    def create_matcher(self, seq2: str) -> difflib.SequenceMatcher:
+        """
+        为第二个序列创建可复用的SequenceMatcher
+
+        SequenceMatcher 会为第二个序列建立字符索引（b2j）和字符计数，
+        同一个seq2与多个seq1比较时，只需通过 set_seq1 更换第一个序列，索引只建一次。
+
+        Args:
+            seq2: 第二个文本序列
+
+        Returns:
+            供 similarity_above_threshold 使用的匹配器
+        """
+        return difflib.SequenceMatcher(None, '', seq2)
+
+    def similarity_above_threshold(self, seq1: str, matcher: difflib.SequenceMatcher) -> Optional[float]:
+        """
+        计算seq1与匹配器中序列的相似度，未达到阈值时返回None
+
+        先用 real_quick_ratio()（只看长度）和 quick_ratio()（只看字符计数）两个上界排除
+        不可能达到阈值的序列对，只有通过上界检查的才调用完整的 ratio()。
+        两个上界都不小于 ratio()，结果与 calculate_similarity 一致；
+        词数快速检查由调用方按预先算好的词数完成。
+
+        Args:
+            seq1: 第一个文本序列
+            matcher: create_matcher() 为第二个序列创建的匹配器
+
+        Returns:
+            相似度分数（达到阈值时），否则为None
+        """
+        matcher.set_seq1(seq1)
+        if matcher.real_quick_ratio() < self.min_similarity or matcher.quick_ratio() < self.min_similarity:
+            return None
+        similarity = matcher.ratio()
+        return similarity if similarity >= self.min_similarity else None
+
     def is_similar(self, seq1: str, seq2: str) -> Tuple[bool, float, List[str]]:
         """
         判断两个序列是否相似
@@ -678,36 +716,33 @@ class OptimizedSequenceGenerator:
         # 避免多进程间的资源共享问题
         calculator = FastSimilarityCalculator(min_similarity)
 
+        # 文件2的每个序列只建一次匹配器（字符索引）并预先算好词数，块内所有seq1共用
+        file2_entries = [
+            (seq2, len(seq2.sequence.split()), calculator.create_matcher(seq2.sequence))
+            for seq2 in file2_sequences
+        ]
+
         # 双重循环：比较file1序列块中的每个序列与file2的所有序列
+        # 哈希签名不完全等价于相似度，签名不同的序列对仍可能相似，每一对都要计算相似度
         for seq1 in file1_seqs_chunk:
-            for seq2 in file2_sequences:
-                # 快速哈希预检查
-                if seq1.hash_signature == seq2.hash_signature:
-                    # 哈希签名相同：可能完全相同或高度相似
-                    # 进行详细检查确认
-                    is_similar, similarity, differences = calculator.is_similar(
-                        seq1.sequence, seq2.sequence
-                    )
-                    if is_similar:
-                        similar_sequences.append(SimilarSequenceInfo(
-                            sequence1=seq1,
-                            sequence2=seq2,
-                            similarity=similarity,
-                            differences=differences
-                        ))
+            words1 = len(seq1.sequence.split())
+            for seq2, words2, matcher in file2_entries:
+                if abs(words1 - words2) > 2:
+                    # 同 calculate_similarity 的词数快速检查：词数差异超过2时相似度为0
+                    similarity = 0.0
                 else:
-                    # 哈希签名不同：仍可能相似（只是概率较低）
-                    # 也需要进行详细检查，因为哈希签名不完全等价于相似度
-                    is_similar, similarity, differences = calculator.is_similar(
-                        seq1.sequence, seq2.sequence
-                    )
-                    if is_similar:
-                        similar_sequences.append(SimilarSequenceInfo(
-                            sequence1=seq1,
-                            sequence2=seq2,
-                            similarity=similarity,
-                            differences=differences
-                        ))
+                    similarity = calculator.similarity_above_threshold(seq1.sequence, matcher)
+                    if similarity is None:
+                        continue
+                if similarity >= min_similarity:
+                    # 差异描述只在输出结果时使用，只为达到阈值的序列对生成，
+                    # 不相似的序列对（绝大多数）省去一次按词的SequenceMatcher比对
+                    similar_sequences.append(SimilarSequenceInfo(
+                        sequence1=seq1,
+                        sequence2=seq2,
+                        similarity=similarity,
+                        differences=calculator.get_differences(seq1.sequence, seq2.sequence)
+                    ))
 
         return similar_sequences
 
@@ -827,7 +862,9 @@ class OptimizedSequenceGenerator:
         for i in range(0, len(candidate_pairs), chunk_size):
             chunk = candidate_pairs[i:i+chunk_size]
             # 转换为适合并行处理的格式
-            file1_chunk = [pair[0] for pair in chunk]
+            # 一个seq1有多个候选时在块内会重复出现，每次都与文件2的全部序列比较、结果相同，
+            # 只保留第一次出现（保持顺序），重复的结果本来也会被 _remove_duplicates 去掉
+            file1_chunk = list({id(pair[0]): pair[0] for pair in chunk}.values())
             chunks.append((file1_chunk, file2_sequences, self.min_similarity))
 
         # ========== 第四步：并行处理 ==========
@@ -11,7 +11,7 @@ PDF文本提取模块
 """
 
 import pdfplumber  # PDF处理库，用于从PDF中提取文本和位置信息
-from typing import List, Tuple  # 类型注解：List用于列表，Tuple用于元组
+from typing import List, Tuple, Iterator  # 类型注解：List用于列表，Tuple用于元组，Iterator用于逐行产出
 import re  # 正则表达式模块（预留，用于可能的文本处理）
 
 
@@ -54,39 +54,48 @@ class PDFTextExtractor:
             >>> for text, page, line in lines[:3]:
             ...     print(f"页{page}行{line}: {text}")
         """
-        extracted_text = []  # 初始化空列表，用于存储所有提取的文本行及其位置信息
-
         try:
-            # 使用pdfplumber打开PDF文件
-            with pdfplumber.open(self.pdf_path) as pdf:
-                # 遍历PDF的每一页，enumerate从1开始计数（页码从1开始更直观）
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # 提取当前页的文本内容
-                    # extract_text()方法返回页面中的所有文本，保留基本布局
-                    text = page.extract_text()
-
-                    # 如果该页包含文本内容
-                    if text:
-                        # 将文本按换行符分割成行
-                        lines = text.split('\n')
-
-                        # 遍历该页的每一行
-                        for line_num, line in enumerate(lines, 1):
-                            # 去除行首尾的空白字符
-                            line = line.strip()
-
-                            # 只保留非空行
-                            if line:
-                                # 将文本及其位置信息添加到结果列表
-                                extracted_text.append((line, page_num, line_num))
-
-            # 返回所有提取的文本行及其位置信息
-            return extracted_text
-
+            return list(self.iter_text_with_positions())
         except Exception as e:
-            # 捕获并处理PDF提取过程中的异常
+            # 捕获并处理PDF提取过程中的异常；中途出错时不返回不完整的结果
             print(f"提取PDF文本时出错: {e}")
-            return []  # 出错时返回空列表
+            return []
+
+    def iter_text_with_positions(self) -> Iterator[Tuple[str, int, int]]:
+        """
+        逐行产出PDF文本及其位置信息
+
+        与 extract_text_with_positions 相同，但按页解析、逐行产出，
+        不在内存中保存整份文档的文本行，供流水线式处理使用。
+
+        Yields:
+            Tuple[str, int, int]: (文本内容, 页码, 行号)
+
+        Raises:
+            Exception: PDF无法打开或解析出错时直接抛出，调用方据此区分不完整的结果
+        """
+        # 使用pdfplumber打开PDF文件
+        with pdfplumber.open(self.pdf_path) as pdf:
+            # 遍历PDF的每一页，enumerate从1开始计数（页码从1开始更直观）
+            for page_num, page in enumerate(pdf.pages, 1):
+                # 提取当前页的文本内容
+                # extract_text()方法返回页面中的所有文本，保留基本布局
+                text = page.extract_text()
+
+                # 如果该页包含文本内容
+                if text:
+                    # 将文本按换行符分割成行
+                    lines = text.split('\n')
+
+                    # 遍历该页的每一行
+                    for line_num, line in enumerate(lines, 1):
+                        # 去除行首尾的空白字符
+                        line = line.strip()
+
+                        # 只保留非空行
+                        if line:
+                            # 产出文本及其位置信息
+                            yield line, page_num, line_num
 
     def extract_raw_text(self) -> str:
         """
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+处理结果的磁盘缓存模块
+
+标准版检测器（duplicate_detector）缓存PDF的字符列表和序列查找表，
+优化版检测器（optimized_duplicate_detector）缓存文档提取出的文本行。
+两者共用缓存目录、缓存格式版本和读写函数，缓存键由各自按需要的内容计算。
+"""
+
+import hashlib  # 哈希函数，用于生成缓存文件名
+import os  # 操作系统接口，用于创建目录和替换文件
+import pickle  # 序列化缓存内容
+from contextlib import contextmanager  # 上下文管理器装饰器，用于原子写文件
+from typing import Any, Optional
+
+
+# 缓存目录：同一文档再次检测时直接读取上次的处理结果
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'pdf-detector')
+
+# 缓存格式版本：处理流程或数据结构变化时递增，使旧缓存自动失效
+CACHE_VERSION = 2
+
+
+def cache_file_path(key_source: str, prefix: str = '') -> str:
+    """
+    由缓存键的原始内容计算缓存文件路径
+
+    Args:
+        key_source (str): 组成缓存键的原始内容（调用方负责包含 CACHE_VERSION）
+        prefix (str): 文件名前缀，区分不同种类的缓存
+
+    Returns:
+        str: CACHE_DIR 下的缓存文件路径
+    """
+    key = hashlib.blake2b(key_source.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, f"{prefix}{key}.pkl")
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = 'w', **kwargs):
+    """
+    原子地写入文件
+
+    先写入同目录下的临时文件，全部写完后再用 os.replace 替换目标文件；
+    写入过程中出错或进程被中断时，目标文件保持原样，不会留下写了一半的文件。
+
+    Args:
+        path (str): 目标文件路径
+        mode (str): 打开模式（'w' 或 'wb'）
+        **kwargs: 传给 open 的其他参数（encoding、newline 等）
+    """
+    temp_file = f"{path}.{os.getpid()}.tmp"
+    try:
+        # 1 MiB 写缓冲，大报告逐行写入时减少系统调用次数
+        with open(temp_file, mode, buffering=1 << 20, **kwargs) as f:
+            yield f
+        os.replace(temp_file, path)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def load_cached(cache_file: str) -> Optional[Any]:
+    """读取缓存内容，缓存不存在或已损坏时返回None"""
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"   读取缓存失败，重新处理: {e}")
+        return None
+
+
+def save_cached(cache_file: str, value: Any) -> None:
+    """写入缓存（原子写入，避免并发或中断时留下不完整的缓存）"""
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with atomic_open(cache_file, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        # 缓存只是加速手段，写入失败不影响检测结果
+        print(f"   写入缓存失败: {e}")
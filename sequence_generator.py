@@ -11,10 +11,12 @@
 4. 提供详细的差异分析和统计信息
 """
 
+# sys: 用于判断Python版本
+import sys
 # typing: 类型注解模块，用于声明函数参数和返回值的类型
-from typing import List, Dict, Set, Tuple
-# collections.defaultdict: 带默认值的字典，当访问不存在的键时会自动创建默认值
-from collections import defaultdict
+from typing import List, Dict, Set, Tuple, Optional, Iterable, Iterator
+# collections.deque: 双端队列，用于保存滑动窗口中的最近8个字符
+from collections import deque
 # text_processor.CharInfo: 字符信息类，包含字符内容及其在文档中的位置信息
 from text_processor import CharInfo
 # dataclasses.dataclass: 数据类装饰器，用于自动生成初始化方法等常用方法
@@ -22,8 +24,11 @@ from dataclasses import dataclass
 # difflib: Python标准库，用于序列比较和相似度计算
 import difflib
 
+# Python 3.10+ 的 dataclass 支持 slots，序列和结果对象不再携带实例 __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class SequenceInfo:
     """
     8字序列信息类
@@ -70,7 +75,7 @@ class SequenceInfo:
         return f"'{self.sequence}' (页{self.start_char.page}行{self.start_char.line}-页{self.end_char.page}行{self.end_char.line})"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class SimilarSequenceInfo:
     """
     相似序列信息类
@@ -260,6 +265,42 @@ class SimilarityCalculator:
 
         return is_similar, similarity, differences
 
+    def create_matcher(self, seq2: str) -> difflib.SequenceMatcher:
+        """
+        为第二个序列创建可复用的SequenceMatcher
+
+        SequenceMatcher 会为第二个序列建立字符索引（b2j）和字符计数，
+        同一个seq2与多个seq1比较时，只需通过 set_seq1 更换第一个序列，索引只建一次。
+
+        Args:
+            seq2 (str): 第二个序列
+
+        Returns:
+            difflib.SequenceMatcher: 供 similarity_above_threshold 使用的匹配器
+        """
+        return difflib.SequenceMatcher(None, '', seq2)
+
+    def similarity_above_threshold(self, seq1: str, matcher: difflib.SequenceMatcher) -> Optional[float]:
+        """
+        计算seq1与匹配器中序列的相似度，未达到阈值时返回None
+
+        先用 real_quick_ratio()（只看长度）和 quick_ratio()（只看字符计数）两个上界排除
+        不可能达到阈值的序列对，只有通过上界检查的才调用完整的 ratio()。
+        两个上界都不小于 ratio()，因此筛选结果与直接调用 calculate_similarity 完全一致。
+
+        Args:
+            seq1 (str): 第一个序列
+            matcher (difflib.SequenceMatcher): create_matcher() 为第二个序列创建的匹配器
+
+        Returns:
+            Optional[float]: 相似度分数（达到阈值时），否则为None
+        """
+        matcher.set_seq1(seq1)
+        if matcher.real_quick_ratio() < self.min_similarity or matcher.quick_ratio() < self.min_similarity:
+            return None
+        similarity = matcher.ratio()
+        return similarity if similarity >= self.min_similarity else None
+
 
 class SequenceGenerator:
     """
@@ -347,7 +388,35 @@ class SequenceGenerator:
 
         return sequences  # 返回所有生成的8字序列
 
-    def create_sequence_lookup_table(self, sequences: List[SequenceInfo]) -> Dict[str, List[SequenceInfo]]:
+    def iter_sequences(self, chars: Iterable[CharInfo]) -> Iterator[SequenceInfo]:
+        """
+        从字符流中逐个产出连续的8字序列
+
+        与 generate_sequences 结果相同，但输入可以是逐个产出字符的迭代器，
+        只保留最近8个字符作为滑动窗口，不需要完整的字符列表。
+
+        Args:
+            chars (Iterable[CharInfo]): 按文档顺序排列的字符信息
+
+        Yields:
+            SequenceInfo: 8字序列信息
+        """
+        window = deque(maxlen=8)  # 滑动窗口，追加第9个字符时最早的字符自动移出
+        for index, char in enumerate(chars):
+            window.append(char)
+            if len(window) < 8:
+                continue
+
+            seq_chars = list(window)
+            yield SequenceInfo(
+                sequence=" ".join([char.char for char in seq_chars]),  # 序列内容
+                start_index=index - 7,        # 起始索引
+                start_char=seq_chars[0],      # 起始字符信息
+                end_char=seq_chars[7],        # 结束字符信息
+                chars=seq_chars               # 包含的8个字符的完整列表
+            )
+
+    def create_sequence_lookup_table(self, sequences: Iterable[SequenceInfo]) -> Dict[str, List[SequenceInfo]]:
         """
         创建序列查找表，用于快速查找重复序列
 
@@ -355,7 +424,7 @@ class SequenceGenerator:
         这个查找表可以快速判断某个序列是否存在，以及它的所有出现位置。
 
         Args:
-            sequences (List[SequenceInfo]): 8字序列列表，通常由generate_sequences()生成
+            sequences (Iterable[SequenceInfo]): 8字序列，通常由generate_sequences()或iter_sequences()生成
 
         Returns:
             Dict[str, List[SequenceInfo]]: 序列查找表，结构为：
@@ -373,16 +442,20 @@ class SequenceGenerator:
             >>> positions = lookup_table.get('人 工 智 能 技 术')
             >>> print(f"该序列出现了 {len(positions)} 次")
         """
-        # 使用defaultdict(list)创建字典，当访问不存在的键时自动创建空列表
-        lookup_table = defaultdict(list)
+        # 直接构建普通dict，不再先用defaultdict收集再整体复制一份，
+        # 省去对整个查找表的一次重新哈希，峰值内存也少一份哈希表
+        lookup_table = {}
 
         # 遍历所有序列，将相同内容的序列分组存储
         for seq_info in sequences:
-            # 将序列信息添加到对应序列内容的列表中
-            lookup_table[seq_info.sequence].append(seq_info)
+            # 将序列信息添加到对应序列内容的列表中（首次出现时创建列表）
+            seq_list = lookup_table.get(seq_info.sequence)
+            if seq_list is None:
+                lookup_table[seq_info.sequence] = [seq_info]
+            else:
+                seq_list.append(seq_info)
 
-        # 将defaultdict转换为普通dict后返回
-        return dict(lookup_table)
+        return lookup_table
 
     def find_similar_sequences(self,
                               file1_sequences: Dict[str, List[SequenceInfo]],
@@ -391,7 +464,7 @@ class SequenceGenerator:
         查找两个文件中相似的8字序列
 
         对两个文件的序列进行两两比较，找出所有相似度达到阈值的序列对。
-        使用嵌套循环进行比较，使用set避免重复比较。
+        按唯一序列内容比较，同一内容的多个出现位置只计算一次相似度。
 
         Args:
             file1_sequences (Dict[str, List[SequenceInfo]]): 文件1的序列查找表
@@ -414,44 +487,52 @@ class SequenceGenerator:
             ...     print(f"{sim_seq.similarity:.2%}: {sim_seq}")
         """
         similar_sequences = []  # 存储找到的所有相似序列对
-        processed_pairs = set()  # 使用集合记录已处理的序列对，避免重复比较
-
-        # 将文件1的所有序列展平成一个列表
-        # file1_sequences是字典{序列: [出现位置列表]}，需要取出所有序列对象
-        all_file1_seqs = []
-        for seq_list in file1_sequences.values():
-            all_file1_seqs.extend(seq_list)  # 将每个序列的所有出现位置添加到列表
-
-        # 将文件2的所有序列展平成一个列表
-        all_file2_seqs = []
-        for seq_list in file2_sequences.values():
-            all_file2_seqs.extend(seq_list)
-
-        # 双重循环：对文件1的每个序列，与文件2的所有序列进行比较
-        for seq1_info in all_file1_seqs:
-            for seq2_info in all_file2_seqs:
-                # 使用对象id创建唯一的配对标识符
-                # id()返回对象的内存地址，可以唯一标识一个对象
-                pair_id = (id(seq1_info), id(seq2_info))
-                if pair_id in processed_pairs:
-                    continue  # 如果这对序列已经比较过，跳过
-                processed_pairs.add(pair_id)  # 标记这对序列已处理
-
-                # 计算这对序列的相似度
-                is_similar, similarity, differences = self.similarity_calculator.is_similar(
-                    seq1_info.sequence,  # 文件1的序列内容
-                    seq2_info.sequence   # 文件2的序列内容
-                )
-
-                # 如果相似度达到阈值，保存结果
-                if is_similar:
-                    similar_seq_info = SimilarSequenceInfo(
-                        sequence1=seq1_info,      # 文件1的序列完整信息
-                        sequence2=seq2_info,      # 文件2的序列完整信息
-                        similarity=similarity,    # 相似度分数
-                        differences=differences   # 差异描述
-                    )
-                    similar_sequences.append(similar_seq_info)
+        calculator = self.similarity_calculator
+
+        # 文件2按唯一序列组织成行表：每行是 (序列内容, 可复用的匹配器, 该序列的所有出现位置)
+        # 相似度只取决于序列内容，每对唯一序列只计算一次，再展开到各自的所有出现位置
+        file2_matchers = {sequence: calculator.create_matcher(sequence) for sequence in file2_sequences}
+        file2_rows = [
+            (sequence, file2_matchers[sequence], seq_list)
+            for sequence, seq_list in file2_sequences.items()
+        ]
+
+        # 两个文件共有的序列（字典键视图求交集，在C层完成）
+        # 完全相同的序列对相似度必为1.0、差异为"完全相同"，无需调用相似度计算
+        exact_sequences = file1_sequences.keys() & file2_sequences.keys() if self.min_similarity <= 1.0 else set()
+
+        # 双重循环：文件1的每个唯一序列与文件2的每个唯一序列比较
+        for sequence1, seq1_list in file1_sequences.items():
+            # 收集与当前序列相似的文件2行：(出现位置列表, 相似度, 差异描述)
+            matched_rows = []
+            exact_matcher = file2_matchers[sequence1] if sequence1 in exact_sequences else None
+            for sequence2, matcher, seq2_list in file2_rows:
+                if matcher is exact_matcher:
+                    matched_rows.append((seq2_list, 1.0, ["完全相同"]))
+                    continue
+
+                # 计算这对序列的相似度（未达到阈值时为None）
+                similarity = calculator.similarity_above_threshold(sequence1, matcher)
+
+                # 如果相似度达到阈值，分析差异
+                if similarity is not None:
+                    differences = calculator.get_differences(sequence1, sequence2)
+                    matched_rows.append((seq2_list, similarity, differences))
+
+            if not matched_rows:
+                continue
+
+            # 展开到所有出现位置，顺序与逐个出现位置两两比较时相同
+            for seq1_info in seq1_list:
+                for seq2_list, similarity, differences in matched_rows:
+                    for seq2_info in seq2_list:
+                        similar_seq_info = SimilarSequenceInfo(
+                            sequence1=seq1_info,             # 文件1的序列完整信息
+                            sequence2=seq2_info,             # 文件2的序列完整信息
+                            similarity=similarity,           # 相似度分数
+                            differences=list(differences)    # 差异描述（每个结果各自一份）
+                        )
+                        similar_sequences.append(similar_seq_info)
 
         # 按相似度降序排序，最相似的序列对排在前面
         # key函数指定按similarity字段排序，reverse=True表示降序
@@ -486,20 +567,15 @@ class SequenceGenerator:
             >>> for seq, (pos1, pos2) in repeated.items():
             ...     print(f"序列 '{seq}' 在文件1出现{len(pos1)}次，文件2出现{len(pos2)}次")
         """
-        repeated_sequences = {}  # 存储完全重复的序列
-
-        # 使用集合的交集操作找出在两个文件中都出现的序列
-        # & 运算符返回两个集合的交集
-        common_sequences = set(file1_sequences.keys()) & set(file2_sequences.keys())
-
-        # 遍历所有共同的序列，记录它们在两个文件中的出现位置
-        for sequence in common_sequences:
-            repeated_sequences[sequence] = (
-                file1_sequences[sequence],  # 该序列在文件1中的所有出现位置
-                file2_sequences[sequence]   # 该序列在文件2中的所有出现位置
-            )
-
-        return repeated_sequences
+        # 找出在两个文件中都出现的序列
+        # 字典的keys视图直接支持 & 运算，交集在C层完成，不必先复制成两个集合
+        common_sequences = file1_sequences.keys() & file2_sequences.keys()
+
+        # 记录每个共同序列在两个文件中的所有出现位置：(文件1位置列表, 文件2位置列表)
+        return {
+            sequence: (file1_sequences[sequence], file2_sequences[sequence])
+            for sequence in common_sequences
+        }
 
     def get_sequence_summary(self, similar_sequences: List[SimilarSequenceInfo]) -> Dict:
         """
@@ -546,25 +622,36 @@ class SequenceGenerator:
         if not similar_sequences:
             return summary
 
-        # 提取所有相似度分数
-        similarities = [seq.similarity for seq in similar_sequences]
-
-        # 计算基本统计指标
-        summary['average_similarity'] = sum(similarities) / len(similarities)  # 平均值
-        summary['max_similarity'] = max(similarities)  # 最大值
-        summary['min_similarity'] = min(similarities)  # 最小值
-
-        # 按相似度区间分类统计
+        # 一次遍历同时累计总和、最值和各区间计数，不再对相似度列表多次扫描
+        total = 0.0
+        max_similarity = 0.0
+        min_similarity = 1.0
+        high_count = medium_count = low_count = 0
         for seq_info in similar_sequences:
-            if seq_info.similarity > 0.9:
+            similarity = seq_info.similarity
+            total += similarity
+            if similarity > max_similarity:
+                max_similarity = similarity
+            if similarity < min_similarity:
+                min_similarity = similarity
+
+            # 按相似度区间分类统计
+            if similarity > 0.9:
                 # 高相似度：> 90%
-                summary['high_similarity_count'] += 1
-            elif seq_info.similarity > 0.8:
+                high_count += 1
+            elif similarity > 0.8:
                 # 中等相似度：80% - 90%
-                summary['medium_similarity_count'] += 1
+                medium_count += 1
             else:
                 # 低相似度：75% - 80%
-                summary['low_similarity_count'] += 1
+                low_count += 1
+
+        summary['average_similarity'] = total / len(similar_sequences)  # 平均值
+        summary['max_similarity'] = max_similarity  # 最大值
+        summary['min_similarity'] = min_similarity  # 最小值
+        summary['high_similarity_count'] = high_count
+        summary['medium_similarity_count'] = medium_count
+        summary['low_similarity_count'] = low_count
 
         return summary
 
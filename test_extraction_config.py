@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试文本提取配置的取值检查
+
+验证：
+1. 支持的取值可以正常创建配置
+2. 不支持的取值在创建配置时抛出 ValueError（而不是在提取时被当作空结果）
+"""
+
+from enhanced_pdf_extractor import TextExtractionConfig
+
+
+def _assert_rejected(**kwargs):
+    """创建配置应抛出ValueError"""
+    try:
+        TextExtractionConfig(**kwargs)
+    except ValueError:
+        return
+    raise AssertionError(f"应拒绝的配置: {kwargs}")
+
+
+def test_dedup_strategy():
+    """测试去重方式的取值"""
+    for strategy in ["exact", "bloom"]:
+        assert TextExtractionConfig(dedup_strategy=strategy).dedup_strategy == strategy
+    _assert_rejected(dedup_strategy="blom")
+
+
+def test_pdf_backend():
+    """测试PDF解析库的取值"""
+    for backend in ["pdfplumber", "pymupdf"]:
+        assert TextExtractionConfig(pdf_backend=backend).pdf_backend == backend
+    _assert_rejected(pdf_backend="mupdf")
+
+
+if __name__ == "__main__":
+    test_dedup_strategy()
+    test_pdf_backend()
+    print("✓ 提取配置测试通过")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试命令行页码范围的解析
+
+验证：
+1. 'start-end' 格式解析为 (start, end)
+2. 数字和连字符两侧的空白被忽略
+3. 空值和格式不正确的字符串返回 None
+"""
+
+from main import parse_page_range
+
+
+def test_parse_valid_ranges():
+    """测试合法的页码范围"""
+    assert parse_page_range("1-146") == (1, 146)
+    assert parse_page_range("5-5") == (5, 5)
+    assert parse_page_range(" 3 - 7 ") == (3, 7)
+
+
+def test_parse_empty_ranges():
+    """测试未指定页码范围"""
+    assert parse_page_range("") is None
+    assert parse_page_range(None) is None
+
+
+def test_parse_invalid_ranges():
+    """测试格式不正确的页码范围"""
+    for range_str in ["a-b", "1-2-3", "12", "1-", "-5", "1~5"]:
+        assert parse_page_range(range_str) is None, range_str
+
+
+if __name__ == "__main__":
+    test_parse_valid_ranges()
+    test_parse_empty_ranges()
+    test_parse_invalid_ranges()
+    print("✓ 页码范围解析测试通过")
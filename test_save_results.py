@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试检测结果的保存
+
+验证：
+1. json / jsonl / pickle 格式保存后读回的内容与原结果一致
+2. 文本格式的报告包含每条结果的序列内容
+3. 写入中途出错时原文件保持不变，不留下临时文件
+4. 命令行替换保存方法后，检测流程把报告保存到指定文件
+5. 控制台报告完整时直接写入文件，被截断时保存完整报告
+"""
+
+import json
+import os
+import pickle
+import tempfile
+from dataclasses import asdict
+
+from duplicate_detector import DuplicateDetector, SimilarSequenceDetector
+from main import save_to_output_file
+from sequence_generator import SequenceInfo, SimilarSequenceInfo
+from text_processor import CharInfo
+
+
+def _make_sequence(text: str, page: int, start_index: int) -> SequenceInfo:
+    """由空格分隔的文本构造一个序列，所有字符位于同一行"""
+    chars = [CharInfo(char, page, 1, i) for i, char in enumerate(text.split())]
+    return SequenceInfo(text, start_index, chars[0], chars[-1], chars)
+
+
+def _make_results():
+    """构造两条相似序列结果"""
+    return [
+        SimilarSequenceInfo(_make_sequence('人 工 智 能 技 术 发 展', 1, 0),
+                            _make_sequence('人 工 智 能 技 术 进 步', 2, 5),
+                            0.75, ['替换: 发 展 → 进 步']),
+        SimilarSequenceInfo(_make_sequence('机 器 学 习 算 法 研 究', 3, 8),
+                            _make_sequence('机 器 学 习 算 法 研 究', 4, 13),
+                            1.0, []),
+    ]
+
+
+def _make_pdf_paths(temp_dir: str):
+    """创建两个空的PDF文件（保存结果不需要真实的PDF，只需文件存在）"""
+    paths = []
+    for name in ('a.pdf', 'b.pdf'):
+        path = os.path.join(temp_dir, name)
+        open(path, 'wb').close()
+        paths.append(path)
+    return paths
+
+
+def _make_detector(temp_dir: str) -> SimilarSequenceDetector:
+    """创建检测器"""
+    return SimilarSequenceDetector(*_make_pdf_paths(temp_dir), parallel=False, use_cache=False, verbose=False)
+
+
+def test_save_structured_formats():
+    """测试 json、jsonl、pickle 格式的往返"""
+    results = _make_results()
+    expected = [asdict(sim_seq) for sim_seq in results]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        detector = _make_detector(temp_dir)
+
+        json_file = os.path.join(temp_dir, 'results.json')
+        detector.save_results(results, json_file, output_format="json")
+        with open(json_file, encoding='utf-8') as f:
+            assert json.load(f) == expected
+
+        jsonl_file = os.path.join(temp_dir, 'results.jsonl')
+        detector.save_results(results, jsonl_file, output_format="jsonl")
+        with open(jsonl_file, encoding='utf-8') as f:
+            assert [json.loads(line) for line in f] == expected
+
+        pickle_file = os.path.join(temp_dir, 'results.pkl')
+        detector.save_results(results, pickle_file, output_format="pickle")
+        with open(pickle_file, 'rb') as f:
+            assert pickle.load(f) == results
+
+        assert not [name for name in os.listdir(temp_dir) if name.endswith('.tmp')]
+
+
+def test_save_text_report():
+    """测试文本格式的报告"""
+    results = _make_results()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        detector = _make_detector(temp_dir)
+
+        text_file = os.path.join(temp_dir, 'results.txt')
+        detector.save_results(results, text_file)
+        with open(text_file, encoding='utf-8') as f:
+            report = f.read()
+
+        for sim_seq in results:
+            assert sim_seq.sequence1.sequence in report
+            assert sim_seq.sequence2.sequence in report
+        assert report.endswith("\n")
+
+        # 直接给出的报告内容原样写入，末尾补换行
+        detector.save_results(results, text_file, output_text="已格式化的报告")
+        with open(text_file, encoding='utf-8') as f:
+            assert f.read() == "已格式化的报告\n"
+
+
+def test_save_keeps_original_file_on_error():
+    """测试写入中途出错时原文件保持不变"""
+    results = _make_results()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        detector = _make_detector(temp_dir)
+        text_file = os.path.join(temp_dir, 'results.txt')
+        with open(text_file, 'w', encoding='utf-8') as f:
+            f.write("上一次的报告\n")
+
+        def failing_emit(write, *args, **kwargs):
+            write("写了一半的报告\n")
+            raise OSError("磁盘空间不足")
+
+        # save_results 捕获写入错误并输出提示，不向外抛出
+        detector._emit = failing_emit
+        detector.save_results(results, text_file)
+
+        with open(text_file, encoding='utf-8') as f:
+            assert f.read() == "上一次的报告\n"
+        assert sorted(os.listdir(temp_dir)) == ['a.pdf', 'b.pdf', 'results.txt']
+
+        try:
+            detector.save_results(results, text_file, output_format="csv")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("不支持的输出格式应抛出ValueError")
+
+
+def test_cli_save_to_output_file():
+    """测试命令行标准模式：替换保存方法后，相似度检测把报告保存到指定文件"""
+    results = _make_results()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        detector = DuplicateDetector(*_make_pdf_paths(temp_dir), 0.75,
+                                     parallel=False, use_cache=False, verbose=False)
+        # 跳过PDF处理，直接给出检测结果
+        detector.similarity_detector.detect_similar_sequences = lambda: results
+
+        # 与 main.py 的标准模式相同的替换方式
+        output_file = os.path.join(temp_dir, 'cli_results.txt')
+        detector.similarity_detector.save_results = save_to_output_file(
+            detector.similarity_detector.save_results, output_file)
+
+        assert detector.run_similarity_detection(save_to_file=True) == results
+        with open(output_file, encoding='utf-8') as f:
+            report = f.read()
+        for sim_seq in results:
+            assert sim_seq.sequence1.sequence in report
+
+
+def test_run_detection_reuses_console_report():
+    """测试 run_detection 经替换的保存方法保存：报告完整时复用控制台报告，否则重新生成完整报告"""
+    results = _make_results()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        detector = _make_detector(temp_dir)
+        detector.detect_similar_sequences = lambda: results
+        output_file = os.path.join(temp_dir, 'results.txt')
+        detector.save_results = save_to_output_file(detector.save_results, output_file)
+
+        # 结果数不超过显示数量：控制台上的报告即完整报告，原样写入文件
+        detector.run_detection(save_to_file=True, show_max_results=len(results))
+        summary = detector.generator.get_sequence_summary(results)
+        expected = detector.format_output(results, show_all_positions=False,
+                                          max_results=len(results), summary=summary)
+        with open(output_file, encoding='utf-8') as f:
+            assert f.read() == expected + "\n"
+
+        # 只显示一条：文件中保存全部结果
+        detector.run_detection(save_to_file=True, show_max_results=1)
+        with open(output_file, encoding='utf-8') as f:
+            report = f.read()
+        for sim_seq in results:
+            assert sim_seq.sequence2.sequence in report
+
+
+if __name__ == "__main__":
+    test_save_structured_formats()
+    test_save_text_report()
+    test_save_keeps_original_file_on_error()
+    test_cli_save_to_output_file()
+    test_run_detection_reuses_console_report()
+    print("✓ 结果保存测试通过")
@@ -134,6 +134,33 @@ def test_paragraph_based_generation():
     print("\n" + "=" * 80)
 
 
+def test_extract_display():
+    """测试按需取出的显示文本与 display_sequence 相同"""
+    cleaner = SymbolCleaner()
+    texts = ["COVID-19 病毒在2020年传播", "Python3.14版本，Hello-World示例"]
+    paragraphs = [
+        Paragraph(
+            raw_text=text,
+            clean_text=cleaner.clean_text(text),
+            start_page=1,
+            start_line=1,
+            char_count=len(text),
+            file_type="pdf"
+        )
+        for text in texts
+    ]
+
+    for n in [2, 3, 5]:
+        generator = SequenceGenerator(sequence_length=n)
+        for seq in generator.generate_from_paragraphs(paragraphs):
+            display = generator.extract_display(paragraphs[seq.paragraph_index], seq.start_pos, seq.end_pos)
+            assert display == seq.display_sequence, (display, seq.display_sequence)
+
+    generator = SequenceGenerator(sequence_length=3)
+    first = generator.generate_from_paragraphs(paragraphs[:1])[0]
+    assert generator.extract_display(paragraphs[0], first.start_pos, first.end_pos) == "covid 19病"
+
+
 def test_similarity_detection_scenario():
     """测试相似度检测场景"""
     print("\n" + "=" * 80)
@@ -268,6 +295,7 @@ if __name__ == "__main__":
     test_tokenizer()
     test_sequence_generator()
     test_paragraph_based_generation()
+    test_extract_display()
     test_similarity_detection_scenario()
     test_edge_cases()
     test_all_examples()
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本过滤用的正则工具
+
+PDF和Word提取器共用，不依赖任何PDF或Word解析库。
+"""
+
+import re  # 正则表达式
+from typing import Iterable
+
+
+def compile_any(patterns: Iterable[str]) -> "re.Pattern":
+    """把一组模式合并成一个择一正则，一次匹配即可判断是否命中其中任意一个"""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
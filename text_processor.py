@@ -18,11 +18,15 @@
 """
 
 import re  # 正则表达式模块，用于模式匹配
-from typing import List, Tuple, Dict  # 类型注解
+import sys  # 用于判断Python版本
+from typing import List, Tuple, Dict, Iterable, Iterator  # 类型注解
 from dataclasses import dataclass  # 数据类装饰器，用于创建数据类
 
+# Python 3.10+ 的 dataclass 支持 slots，每个字符对象不再携带实例 __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class CharInfo:
     """
     字符信息数据类
@@ -184,16 +188,25 @@ class TextProcessor:
             >>> len(chars)
             4  # hello, world, 你, 好, 世, 界
         """
-        all_chars = []  # 初始化空列表，用于累积所有字符
+        return list(self.iter_chars(extracted_text))  # 返回所有字符信息
+
+    def iter_chars(self, extracted_text: Iterable[Tuple[str, int, int]]) -> Iterator[CharInfo]:
+        """
+        逐行分字并逐个产出字符信息
+
+        与 process_extracted_text 相同，但输入可以是逐行产出的迭代器，
+        结果也逐个产出，不需要先得到全部文本行或累积全部字符。
 
+        Args:
+            extracted_text (Iterable[Tuple[str, int, int]]): (文本内容, 页码, 行号) 的可迭代对象
+
+        Yields:
+            CharInfo: 字符信息
+        """
         # ========== 遍历每一行文本进行分字 ==========
         for text, page, line in extracted_text:
             # 对当前行进行分字处理
-            chars = self.split_text_into_chars(text, page, line)
-            # 将处理结果添加到累积列表
-            all_chars.extend(chars)
-
-        return all_chars  # 返回所有字符信息
+            yield from self.split_text_into_chars(text, page, line)
 
     def create_char_sequence(self, chars: List[CharInfo]) -> List[str]:
         """
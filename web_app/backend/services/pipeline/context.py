@@ -77,8 +77,8 @@ class PipelineContext:
         doc2_paragraphs: 文档2处理后的段落列表
 
         # === 序列数据 ===
-        doc1_sequences: 文档1的N字序列列表
-        doc2_sequences: 文档2的N字序列列表
+        doc1_sequences: 文档1的N字序列批（SequenceBatch，列式存储）
+        doc2_sequences: 文档2的N字序列批（SequenceBatch，列式存储）
 
         # === 检测结果 ===
         similar_sequences: 找到的相似序列列表
@@ -118,8 +118,8 @@ class PipelineContext:
     doc2_paragraphs: Optional[List] = None
 
     # === 序列数据 ===
-    doc1_sequences: Optional[List] = None
-    doc2_sequences: Optional[List] = None
+    doc1_sequences: Optional[Any] = None
+    doc2_sequences: Optional[Any] = None
 
     # === 检测结果 ===
     similar_sequences: Optional[List] = None
@@ -59,14 +59,14 @@ class SequenceGenerationStage(PipelineStage):
         # ========== 步骤2: 生成文档1的序列 ==========
         self._report_progress(0.3, context, progress_callback, "生成文档1序列...")
 
-        doc1_sequences = generator.generate_from_paragraphs(context.doc1_paragraphs)
+        doc1_sequences = generator.generate_batch(context.doc1_paragraphs)
 
         self.logger.info(f"[{context.task_id}] 文档1生成 {len(doc1_sequences):,} 个序列")
 
         # ========== 步骤3: 生成文档2的序列 ==========
         self._report_progress(0.6, context, progress_callback, "生成文档2序列...")
 
-        doc2_sequences = generator.generate_from_paragraphs(context.doc2_paragraphs)
+        doc2_sequences = generator.generate_batch(context.doc2_paragraphs)
 
         self.logger.info(f"[{context.task_id}] 文档2生成 {len(doc2_sequences):,} 个序列")
 
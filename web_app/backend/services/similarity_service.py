@@ -38,7 +38,8 @@ from document_processor import (
     DocumentProcessor,  # 文档处理器，负责从PDF/DOCX提取内容
     DocumentContent,   # 文档内容数据结构
     Paragraph,         # 段落数据结构
-    SequenceGenerator  # 序列生成器，用于生成字符序列
+    SequenceGenerator,  # 序列生成器，用于生成字符序列
+    SequenceBatch      # 列式存储的序列批
 )
 from text_processor import CharInfo  # 字符信息类，记录字符的位置和属性
 
@@ -264,10 +265,10 @@ class SimilarityService:
         # 创建序列生成器，使用指定的序列长度
         generator = SequenceGenerator(sequence_length)
 
-        # 从两个文档的段落中生成序列列表
-        # 每个序列包含：实际文本、原始文本、段落对象、起始位置等信息
-        sequences1_list = generator.generate_from_paragraphs(paragraphs1)
-        sequences2_list = generator.generate_from_paragraphs(paragraphs2)
+        # 从两个文档的段落中生成序列批（列式存储）
+        # 各列分别保存：实际文本、段落索引、起止位置等信息；显示文本只对匹配结果按需生成
+        sequences1_list = generator.generate_batch(paragraphs1)
+        sequences2_list = generator.generate_batch(paragraphs2)
 
         print(f"[SIM] File 1: {len(sequences1_list):,} sequences generated from {len(paragraphs1)} paragraphs")
         print(f"[SIM] File 2: {len(sequences2_list):,} sequences generated from {len(paragraphs2)} paragraphs")
@@ -288,8 +289,8 @@ class SimilarityService:
         print(f"[SIM] Step 2: Converting to SequenceInfo format")
         print(f"[{'='*60}")
 
-        sequences1 = self._convert_to_sequence_info(sequences1_list, 0)
-        sequences2 = self._convert_to_sequence_info(sequences2_list, 1)
+        sequences1 = self._convert_to_sequence_info(sequences1_list, paragraphs1, 0)
+        sequences2 = self._convert_to_sequence_info(sequences2_list, paragraphs2, 1)
 
         # ========== 步骤3：多进程相似度检测 ==========
         # 使用OptimizedSequenceGenerator进行高效的并行相似度比较
@@ -328,9 +329,19 @@ class SimilarityService:
         result_similar_sequences = []
         for i, seq_info in enumerate(similar_sequences):
             # 从原始段落中获取上下文信息
-            # 注意：使用start_index从sequences_list中找到对应的段落
-            para1 = sequences1_list[seq_info.sequence1.start_index]['paragraph']
-            para2 = sequences2_list[seq_info.sequence2.start_index]['paragraph']
+            # 注意：使用start_index从sequences_list中找到段落索引，再从段落列表中取段落
+            idx1 = seq_info.sequence1.start_index
+            idx2 = seq_info.sequence2.start_index
+            para1 = paragraphs1[sequences1_list.paragraph_indices[idx1]]
+            para2 = paragraphs2[sequences2_list.paragraph_indices[idx2]]
+
+            # 只为匹配到的序列生成显示文本（保留空格），其余序列不做这项工作
+            display1 = generator.extract_display(
+                para1, int(sequences1_list.start_positions[idx1]), int(sequences1_list.end_positions[idx1])
+            )
+            display2 = generator.extract_display(
+                para2, int(sequences2_list.start_positions[idx2]), int(sequences2_list.end_positions[idx2])
+            )
 
             # 提取匹配文本前后的上下文（各占context_chars的一半）
             before1, after1 = self._extract_context_from_paragraph(
@@ -342,9 +353,9 @@ class SimilarityService:
 
             # 构建序列详情字典
             seq_dict = {
-                # 使用原始序列（如果有的话），否则使用清理后的序列
-                "sequence1": seq_info.sequence1.raw_sequence or seq_info.sequence1.sequence,
-                "sequence2": seq_info.sequence2.raw_sequence or seq_info.sequence2.sequence,
+                # 使用显示序列（如果有的话），否则使用清理后的序列
+                "sequence1": display1 or seq_info.sequence1.sequence,
+                "sequence2": display2 or seq_info.sequence2.sequence,
                 "similarity": float(seq_info.similarity),  # 转换为Python float类型
                 "position1": {
                     "page": seq_info.sequence1.start_char.page,      # 文档1中的页码
@@ -432,57 +443,66 @@ class SimilarityService:
 
         return result
 
-    def _convert_to_sequence_info(self, sequences_list: List[Dict], file_index: int) -> List[SequenceInfo]:
+    def _convert_to_sequence_info(
+        self,
+        sequences_list: SequenceBatch,
+        paragraphs: List[Paragraph],
+        file_index: int
+    ) -> List[SequenceInfo]:
         """
-        将字典格式的序列列表转换为SequenceInfo对象列表
+        将列式存储的序列批转换为SequenceInfo对象列表
 
         SequenceInfo对象包含更丰富的元数据，包括：
         - 序列的起始和结束字符信息（CharInfo对象）
         - 序列的哈希签名，用于快速比较
         - 完整的字符列表
-        - 原始序列（清理前）
+        - 原始序列留空，只在构建结果时为匹配序列按需生成显示文本
 
         Args:
-            sequences_list: 字典格式的序列列表，来自SequenceGenerator
+            sequences_list: 列式存储的序列批，来自SequenceGenerator.generate_batch
+            paragraphs: 生成这些序列的段落列表，按paragraph_index查找
             file_index: 文件索引（0或1），用于标识来源文件
 
         Returns:
             List[SequenceInfo]: SequenceInfo对象列表
         """
-        from document_processor import SymbolCleaner
         import hashlib
 
         sequence_infos = []
-        cleaner = SymbolCleaner()
 
-        # 遍历每个序列字典，转换为SequenceInfo对象
-        for i, seq_dict in enumerate(sequences_list):
-            paragraph = seq_dict['paragraph']
+        # 按列遍历序列批，转换为SequenceInfo对象
+        # 整数列一次性转成Python列表，避免逐个访问numpy标量
+        paragraph_indices = sequences_list.paragraph_indices.tolist()
+        start_positions = sequences_list.start_positions.tolist()
+        for i, (sequence, para_idx, start_pos) in enumerate(zip(
+            sequences_list.sequences, paragraph_indices, start_positions
+        )):
+            paragraph = paragraphs[para_idx]
 
             # 创建序列起始位置的字符信息对象
             start_char = CharInfo(
-                char=seq_dict['sequence'][0] if seq_dict['sequence'] else '',  # 序列的第一个字符
+                char=sequence[0] if sequence else '',  # 序列的第一个字符
                 page=paragraph.start_page,       # 所在页码
                 line=paragraph.start_line,       # 所在行号
-                position=seq_dict['start_pos']   # 在段落中的位置
+                position=start_pos               # 在段落中的位置
             )
 
             # 创建序列结束位置的字符信息对象
             end_char = CharInfo(
-                char=seq_dict['sequence'][-1] if seq_dict['sequence'] else '',  # 序列的最后一个字符
+                char=sequence[-1] if sequence else '',  # 序列的最后一个字符
                 page=paragraph.start_page,       # 所在页码
                 line=paragraph.start_line,       # 所在行号
-                position=seq_dict['start_pos'] + len(seq_dict['sequence']) - 1  # 结束位置
+                position=start_pos + len(sequence) - 1  # 结束位置
             )
 
             # 创建哈希签名（使用MD5前8位）用于快速比较和去重
             # MD5虽然不是加密安全的，但对于这个用例已经足够
-            hash_signature = hashlib.md5(seq_dict['sequence'].encode()).hexdigest()[:8]
+            hash_signature = hashlib.md5(sequence.encode()).hexdigest()[:8]
 
             # 构建SequenceInfo对象
             seq_info = SequenceInfo(
-                sequence=seq_dict['sequence'],           # 清理后的序列文本
-                raw_sequence=seq_dict.get('raw_sequence', ''),  # 原始序列文本（如果有的话）
+                sequence=sequence,                      # 清理后的序列文本
+                raw_sequence='',                        # 显示文本在构建结果时按需生成
                 start_index=i,                          # 序列在列表中的索引
                 start_char=start_char,                  # 起始字符信息
                 end_char=end_char,                      # 结束字符信息
@@ -514,71 +534,10 @@ class SimilarityService:
             Tuple[str, str]: (匹配前的文本, 匹配后的文本)
 
         Note:
-            上下文长度是基于有效字符计算的，不包括空白字符等被过滤的字符
+            上下文长度是基于有效字符计算的，不包括空白字符等被过滤的字符；
+            通过段落的 clean_to_raw 映射直接切片，不再逐字符扫描原文
         """
-        from document_processor import SymbolCleaner
-        cleaner = SymbolCleaner()
-
-        raw = paragraph.raw_text   # 原始文本（包含所有字符）
-        clean = paragraph.clean_text  # 清理后的文本（只包含有效字符）
-
-        # 在清理后的文本中查找匹配位置
-        match_pos = clean.find(matched_text)
-        if match_pos == -1:
-            # 未找到匹配，返回空字符串
-            return "", ""
-
-        # 在原始文本中找到对应的位置
-        # 需要统计有效字符数量，跳过无效字符
-        valid_char_count = 0
-        raw_pos = 0
-
-        # 遍历原始文本，找到清理后文本中match_pos对应的原始位置
-        for raw_pos, char in enumerate(raw):
-            if cleaner.is_valid_char(char):
-                # 找到有效字符，检查是否达到目标位置
-                if valid_char_count == match_pos:
-                    break
-                valid_char_count += 1
-
-        # ========== 提取匹配前的上下文 ==========
-        # 从raw_pos向前查找，收集context_length个有效字符
-        before_chars = []
-        valid_before_count = 0
-        # 反向遍历raw_pos之前的文本
-        for char in reversed(raw[:raw_pos]):
-            before_chars.append(char)
-            if cleaner.is_valid_char(char):
-                valid_before_count += 1
-                if valid_before_count >= context_length:
-                    # 已收集足够的上下文
-                    break
-        # 反转回来，恢复正确的顺序
-        before_text = ''.join(reversed(before_chars))
-
-        # ========== 提取匹配后的上下文 ==========
-        # 首先找到匹配文本结束的位置
-        match_end_pos = raw_pos
-        valid_match_count = 0
-        # 从raw_pos开始，统计匹配文本的长度（有效字符）
-        while match_end_pos < len(raw) and valid_match_count < len(matched_text):
-            if cleaner.is_valid_char(raw[match_end_pos]):
-                valid_match_count += 1
-            match_end_pos += 1
-
-        # 从match_end_pos开始，提取后续的上下文
-        after_chars = []
-        valid_after_count = 0
-        for char in raw[match_end_pos:]:
-            after_chars.append(char)
-            if cleaner.is_valid_char(char):
-                valid_after_count += 1
-                if valid_after_count >= context_length:
-                    # 已收集足够的上下文
-                    break
-        after_text = ''.join(after_chars)
-
-        return before_text, after_text
+        return DocumentProcessor.get_context_from_paragraph(paragraph, matched_text, context_length)
 
     def _create_file_stats(self, file_path: str, paragraphs: List[Paragraph]) -> Dict[str, Any]:
         """
@@ -596,14 +555,24 @@ class SimilarityService:
         # 获取文件大小（字节）
         file_size = os.path.getsize(file_path)
 
+        # 一次遍历段落同时得到页数和两项字符总数
+        total_pages = 0
+        total_raw_chars = 0
+        total_clean_chars = 0
+        for p in paragraphs:
+            if p.start_page > total_pages:
+                total_pages = p.start_page
+            total_raw_chars += p.char_count
+            total_clean_chars += p.clean_char_count
+
         return {
             "filePath": file_path,
             "fileSizeMb": round(file_size / (1024 * 1024), 2),  # 转换为MB
-            "totalPages": max([p.start_page for p in paragraphs]) if paragraphs else 0,  # 总页数
-            "totalLines": sum([p.char_count for p in paragraphs]),  # 总字符数（原始）
+            "totalPages": total_pages,  # 总页数
+            "totalLines": total_raw_chars,  # 总字符数（原始）
             "mainContentLines": len(paragraphs),  # 主内容段落数
             "filteredLines": 0,  # 过滤的行数（未使用）
-            "totalChars": sum([p.clean_char_count for p in paragraphs]),  # 总有效字符数
+            "totalChars": total_clean_chars,  # 总有效字符数
             "processingTimeSeconds": 0  # 处理时间（未使用）
         }
 
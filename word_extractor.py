@@ -5,7 +5,6 @@ Word文档提取器
 支持.docx格式的Word文档文本提取
 """
 
-import re
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
@@ -15,6 +14,25 @@ except ImportError:
     raise ImportError("需要安装 python-docx 库。请运行: pip install python-docx")
 
 from document_extractor import BaseDocumentExtractor
+from text_patterns import compile_any
+
+
+# 中文脚注/参考文献模式，合并为一个正则在模块加载时编译
+_FOOTNOTE_RE = compile_any([
+    r'参见.*第\d+页',
+    r'详见.*第\d+页',
+    r'出版社.*年版第\d+页',
+    r'人民出版社.*年版',
+    r'中央文献出版社.*年版',
+    r'文献出版社.*年版',
+    r'学习出版社.*年版',
+    r'第\d+卷.*第\d+页',
+    r'\d{4}年.*版',
+    r'年版.*第\d+页',
+    r'ISBN',
+    r'ISSN',
+    r'DOI:',
+])
 
 
 @dataclass
@@ -165,36 +183,11 @@ class WordExtractor(BaseDocumentExtractor):
 
     def _is_footnote_line(self, text: str) -> bool:
         """判断是否为脚注/参考文献行"""
-        # 中文脚注模式
-        footnote_patterns = [
-            r'参见.*第\d+页',
-            r'详见.*第\d+页',
-            r'出版社.*年版第\d+页',
-            r'人民出版社.*年版',
-            r'中央文献出版社.*年版',
-            r'文献出版社.*年版',
-            r'学习出版社.*年版',
-            r'第\d+卷.*第\d+页',
-            r'\d{4}年.*版',
-            r'年版.*第\d+页',
-            r'ISBN',
-            r'ISSN',
-            r'DOI:',
-        ]
-
-        for pattern in footnote_patterns:
-            if re.search(pattern, text):
-                return True
-
-        return False
+        return _FOOTNOTE_RE.search(text) is not None
 
     def _normalize_text(self, text: str) -> str:
-        """标准化文本"""
-        # 去除多余空格
-        text = re.sub(r'\s+', ' ', text)
-        # 去除首尾空格
-        text = text.strip()
-        return text
+        """标准化文本（与 EnhancedPDFTextExtractor.normalize_text 相同）"""
+        return " ".join(text.split())
 
     def _remove_duplicates(self, lines: List[Tuple[str, int, int]]) -> List[Tuple[str, int, int]]:
         """去除重复行"""